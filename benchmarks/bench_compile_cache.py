@@ -0,0 +1,30 @@
+"""Measures compiling triggers that are rebuilt identically across iterations, with and without a `CompileCache`.
+
+"""
+
+import common
+import yatapi.trigger
+
+
+def main(count=5000, iterations=5):
+    uncached = common.best_of(
+        lambda: [yatapi.trigger.compile_triggers(common.sample_triggers(count)) for _ in range(iterations)], repeat=7)
+    cache = yatapi.trigger.CompileCache(maxsize=count)
+    cached = common.best_of(
+        lambda: [yatapi.trigger.compile_triggers(common.sample_triggers(count), cache=cache)
+                 for _ in range(iterations)], repeat=7)
+    print('{} triggers rebuilt {} times'.format(count, iterations))
+    print('uncached: {:.3f}s'.format(uncached))
+    print('cached:   {:.3f}s ({})'.format(cached, cache))
+    print('cached (excluding trigger construction) speedup: {:.2f}x'.format(
+        _compile_only(count, None) / _compile_only(count, yatapi.trigger.CompileCache(maxsize=count))))
+
+
+def _compile_only(count, cache):
+    triggers = common.sample_triggers(count)
+    yatapi.trigger.compile_triggers(triggers, cache=cache)
+    return common.best_of(lambda: yatapi.trigger.compile_triggers(triggers, cache=cache), repeat=7)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Measures reloading an edited TrigEdit file with `TrigEditSession` against parsing it again from scratch.
+
+"""
+
+import os
+import tempfile
+import time
+
+import common
+import yatapi.trigger
+import yatapi.trigger_session
+
+
+def _timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+def main(count=30000, edits=10):
+    text = yatapi.trigger.compile_triggers(common.sample_triggers(count))
+    blocks = text.split(yatapi.trigger.TRIGGER_SEPARATOR)
+    step = len(blocks) // edits
+    for i in range(0, len(blocks), step):
+        blocks[i] = blocks[i].replace('Preserve Trigger();', 'Comment("edited");', 1)
+    # one trigger removed and one added
+    del blocks[len(blocks) // 2]
+    blocks.insert(len(blocks) // 3, blocks[7].replace('Player 1', 'Player 2'))
+    edited = yatapi.trigger.TRIGGER_SEPARATOR.join(blocks)
+
+    parser = yatapi.trigger.TrigEditParser()
+    session = yatapi.trigger_session.TrigEditSession(encoding='utf-8')
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'triggers.txt')
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        _, first = _timed(lambda: session.update_from_file(path))
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(edited)
+        delta, reload = _timed(lambda: session.update_from_file(path))
+
+        def full():
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                return list(parser.extract_triggers(f.read()))
+        expected, full_parse = _timed(full)
+
+    assert session.triggers == expected
+    print('{} triggers, {:.1f} MB'.format(count, len(text) / 1e6))
+    print('first load:   {:.3f}s'.format(first))
+    print('full re-parse: {:.3f}s'.format(full_parse))
+    print('reload:       {:.3f}s ({:.1f}x), {} added, {} removed, {} changed, {}'.format(
+        reload, full_parse / reload, len(delta.added), len(delta.removed), len(delta.changed), session))
+
+
+if __name__ == '__main__':
+    main()
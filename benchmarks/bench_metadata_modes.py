@@ -0,0 +1,97 @@
+"""Compares the size of the war_in_north_hero_revive example at scale under each `compile_triggers` metadata mode.
+
+"""
+
+import io
+import os
+import sys
+import tempfile
+
+import common
+import yatapi.trigger
+import yatapi.trigger_metadata
+import yatapi.trigger_statements as ts
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'examples'))
+import war_in_north_hero_revive
+
+
+def _revive_triggers(copies):
+    triggers = []
+    for _ in range(copies):
+        triggers.extend(war_in_north_hero_revive.create_revive_triggers(war_in_north_hero_revive.DATA))
+    return triggers
+
+
+def check_modes(directory):
+    """Comment mode leaves the triggers editable, marker mode refuses full triggers, and sidecar files are spliced."""
+    triggers = common.sample_triggers(3)
+    yatapi.trigger.compile_triggers(triggers, jsondata={'system': 'Shops'})
+    triggers[0].actions[-1].text = '"edited"'
+
+    full = common.sample_triggers(1)
+    full[0].actions.extend([ts.PreserveTrigger()] * (yatapi.trigger.MAX_ACTIONS - len(full[0].actions)))
+    try:
+        yatapi.trigger.compile_triggers(full, jsondata={'system': 'Shops'}, metadata=yatapi.trigger.METADATA_MARKER)
+        raise AssertionError('a marker was added to a full trigger')
+    except ValueError:
+        pass
+
+    path = os.path.join(directory, 'sidecar.txt')
+    sidecar_path = path + '.jsonl'
+
+    def write(systems):
+        with open(path, 'wb') as f, open(sidecar_path, 'w', encoding='utf-8') as sidecar:
+            for i, (system, count) in enumerate(systems):
+                if i:
+                    f.write(b'\r\n\r\n')
+                yatapi.trigger.write_triggers(common.sample_triggers(count), f, jsondata={'system': system},
+                                              metadata=yatapi.trigger.METADATA_SIDECAR, sidecar=sidecar)
+        with open(path, 'rb') as f:
+            return f.read()
+
+    expected = write([('Spawns', 2), ('Quests', 5)])
+    write([('Spawns', 2), ('Shops', 3), ('Quests', 4)])
+    index = yatapi.trigger_metadata.splice_systems(
+        path, {'Shops': '', 'Quests': yatapi.trigger.compile_triggers(common.sample_triggers(5))},
+        sidecar=sidecar_path)
+    with open(path, 'rb') as f:
+        assert f.read() == expected
+    assert index.names() == ['Spawns', 'Quests'] and index.triggers_of('Quests') == [2, 3, 4, 5, 6]
+    assert yatapi.trigger_metadata.read_sidecar(sidecar_path) == [{'system': 'Spawns'}] * 2 + [{'system': 'Quests'}] * 5
+
+
+def main(copies=500):
+    jsondata = {'system': war_in_north_hero_revive.SYSTEM_NAME}
+    count = len(_revive_triggers(copies))
+    print('{} hero revive triggers'.format(count))
+    sizes = {}
+    with tempfile.TemporaryDirectory() as directory:
+        check_modes(directory)
+        for metadata in (None,) + yatapi.trigger.METADATA_MODES:
+            triggers = _revive_triggers(copies)
+            actions = sum(len(x.actions) for x in triggers)
+            sidecar = io.StringIO()
+            text = yatapi.trigger.compile_triggers(triggers, jsondata=jsondata if metadata else None,
+                                                   metadata=metadata or yatapi.trigger.METADATA_COMMENT,
+                                                   sidecar=sidecar)
+            size = len(text.encode('utf-8'))
+            sizes[metadata] = size
+            path = os.path.join(directory, 'triggers.txt')
+            with open(path, 'wb') as f:
+                f.write(text.encode('utf-8'))
+            name = metadata or 'no metadata'
+            if metadata == yatapi.trigger.METADATA_SIDECAR:
+                index = yatapi.trigger_metadata.MetadataIndex.from_sidecar(path, io.StringIO(sidecar.getvalue()))
+                name += ' ({} byte sidecar)'.format(len(sidecar.getvalue()))
+            else:
+                index = yatapi.trigger_metadata.MetadataIndex.from_file(path)
+            if metadata:
+                assert index.triggers_of(jsondata['system']) == list(range(count))
+            mutated = sum(len(x.actions) for x in triggers) - actions
+            print('{:<30} {:>10,} bytes, +{:>8,} bytes over none, actions added to the given triggers: {}'.format(
+                name, size, size - sizes[None], mutated))
+
+
+if __name__ == '__main__':
+    main()
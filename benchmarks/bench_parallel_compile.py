@@ -0,0 +1,25 @@
+"""Measures the speedup of compiling triggers in a process pool against the trigger count.
+
+"""
+
+import os
+import sys
+
+import common
+import yatapi.trigger
+
+
+def main(counts=(1000, 5000, 20000), workers=None):
+    workers = workers or os.cpu_count()
+    print('workers: {}'.format(workers))
+    for count in counts:
+        triggers = common.sample_triggers(count)
+        serial = common.best_of(lambda: yatapi.trigger.compile_triggers(triggers), repeat=3)
+        parallel = common.best_of(lambda: yatapi.trigger.compile_triggers(triggers, workers=workers), repeat=3)
+        assert yatapi.trigger.compile_triggers(triggers) == yatapi.trigger.compile_triggers(triggers, workers=workers)
+        print('{:>6} triggers: serial {:.3f}s, parallel {:.3f}s, speedup {:.2f}x'.format(
+            count, serial, parallel, serial / parallel))
+
+
+if __name__ == '__main__':
+    main(workers=int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,47 @@
+"""Measures how parsing a large TrigEdit file and a corpus of files scales with the number of worker processes.
+
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import common
+import yatapi.trigger
+
+
+def _timed(func):
+    started = time.perf_counter()
+    count = func()
+    return count, time.perf_counter() - started
+
+
+def main(count=40000, files=16, max_workers=None):
+    max_workers = max_workers or os.cpu_count()
+    worker_counts = sorted({1, 2, 4, 8, 16, max_workers} & set(range(1, max_workers + 1)))
+    parser = yatapi.trigger.TrigEditParser()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'big.txt')
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            yatapi.trigger.write_triggers(common.sample_triggers(count), f)
+        for i in range(files):
+            with open(os.path.join(tmpdir, 'map-{:02}.txt'.format(i)), 'w', newline='', encoding='utf-8') as f:
+                yatapi.trigger.write_triggers(common.sample_triggers(count // files), f)
+        print('single file: {} triggers, {:.1f} MB'.format(count, os.path.getsize(path) / 1e6))
+        _, serial = _timed(lambda: sum(1 for _ in parser.iter_spans_from_file(path, encoding='utf-8')))
+        print('  serial    {:.2f}s'.format(serial))
+        for workers in worker_counts:
+            parsed, elapsed = _timed(lambda: sum(1 for _ in yatapi.trigger.extract_triggers_parallel(
+                path, workers=workers, encoding='utf-8')))
+            print('  {:>2} workers {:.2f}s, speedup {:.2f}x'.format(workers, elapsed, serial / elapsed))
+        print('corpus: {} files'.format(files))
+        for workers in worker_counts:
+            parsed, elapsed = _timed(lambda: sum(len(x) for _, x in yatapi.trigger.extract_corpus_parallel(
+                [os.path.join(tmpdir, 'map-{:02}.txt'.format(i)) for i in range(files)],
+                workers=workers, encoding='utf-8')))
+            print('  {:>2} workers {:.2f}s'.format(workers, elapsed))
+
+
+if __name__ == '__main__':
+    main(max_workers=int(sys.argv[1]) if len(sys.argv) > 1 else None)
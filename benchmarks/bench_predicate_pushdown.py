@@ -0,0 +1,53 @@
+"""Compares extracting the few triggers matching a query with `where=` against parsing everything and filtering.
+
+"""
+
+import os
+import tempfile
+
+import common
+import yatapi.scunit
+import yatapi.trigger
+
+
+def main(count=100000):
+    text = yatapi.trigger.compile_triggers(common.sample_triggers(count))
+    parser = yatapi.trigger.TrigEditParser(statement_cache_size=yatapi.trigger.DEFAULT_STATEMENT_CACHE_SIZE)
+    unit = yatapi.scunit.JIM_RAYNOR_MARINE
+    where = yatapi.trigger.TriggerFilter(statements=['Create Unit'], values=[unit])
+    where_any = yatapi.trigger.TriggerFilter(values=[yatapi.scunit.JIM_RAYNOR_MARINE, yatapi.scunit.SARAH_KERRIGAN_GHOST],
+                                             match_all=False)
+
+    def parse_and_filter(query):
+        return [x for x in parser.extract_triggers(text) if query.matches(x, parser)]
+
+    def pushdown(query):
+        return list(parser.extract_triggers(text, where=query))
+
+    print('{} triggers, {:.1f} MB'.format(count, len(text) / 1e6))
+    for name, query in (('all of', where), ('any of', where_any)):
+        expected = parse_and_filter(query)
+        assert pushdown(query) == expected
+        print('{} {}: {} matches ({:.2%})'.format(name, list(query.literals), len(expected), len(expected) / count))
+        print('  parse then filter {:.2f}s, where= {:.3f}s'.format(
+            common.best_of(lambda: parse_and_filter(query), repeat=3),
+            common.best_of(lambda: pushdown(query), repeat=3)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'triggers.txt')
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+
+        def file_filter():
+            return [x for x in parser.extract_triggers_from_file(path, encoding='utf-8') if where.matches(x, parser)]
+
+        def file_pushdown():
+            return list(parser.extract_triggers_from_file(path, encoding='utf-8', where=where))
+
+        assert file_pushdown() == file_filter()
+        print('from file: parse then filter {:.2f}s, where= {:.3f}s'.format(
+            common.best_of(file_filter, repeat=3), common.best_of(file_pushdown, repeat=3)))
+
+
+if __name__ == '__main__':
+    main()
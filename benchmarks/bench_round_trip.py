@@ -0,0 +1,56 @@
+"""Round trips generated triggers through TrigEdit text (compile, load, compile again) and times the loader.
+
+Exits with an error if any trigger does not compile back to exactly the same text.
+
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import common
+import yatapi.trigger
+import yatapi.trigger_loader
+
+
+def sample_triggers(count):
+    """Sample triggers, every tenth with a multi-line text message (written with Windows newlines inside quotes)."""
+    triggers = common.sample_triggers(count)
+    for trigger in triggers[::10]:
+        trigger.actions[0].text = '"Your hero has been revived!\nPay 250 minerals; revive again."'
+    return triggers
+
+
+def check_file(text):
+    """Loading from a file gives the same triggers as loading from text."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'triggers.trg')
+        with open(path, 'wb') as f:
+            f.write(text.encode('utf-8'))
+        triggers = list(yatapi.trigger_loader.TriggerLoader().load_triggers_from_file(path, encoding='utf-8'))
+    return yatapi.trigger.compile_triggers(triggers) == text
+
+
+def main(count=100000):
+    text = yatapi.trigger.compile_triggers(sample_triggers(count), jsondata={'system': 'round trip'})
+    print('{} triggers, {:.1f} MB of text'.format(count, len(text) / 1e6))
+    for intern_statements in (False, True):
+        loader = yatapi.trigger_loader.TriggerLoader(intern_statements=intern_statements)
+        started = time.perf_counter()
+        triggers = list(loader.load_triggers(text))
+        elapsed = time.perf_counter() - started
+        same = yatapi.trigger.compile_triggers(triggers) == text
+        print('intern_statements={}: loaded {} triggers in {:.2f}s ({:.0f} triggers/s), round trip {}, {}'.format(
+            intern_statements, len(triggers), elapsed, len(triggers) / elapsed, 'ok' if same else 'FAILED',
+            loader.cache))
+        if not same:
+            sys.exit(1)
+    same = check_file(text)
+    print('from file: round trip {}'.format('ok' if same else 'FAILED'))
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
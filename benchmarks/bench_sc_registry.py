@@ -0,0 +1,37 @@
+"""Compares classifying unit arguments with the old list scans against the frozenset backed registries.
+
+"""
+
+import common
+import yatapi.scunit
+import yatapi.scvalue
+
+
+def main(lookups=100000):
+    units = list(yatapi.scunit.REGISTRY)
+    names = [units[i % len(units)] for i in range(lookups)]
+    as_list = list(yatapi.scunit.UNKILLABLE_UNITS)
+    values = [x.value for x in yatapi.scunit.REGISTRY.by_name.values()]
+    texts = [values[i % len(values)] for i in range(lookups)]
+
+    def scan():
+        return sum(1 for x in names if x in as_list)
+
+    def registry():
+        return sum(1 for x in names if x in yatapi.scunit.UNKILLABLE_UNITS)
+
+    def reverse_scan():
+        return [next(x for x in units if x.value == text) for text in texts]
+
+    def reverse_registry():
+        return [yatapi.scunit.REGISTRY.get(text) for text in texts]
+
+    print('{} lookups'.format(lookups))
+    for name, func in (('unkillable, list scan', scan), ('unkillable, frozenset', registry),
+                       ('by TrigEdit string, scan', reverse_scan), ('by TrigEdit string, registry', reverse_registry)):
+        print('{:<30} {:.4f}s'.format(name, common.best_of(func, repeat=3)))
+    print('classify:', yatapi.scvalue.classify('"Terran Marine"'), yatapi.scvalue.classify('At least'))
+
+
+if __name__ == '__main__':
+    main()
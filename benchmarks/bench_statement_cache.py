@@ -0,0 +1,35 @@
+"""Measures parsing statements from a generated TrigEdit dump with and without the memoizing statement cache.
+
+"""
+
+import common
+import yatapi.trigger
+
+
+def main(count=20000):
+    text = ''.join(yatapi.trigger.iter_compiled_triggers(common.sample_triggers(count)))
+    parser = yatapi.trigger.TrigEditParser()
+    statements = [x for trigger in parser.extract_triggers(text) for x in trigger['conditions'] + trigger['actions']]
+
+    def parse_each(p):
+        return lambda: [p.parse_statement(x) for x in statements]
+
+    uncached = common.best_of(parse_each(parser), repeat=3)
+    cached_parser = yatapi.trigger.TrigEditParser(
+        statement_cache_size=yatapi.trigger.DEFAULT_STATEMENT_CACHE_SIZE)
+    cached = common.best_of(parse_each(cached_parser), repeat=3)
+    batched = common.best_of(lambda: parser.parse_statements(statements), repeat=3)
+    tokens_uncached = common.best_of(lambda: list(parser.extract_triggers(text, parse_statements=True)), repeat=3)
+    tokens_cached = common.best_of(lambda: list(cached_parser.extract_triggers(text, parse_statements=True)), repeat=3)
+
+    print('{} statements, {} distinct'.format(len(statements), len(set(statements))))
+    print('parse_statement uncached: {:.3f}s'.format(uncached))
+    print('parse_statement cached:   {:.3f}s ({:.2f}x, {})'.format(cached, uncached / cached,
+                                                                   cached_parser.statement_cache))
+    print('parse_statements batch:   {:.3f}s ({:.2f}x)'.format(batched, uncached / batched))
+    print('extract_triggers(parse_statements=True) uncached: {:.3f}s, cached: {:.3f}s ({:.2f}x)'.format(
+        tokens_uncached, tokens_cached, tokens_uncached / tokens_cached))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""Compares reflective statement compilation against the cached per-class compile plans.
+
+"""
+
+import inspect
+import re
+
+import common
+
+
+def legacy_compile(statement):
+    """The original `Statement.compile`, which inspects `__init__` and runs a regex on every call.
+
+    :param statement:
+    :return:
+    """
+    values = []
+    for arg in inspect.getfullargspec(statement.__init__).args:
+        if arg != 'self':
+            value = getattr(statement, arg)
+            if arg in statement.__class__._quoted_fields and type(value) == str:
+                if re.search(r'^".+?"$', value) is None:
+                    value = '"{}"'.format(value)
+            values.append(value if type(value) == str else str(value))
+    return '{}({});'.format(statement.__class__._trigedit_name, ', '.join(values))
+
+
+def main(copies=200):
+    classes = common.statement_classes()
+    statements = [common.sample_statement(cls, seed=i) for i in range(copies) for cls in classes]
+    legacy = common.best_of(lambda: [legacy_compile(x) for x in statements])
+    planned = common.best_of(lambda: [x.compile() for x in statements])
+    print('{} statement classes, {} statements'.format(len(classes), len(statements)))
+    print('legacy:  {:>10.0f} statements/s'.format(len(statements) / legacy))
+    print('planned: {:>10.0f} statements/s'.format(len(statements) / planned))
+    print('speedup: {:.1f}x'.format(legacy / planned))
+
+
+if __name__ == '__main__':
+    main()
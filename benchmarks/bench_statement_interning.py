@@ -0,0 +1,41 @@
+"""Measures memory held by a large generated map with and without interning its statements.
+
+"""
+
+import gc
+import tracemalloc
+
+import common
+
+
+def _traced_size(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, result
+
+
+def _interned_triggers(count):
+    triggers = common.sample_triggers(count)
+    for trigger in triggers:
+        trigger.intern_statements()
+    return triggers
+
+
+def main(count=10000):
+    plain, triggers = _traced_size(lambda: common.sample_triggers(count))
+    distinct = len({x for trigger in triggers for x in trigger.conditions + trigger.actions})
+    del triggers
+    interned, triggers = _traced_size(lambda: _interned_triggers(count))
+    shared = len({id(x) for trigger in triggers for x in trigger.conditions + trigger.actions})
+    print('{} triggers, {} statements, {} distinct'.format(count, count * 9, distinct))
+    print('plain:    {:>12,} bytes ({:.0f} bytes/trigger)'.format(plain, plain / count))
+    print('interned: {:>12,} bytes ({:.0f} bytes/trigger), {} statement objects'.format(
+        interned, interned / count, shared))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Reports bytes per trigger for the `__slots__` statement layout against the previous `__dict__` layout.
+
+By default the previous layout is emulated, by copying each statement's fields, plus the per-instance `type` string,
+into a plain object with a `__dict__`.  Pass a git revision from before the `__slots__` layout to also measure that
+revision's own classes, e.g. `python benchmarks/bench_statement_layout.py 3514378^`.
+
+"""
+
+import gc
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import tracemalloc
+
+import common
+
+REPOSITORY = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
+# measures `common.sample_triggers` with the yatapi package found at the path given
+MEASURE_REVISION = '''
+import sys
+sys.path.insert(0, sys.argv[1])
+import yatapi.trigger_statements
+sys.path.insert(0, sys.argv[2])
+import bench_statement_layout
+import common
+print(bench_statement_layout._bytes_per_trigger(common.sample_triggers, int(sys.argv[3])))
+'''
+
+
+class DictStatement:
+    def __init__(self, statement):
+        plan = statement._get_compile_plan()
+        for field, value in zip(plan.fields, plan.raw_values(statement)):
+            setattr(self, field, value)
+        self.type = statement.__class__.__name__
+
+
+# one `__dict__` based class per statement class, so instances share dictionary keys as before
+DICT_CLASSES = {}
+
+
+def _to_dict_statement(statement):
+    cls = DICT_CLASSES.get(statement.__class__)
+    if cls is None:
+        cls = type(statement.__class__.__name__, (DictStatement,), {})
+        DICT_CLASSES[statement.__class__] = cls
+    return cls(statement)
+
+
+class DictTrigger:
+    def __init__(self, trigger):
+        self.players = trigger.players
+        self.conditions = [_to_dict_statement(x) for x in trigger.conditions]
+        self.actions = [_to_dict_statement(x) for x in trigger.actions]
+
+
+def _dict_triggers(triggers):
+    return [DictTrigger(x) for x in triggers]
+
+
+def _bytes_per_trigger(build, *args):
+    gc.collect()
+    tracemalloc.start()
+    triggers = build(*args)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / len(triggers)
+
+
+def _revision_bytes_per_trigger(revision, count):
+    """Measures the statement classes of another git revision, in a separate process."""
+    with tempfile.TemporaryDirectory() as directory:
+        archive = os.path.join(directory, 'src.tar')
+        subprocess.run(['git', 'archive', '-o', archive, revision, 'src'], cwd=REPOSITORY, check=True)
+        with tarfile.open(archive) as f:
+            f.extractall(directory)
+        output = subprocess.run([sys.executable, '-c', MEASURE_REVISION, os.path.join(directory, 'src'),
+                                 os.path.dirname(os.path.realpath(__file__)), str(count)],
+                                check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+    return float(output)
+
+
+def main(count=10000, revision=None):
+    emulated = _bytes_per_trigger(_dict_triggers, common.sample_triggers(count))
+    after = _bytes_per_trigger(common.sample_triggers, count)
+    print('{} triggers with 9 statements each'.format(count))
+    if revision is not None:
+        print('__dict__ layout ({}): {:.0f} bytes/trigger'.format(
+            revision, _revision_bytes_per_trigger(revision, count)))
+    print('__dict__ layout (emulated): {:.0f} bytes/trigger'.format(emulated))
+    print('__slots__ layout: {:.0f} bytes/trigger'.format(after))
+
+
+if __name__ == '__main__':
+    main(revision=sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,54 @@
+"""Compares peak memory of parsing a TrigEdit file read whole against streaming it one trigger at a time.
+
+"""
+
+import os
+import tempfile
+import time
+import tracemalloc
+
+import common
+import yatapi.trigger
+
+
+def _peak(func):
+    tracemalloc.start()
+    started = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def main(count=20000):
+    parser = yatapi.trigger.TrigEditParser()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'triggers.txt')
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            triggers = common.sample_triggers(count)
+            for trigger in triggers[::10]:
+                trigger.actions[0].text = '"Your hero has been revived!\nPay 250 minerals to revive again."'
+            yatapi.trigger.write_triggers(triggers, f)
+        size = os.path.getsize(path)
+
+        def whole():
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                return sum(1 for _ in parser.extract_triggers(f.read()))
+
+        def streamed():
+            return sum(1 for _ in parser.iter_spans_from_file(path, encoding='utf-8'))
+
+        # streaming reads bytes, but gives the same newlines as reading the file in text mode
+        with open(path, 'r', encoding='utf-8') as f:
+            assert list(parser.extract_triggers(f.read())) == list(
+                parser.extract_triggers_from_file(path, encoding='utf-8'))
+
+        print('{} triggers, {:.1f} MB file'.format(count, size / 1e6))
+        for name, func in (('whole file', whole), ('streamed', streamed)):
+            parsed, elapsed, peak = _peak(func)
+            print('{:<10} {} triggers in {:.2f}s, peak {:.1f} MB'.format(name, parsed, elapsed, peak / 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Compares memory and query time of parsed triggers held as dicts against `TriggerColumns`.
+
+"""
+
+import collections
+import time
+import tracemalloc
+
+import common
+import yatapi.scunit
+import yatapi.trigger
+import yatapi.trigger_columns
+
+
+def _measure(build):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, size
+
+
+def main(count=20000):
+    text = yatapi.trigger.compile_triggers(common.sample_triggers(count))
+    parser = yatapi.trigger.TrigEditParser()
+    dicts, dicts_time, dicts_size = _measure(lambda: list(parser.extract_triggers(text, parse_statements=True)))
+    columns, columns_time, columns_size = _measure(lambda: yatapi.trigger_columns.TriggerColumns.from_text(text))
+    print('{} triggers'.format(count))
+    print('dicts:   built in {:.2f}s, {:.1f} MB'.format(dicts_time, dicts_size / 1e6))
+    print('columns: built in {:.2f}s, {:.1f} MB ({})'.format(columns_time, columns_size / 1e6, columns))
+
+    unit = yatapi.scunit.TERRAN_MARINE.value
+
+    def scan_counts():
+        return collections.Counter(x['name'] for trigger in dicts for x in trigger['conditions'] + trigger['actions'])
+
+    def scan_using():
+        return [i for i, trigger in enumerate(dicts)
+                if any(unit in x['args'] for x in trigger['conditions'] + trigger['actions'])]
+
+    queries = (('statement counts', scan_counts, columns.statement_counts),
+               ('triggers using unit', scan_using, lambda: columns.triggers_using(unit)))
+    numpy = yatapi.trigger_columns.numpy
+    for name, scan, query in queries:
+        assert scan() == query()
+        scanned = common.best_of(scan, repeat=3)
+        print('{:<20} dict scan {:.4f}s, columns {:.4f}s{}'.format(
+            name, scanned, common.best_of(query, repeat=3), '' if numpy else ' (NumPy not installed)'), end='')
+        if numpy is not None:
+            yatapi.trigger_columns.numpy = None
+            print(', columns without NumPy {:.4f}s'.format(common.best_of(query, repeat=3)), end='')
+            yatapi.trigger_columns.numpy = numpy
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Measures streaming a large TrigEdit file into a SQLite `TriggerDatabase` and querying it.
+
+"""
+
+import os
+import tempfile
+import time
+import tracemalloc
+
+import common
+import yatapi.scplayer
+import yatapi.scunit
+import yatapi.trigger
+import yatapi.trigger_db
+
+
+def main(count=100000):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'triggers.txt')
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            yatapi.trigger.write_triggers(common.sample_triggers(count), f)
+        db_path = os.path.join(tmpdir, 'triggers.db')
+        with yatapi.trigger_db.TriggerDatabase(db_path) as db:
+            started = time.perf_counter()
+            written = db.export_file(path, map_name='sample', encoding='utf-8')
+            elapsed = time.perf_counter() - started
+            # exporting the map again replaces it; traced separately since tracing slows the export down
+            tracemalloc.start()
+            db.export_file(path, map_name='sample', encoding='utf-8')
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print('exported {} triggers ({:.1f} MB file) in {:.2f}s, peak {:.1f} MB, database {:.1f} MB'.format(
+                written, os.path.getsize(path) / 1e6, elapsed, peak / 1e6, os.path.getsize(db_path) / 1e6))
+
+            queries = (
+                ('Set Deaths on Terran Marine for Current Player',
+                 lambda: db.find_triggers('Set Deaths', unit=yatapi.scunit.TERRAN_MARINE,
+                                          player=yatapi.scplayer.CURRENT_PLAYER)),
+                ('any statement at location "spawn 5"', lambda: db.find_triggers(location='spawn 5')),
+                ('statement counts', db.statement_counts),
+            )
+            for name, query in queries:
+                started = time.perf_counter()
+                result = query()
+                print('{:<50} {:>6} rows in {:.4f}s'.format(name, len(result), time.perf_counter() - started))
+
+
+if __name__ == '__main__':
+    main()
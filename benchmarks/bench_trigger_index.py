@@ -0,0 +1,58 @@
+"""Compares lookups through `TriggerIndex` against scanning every parsed trigger.
+
+"""
+
+import time
+
+import common
+import yatapi.scunit
+import yatapi.trigger
+import yatapi.trigger_index
+
+
+def main(count=20000):
+    triggers = common.sample_triggers(count)
+    text = yatapi.trigger.compile_triggers(triggers)
+    parser = yatapi.trigger.TrigEditParser(statement_cache_size=yatapi.trigger.DEFAULT_STATEMENT_CACHE_SIZE)
+    parsed = list(parser.extract_triggers(text))
+    started = time.perf_counter()
+    index = yatapi.trigger_index.TriggerIndex.from_triggers(parsed)
+    print('{} triggers, indexed in {:.2f}s ({})'.format(count, time.perf_counter() - started, index))
+    started = time.perf_counter()
+    typed_index = yatapi.trigger_index.TriggerIndex.from_triggers(triggers)
+    print('Trigger objects indexed in {:.2f}s'.format(time.perf_counter() - started))
+
+    location = yatapi.trigger_index.IndexTerm('location', '"spawn 3"')
+    unit = yatapi.scunit.TERRAN_MARINE
+
+    def scan_location():
+        return [i for i, trigger in enumerate(parsed)
+                if any(parser.parse_statement(x)['args'][3] == '"spawn 3"' for x in trigger['actions']
+                       if x.startswith('Create Unit('))]
+
+    def scan_both():
+        return [i for i, trigger in enumerate(parsed)
+                if any(parser.parse_statement(x)['args'][3] == '"spawn 3"' for x in trigger['actions']
+                       if x.startswith('Create Unit('))
+                and any(unit.value in parser.parse_statement(x)['args']
+                        for x in trigger['conditions'] + trigger['actions'])]
+
+    queries = (('location', scan_location, lambda: index.find(location)),
+               ('location and unit', scan_both, lambda: index.find_all(location, unit)))
+    for name, scan, query in queries:
+        assert scan() == query()
+        print('{:<18} scan {:.4f}s, index {:.6f}s ({} triggers)'.format(
+            name, common.best_of(scan, repeat=3), common.best_of(query, repeat=3), len(query())))
+    assert typed_index.find_all(location, unit) == index.find_all(location, unit)
+
+    started = time.perf_counter()
+    for trigger_id in range(0, count, 2):
+        index.remove(trigger_id)
+    for trigger in parsed[::2]:
+        index.add(trigger)
+    print('removed and re-added {} triggers in {:.2f}s'.format(count // 2, time.perf_counter() - started))
+    assert len(index.find(location)) == len(scan_location())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Compares finding and replacing one trigger system through `MetadataIndex` against fully parsing the file.
+
+"""
+
+import os
+import tempfile
+import time
+
+import common
+import yatapi.trigger
+import yatapi.trigger_metadata
+
+SYSTEMS = ('Spawns', 'Hero Revival', 'Shops', 'Quests')
+
+
+def _system_text(system, count, seed=0):
+    triggers = common.sample_triggers(count + seed)[seed:]
+    return yatapi.trigger.compile_triggers(triggers, jsondata={'system': system})
+
+
+def _file_text(counts, revival_seed=0, systems=SYSTEMS):
+    separator = yatapi.trigger.WIN_NEWLINE * 2
+    return separator.join([_system_text(x, counts[x], seed=revival_seed if x == 'Hero Revival' else 0)
+                           for x in systems])
+
+
+def check_removals(directory, count=20):
+    """Removing any systems, including several next to each other, leaves exactly the other systems."""
+    counts = {x: count for x in SYSTEMS}
+    path = os.path.join(directory, 'removals.txt')
+    for removed in [SYSTEMS[:1], SYSTEMS[:2], SYSTEMS[1:3], SYSTEMS[2:], SYSTEMS[:1] + SYSTEMS[2:3], SYSTEMS[:3]]:
+        with open(path, 'wb') as f:
+            f.write(_file_text(counts).encode('utf-8'))
+        yatapi.trigger_metadata.splice_systems(path, {x: '' for x in removed})
+        with open(path, 'rb') as f:
+            kept = [x for x in SYSTEMS if x not in removed]
+            assert f.read() == _file_text(counts, systems=kept).encode('utf-8'), removed
+
+
+def main(count=40000):
+    counts = {x: count // len(SYSTEMS) for x in SYSTEMS}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'triggers.txt')
+        with open(path, 'wb') as f:
+            f.write(_file_text(counts).encode('utf-8'))
+        print('{} triggers, {:.1f} MB'.format(count, os.path.getsize(path) / 1e6))
+
+        started = time.perf_counter()
+        parser = yatapi.trigger.TrigEditParser()
+        parsed = list(parser.extract_triggers_from_file(path))
+        revival = [i for i, x in enumerate(parsed) if '"JSON={\'system\': \'Hero Revival\'}"' in x['actions'][-1]]
+        print('full parse:    {:.2f}s'.format(time.perf_counter() - started))
+
+        started = time.perf_counter()
+        index = yatapi.trigger_metadata.MetadataIndex.from_file(path)
+        print('metadata scan: {:.2f}s ({} systems, runs of Hero Revival: {})'.format(
+            time.perf_counter() - started, len(index.names()), index.runs('Hero Revival')))
+        assert index.triggers_of('Hero Revival') == revival
+
+        # regenerate the system with different triggers (and a different count) and splice it back in
+        counts['Hero Revival'] += 100
+        new_text = _system_text('Hero Revival', counts['Hero Revival'], seed=7)
+        started = time.perf_counter()
+        yatapi.trigger_metadata.splice_systems(path, {'Hero Revival': new_text}, index=index)
+        print('splice:        {:.2f}s (including rescan)'.format(time.perf_counter() - started))
+        with open(path, 'rb') as f:
+            assert f.read() == _file_text(counts, revival_seed=7).encode('utf-8')
+        check_removals(directory)
+
+
+if __name__ == '__main__':
+    main()
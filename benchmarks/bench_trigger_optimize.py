@@ -0,0 +1,132 @@
+"""Runs the `trigger_optimize` passes over generated triggers with typical redundancies, reporting what each pass
+saves and how long it takes.
+
+"""
+
+import time
+
+import common
+import yatapi.scaction
+import yatapi.scoperation
+import yatapi.scplayer
+import yatapi.scquantifier
+import yatapi.scresource
+import yatapi.scstate
+import yatapi.scunit
+import yatapi.trigger
+import yatapi.trigger_optimize
+import yatapi.trigger_statements as ts
+
+
+def redundant_triggers(count):
+    """Sample triggers whose actions were built up piecemeal, as generators often do."""
+    player = yatapi.scplayer.CURRENT_PLAYER
+    triggers = common.sample_triggers(count)
+    for i, trigger in enumerate(triggers):
+        unit = trigger.conditions[2].unit
+        trigger.conditions.append(ts.Deaths(player, unit, yatapi.scquantifier.AT_LEAST, 0))
+        if i % 2:
+            trigger.conditions.append(ts.Accumulate(player, yatapi.scquantifier.AT_LEAST, 100, yatapi.scresource.ORE))
+        if i % 100 == 0:
+            trigger.conditions.append(ts.Command(player, unit, yatapi.scquantifier.AT_LEAST, 1))
+        if i % 100 == 1:
+            # a switch no trigger sets
+            trigger.conditions.append(ts.Switch('Unused {}'.format(i), yatapi.scstate.SCState('set')))
+        trigger.actions[2:2] = [ts.SetResources(player, yatapi.scoperation.SUBTRACT, 50, yatapi.scresource.ORE),
+                                ts.SetDeaths(player, yatapi.scunit.TERRAN_MARINE, yatapi.scoperation.ADD, 1),
+                                ts.SetDeaths(player, yatapi.scunit.TERRAN_MARINE, yatapi.scoperation.ADD, 0)]
+        if i % 2:
+            trigger.actions.append(ts.SetSwitch('Switch {}'.format(i % 10), yatapi.scaction.SET))
+            trigger.actions.append(ts.SetSwitch('Switch {}'.format(i % 10), yatapi.scaction.CLEAR))
+        if i % 3 == 0:
+            trigger.actions.append(ts.Wait(100))
+            trigger.actions.append(ts.SetDeaths(player, yatapi.scunit.TERRAN_MARINE, yatapi.scoperation.ADD, 1))
+        trigger.actions.append(ts.PreserveTrigger())
+    return triggers
+
+
+def per_player_triggers(triggers, players=8):
+    """Copies of the triggers for each player in turn, as generators looping over players write them, with every
+    fourth trigger split in two: one showing its message and one doing the rest."""
+    copies = []
+    for player in [getattr(yatapi.scplayer, 'PLAYER_{}'.format(x + 1)) for x in range(players)]:
+        for i, trigger in enumerate(triggers):
+            if i % 4 == 0:
+                copies.append(yatapi.trigger.Trigger([player], list(trigger.conditions),
+                                                     [trigger.actions[0], ts.PreserveTrigger()]))
+                copies.append(yatapi.trigger.Trigger([player], list(trigger.conditions), trigger.actions[1:]))
+            else:
+                copies.append(yatapi.trigger.Trigger([player], list(trigger.conditions), list(trigger.actions)))
+    return copies
+
+
+def check_merge():
+    """Cases `merge_triggers` must leave alone."""
+    player = yatapi.scplayer.PLAYER_1
+    marine = yatapi.scunit.TERRAN_MARINE
+    # not preserved, and clearing the switch lets the second copy fire once it is set again
+    copy = yatapi.trigger.Trigger([player], [ts.Switch('A', yatapi.scstate.SCState('set'))],
+                                  [ts.SetSwitch('A', yatapi.scaction.CLEAR),
+                                   ts.SetDeaths(player, marine, yatapi.scoperation.SET_TO, 1)])
+    assert len(yatapi.trigger_optimize.merge_triggers([copy, copy]).triggers) == 2
+    # adding a marine's death makes "Men" deaths no longer 0, so the second trigger would not have fired
+    no_deaths = [ts.Deaths(player, yatapi.scunit.MEN, yatapi.scquantifier.EXACTLY, 0)]
+    triggers = [yatapi.trigger.Trigger([player], list(no_deaths),
+                                       [ts.SetDeaths(player, marine, yatapi.scoperation.ADD, 1)]),
+                yatapi.trigger.Trigger([player], list(no_deaths), [ts.Victory()])]
+    assert len(yatapi.trigger_optimize.merge_triggers(triggers).triggers) == 2
+    # spending "ore and gas" lowers the ore the second trigger needs
+    has_ore = [ts.Accumulate(player, yatapi.scquantifier.AT_LEAST, 100, yatapi.scresource.ORE)]
+    triggers = [yatapi.trigger.Trigger([player], list(has_ore),
+                                       [ts.SetResources(player, yatapi.scoperation.SUBTRACT, 100,
+                                                        yatapi.scresource.ORE_AND_GAS)]),
+                yatapi.trigger.Trigger([player], list(has_ore), [ts.Victory()])]
+    assert len(yatapi.trigger_optimize.merge_triggers(triggers).triggers) == 2
+
+
+def check_switch_names():
+    """Switch names with and without quotes are the same switch."""
+    player = yatapi.scplayer.PLAYER_1
+    is_set = yatapi.scstate.SCState('set')
+    triggers = [yatapi.trigger.Trigger([player], [ts.Always()], [ts.SetSwitch('Sw', yatapi.scaction.SET)]),
+                yatapi.trigger.Trigger([player], [ts.Switch('"Sw"', is_set)], [ts.Victory()])]
+    assert len(yatapi.trigger_optimize.eliminate_dead(triggers).triggers) == 2
+    actions, _ = yatapi.trigger_optimize.fold_actions([ts.SetSwitch('"Sw"', yatapi.scaction.SET),
+                                                       ts.SetSwitch('Sw', yatapi.scaction.CLEAR)])
+    assert len(actions) == 1
+    conditions, _ = yatapi.trigger_optimize.simplify_conditions([ts.Switch('"Sw"', is_set),
+                                                                 ts.Switch('Sw', yatapi.scstate.SCState('not set'))])
+    assert conditions == [ts.Never()]
+
+
+def _run(name, optimize, triggers):
+    before = len(yatapi.trigger.compile_triggers(triggers))
+    started = time.perf_counter()
+    result = optimize(triggers)
+    elapsed = time.perf_counter() - started
+    after = len(yatapi.trigger.compile_triggers(result.triggers))
+    print('{} in {:.2f}s, TrigEdit text {:,} -> {:,} bytes'.format(name, elapsed, before, after))
+    print(result.report.summary())
+    return result
+
+
+def main(count=20000):
+    check_merge()
+    check_switch_names()
+    triggers = redundant_triggers(count)
+    print('{} triggers'.format(count))
+    triggers = _run('peephole', yatapi.trigger_optimize.peephole, triggers).triggers
+    triggers = _run('simplify', yatapi.trigger_optimize.simplify, triggers).triggers
+    # the sample triggers use every unit's deaths; treat the unkillable ones as the map's death counters
+    triggers = _run('eliminate dead', lambda x: yatapi.trigger_optimize.eliminate_dead(
+        x, counter_units=yatapi.scunit.UNKILLABLE_UNITS), triggers).triggers
+    # the sample triggers check whether a hero died first; heroes seldom die
+    hints = {ts.Deaths: 0.05}
+    _run('reorder', lambda x: yatapi.trigger_optimize.reorder_conditions(x, hints), triggers)
+    triggers = per_player_triggers(triggers[:count // 8])
+    print('{} per player triggers'.format(len(triggers)))
+    _run('merge', yatapi.trigger_optimize.merge_triggers, triggers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Shared helpers for the benchmark scripts.
+
+Run any benchmark from the repository root, e.g. `python benchmarks/bench_statement_compile.py`.
+
+"""
+
+import inspect
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'src'))
+
+import yatapi.scaction
+import yatapi.scalliance
+import yatapi.scoperation
+import yatapi.scorder
+import yatapi.scplayer
+import yatapi.scquantifier
+import yatapi.scresource
+import yatapi.scscript
+import yatapi.scstate
+import yatapi.scunit
+import yatapi.scvisibility
+import yatapi.trigger
+import yatapi.trigger_statements
+
+# a representative value for each argument type used by the statement classes
+SAMPLE_VALUES = {
+    yatapi.scaction.SCAction: yatapi.scaction.SET,
+    yatapi.scalliance.SCAlliance: yatapi.scalliance.ALLY,
+    yatapi.scoperation.SCOperation: yatapi.scoperation.ADD,
+    yatapi.scorder.SCOrder: yatapi.scorder.PATROL,
+    yatapi.scplayer.SCPlayer: yatapi.scplayer.PLAYER_1,
+    yatapi.scquantifier.SCQuantifier: yatapi.scquantifier.AT_LEAST,
+    yatapi.scresource.SCResource: yatapi.scresource.ORE,
+    yatapi.scscript.SCScript: yatapi.scscript.VI7,
+    yatapi.scstate.SCState: yatapi.scstate.ENABLED,
+    yatapi.scunit.SCUnit: yatapi.scunit.TERRAN_MARINE,
+    yatapi.scvisibility.SCVisibility: yatapi.scvisibility.ALWAYS_DISPLAY,
+    int: 1,
+    str: 'Location 1',
+}
+
+
+def statement_classes():
+    """Gets every concrete condition and action class in `yatapi.trigger_statements`.
+
+    :return:
+    """
+    classes = []
+    for value in vars(yatapi.trigger_statements).values():
+        if inspect.isclass(value) and issubclass(value, (yatapi.trigger_statements.Condition,
+                                                         yatapi.trigger_statements.Action)):
+            if value not in (yatapi.trigger_statements.Condition, yatapi.trigger_statements.Action):
+                classes.append(value)
+    return sorted(classes, key=lambda x: x.__name__)
+
+
+def sample_statement(statement_class, seed=0):
+    """Instantiates a statement class with representative arguments.
+
+    :param statement_class:
+    :param seed: varies the integer and string arguments so instances are not identical
+    :return:
+    """
+    args = []
+    for param in list(inspect.signature(statement_class.__init__).parameters.values())[1:]:
+        if param.annotation is int:
+            args.append(seed)
+        elif param.annotation is str:
+            args.append('Location {}'.format(seed))
+        else:
+            args.append(SAMPLE_VALUES[param.annotation])
+    return statement_class(*args)
+
+
+def sample_triggers(count):
+    """Generates `count` triggers in the shape of the hero revive example.
+
+    :param count:
+    :return:
+    """
+    ts = yatapi.trigger_statements
+    units = [value for value in vars(yatapi.scunit).values() if isinstance(value, yatapi.scunit.SCUnit)]
+    player = yatapi.scplayer.CURRENT_PLAYER
+    triggers = []
+    for i in range(count):
+        unit = units[i % len(units)]
+        conditions = [ts.Bring(player, yatapi.scunit.TERRAN_CIVILIAN, 'buy {}'.format(i % 50),
+                               yatapi.scquantifier.EXACTLY, 1),
+                      ts.Accumulate(player, yatapi.scquantifier.AT_LEAST, 250, yatapi.scresource.ORE),
+                      ts.Command(player, unit, yatapi.scquantifier.EXACTLY, 0),
+                      ts.Deaths(player, unit, yatapi.scquantifier.AT_LEAST, i % 7)]
+        actions = [ts.DisplayTextMessage('"Your hero has been revived!"'),
+                   ts.CreateUnit(player, unit, 1, 'spawn {}'.format(i % 8)),
+                   ts.SetResources(player, yatapi.scoperation.SUBTRACT, 250, yatapi.scresource.ORE),
+                   ts.SetDeaths(player, unit, yatapi.scoperation.SET_TO, 0),
+                   ts.PreserveTrigger()]
+        triggers.append(yatapi.trigger.Trigger([yatapi.scplayer.ALL_PLAYERS], conditions, actions))
+    return triggers
+
+
+def best_of(func, repeat=5, number=1):
+    """Gets the fastest wall time in seconds of `number` calls to `func`.
+
+    :param func:
+    :param repeat:
+    :param number:
+    :return:
+    """
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number
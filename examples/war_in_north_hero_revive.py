@@ -134,8 +134,8 @@ def create_revive_triggers(data) -> typing.List[yatapi.trigger.Trigger]:
 
 if __name__ == '__main__':
     revive_triggers = create_revive_triggers(data=DATA)
-    revive_system = yatapi.trigger.compile_triggers(revive_triggers, jsondata={'system': SYSTEM_NAME})
     outfile = 'war-in-the-north-hero-revive-triggers.txt'
-    with open(outfile, 'w') as f:
-        f.write(revive_system)
+    # stream straight to disk; newline='' keeps the Windows newlines TrigEdit expects as is
+    with open(outfile, 'w', newline='') as f:
+        yatapi.trigger.write_triggers(revive_triggers, f, jsondata={'system': SYSTEM_NAME})
 
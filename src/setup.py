@@ -10,6 +10,8 @@ setup(name='yatapi',
       license='MIT',
       python_requires=">=3.6",
       install_requires=[],
+      # optional, vectorizes `trigger_columns` queries
+      extras_require={'numpy': ['numpy']},
       packages=['yatapi'],
       # package_dir={'org.mitre.nlp.mbv':'org/mitre/nlp/mbv'},
       # package_data={'pyw3x':['data/storm/*.*', 'data/storm/win-64/*.*']},
@@ -120,6 +120,20 @@ def generate_python_trigger_api(annotations, template, sctypes, outfile):
         f.write(raw_template)
 
 
+def slots_tuple(fields):
+    """Generates the `__slots__` tuple literal for a statement's fields.
+
+    Input: ['player', 'unit']
+    Output: '("player", "unit")'
+
+    :param fields:
+    :return:
+    """
+    if len(fields) == 1:
+        return '("{}",)'.format(fields[0])
+    return '({})'.format(', '.join(['"{}"'.format(x) for x in fields]))
+
+
 def annotation_to_python(name, args, type_, template, sctypes):
     """Turns a JSON annotation into a Python object.
 
@@ -138,7 +152,8 @@ def annotation_to_python(name, args, type_, template, sctypes):
     quoted_fields = '["{}"]'.format(', '.join(qparams))
     if not quoted_fields:
         quoted_fields = ''
-    cls += '{}_quoted_fields = frozenset({})\n\n'.format(tab, quoted_fields)
+    cls += '{}_quoted_fields = frozenset({})\n'.format(tab, quoted_fields)
+    cls += '{}__slots__ = {}\n\n'.format(tab, slots_tuple([x['type'] for x in args]))
     # figure out the argument types
     imports = []
     for arg in args:
@@ -215,11 +230,9 @@ def arguments_to_python(arguments, argtype, outdir, prefix):
     tab = ' ' * TABSIZE
     # generate the top doc string
     body = '"""Wrapper for a Starcraft {} reference.\n\n"""'.format(argtype.title())
-    body += '\n\n\n'
+    body += '\n\nfrom yatapi.scvalue import SCRegistry, SCValue\n\n\n'
     # generate the actual wrapper
-    body += 'class {}:\n\tdef __init__(self, value: str):\n'.format(classname)
-    body += '\t\tself.value = value\n\n'
-    body += '\tdef __repr__(self):\n\t\treturn self.value\n\n\n'
+    body += 'class {}(SCValue):\n\t__slots__ = ()\n\n\n'.format(classname)
     # generate constants
     used_arguments = set()
     for arg in arguments:
@@ -231,6 +244,8 @@ def arguments_to_python(arguments, argtype, outdir, prefix):
         arg = arg.replace("'", "\\'")
         line = '{} = {}(\'{}\')\n'.format(constant_name, classname, arg)
         body += line
+    # numeric ids and categories are not part of the annotations; add them to the generated module by hand
+    body += '\nREGISTRY = SCRegistry({}, globals())\n'.format(classname)
     body = body.replace('\t', tab)
     with open(outfile, 'w') as f:
         f.write(body)
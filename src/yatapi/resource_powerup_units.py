@@ -1,12 +1,9 @@
-from yatapi.scunit import SCUnit
-
-RESOURCE_UNITS = [
- SCUnit('\"Mineral Chunk (Type 1)\"'),
- SCUnit('\"Mineral Chunk (Type 2)\"'),
- SCUnit('\"Vespene Orb (Protoss Type 1)\"'),
- SCUnit('\"Vespene Orb (Protoss Type 2)\"'),
- SCUnit('\"Vespene Sac (Zerg Type 1)\"'),
- SCUnit('\"Vespene Sac (Zerg Type 2)\"'),
- SCUnit('\"Vespene Tank (Terran Type 1)\"'),
- SCUnit('\"Vespene Tank (Terran Type 2)\"')
-]
\ No newline at end of file
+"""Minerals and gas carried by workers, kept here for backwards compatibility.
+
+See `yatapi.scunit.RESOURCE_UNITS`; this module keeps the list (sorted by name) it always gave.
+
+"""
+
+import yatapi.scunit
+
+RESOURCE_UNITS = sorted(yatapi.scunit.RESOURCE_UNITS, key=lambda x: x.value.strip('"'))
@@ -2,16 +2,16 @@
 
 """
 
+from yatapi.scvalue import SCRegistry, SCValue
 
-class SCAction:
-    def __init__(self, value: str):
-        self.value = value
 
-    def __repr__(self):
-        return self.value
+class SCAction(SCValue):
+    __slots__ = ()
 
 
 CLEAR = SCAction('clear')
 RANDOMIZE = SCAction('randomize')
 SET = SCAction('set')
 TOGGLE = SCAction('toggle')
+
+REGISTRY = SCRegistry(SCAction, globals(), ids={SET: 4, CLEAR: 5, TOGGLE: 6, RANDOMIZE: 11})
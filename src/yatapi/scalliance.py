@@ -2,15 +2,15 @@
 
 """
 
+from yatapi.scvalue import SCRegistry, SCValue
 
-class SCAlliance:
-    def __init__(self, value: str):
-        self.value = value
 
-    def __repr__(self):
-        return self.value
+class SCAlliance(SCValue):
+    __slots__ = ()
 
 
 ALLIED_VICTORY = SCAlliance('Allied Victory')
 ALLY = SCAlliance('Ally')
 ENEMY = SCAlliance('Enemy')
+
+REGISTRY = SCRegistry(SCAlliance, globals(), ids={ENEMY: 0, ALLY: 1, ALLIED_VICTORY: 2})
@@ -2,13 +2,11 @@
 
 """
 
+from yatapi.scvalue import SCValue
 
-class SCCount:
-    def __init__(self, value: str):
-        self.value = value
 
-    def __repr__(self):
-        return self.value
+class SCCount(SCValue):
+    __slots__ = ()
 
 
 ALL = 'All'
@@ -2,15 +2,15 @@
 
 """
 
+from yatapi.scvalue import SCRegistry, SCValue
 
-class SCOperation:
-    def __init__(self, value: str):
-        self.value = value
 
-    def __repr__(self):
-        return self.value
+class SCOperation(SCValue):
+    __slots__ = ()
 
 
 ADD = SCOperation('Add')
 SET_TO = SCOperation('Set To')
 SUBTRACT = SCOperation('Subtract')
+
+REGISTRY = SCRegistry(SCOperation, globals(), ids={SET_TO: 7, ADD: 8, SUBTRACT: 9})
@@ -2,13 +2,13 @@
 
 """
 
+from yatapi.scvalue import SCRegistry, SCValue
 
-class SCOrder:
-    def __init__(self, value: str):
-        self.value = value
 
-    def __repr__(self):
-        return self.value
+class SCOrder(SCValue):
+    __slots__ = ()
 
 
 PATROL = SCOrder('patrol')
+
+REGISTRY = SCRegistry(SCOrder, globals(), ids={PATROL: 1})
@@ -4,25 +4,17 @@
 
 import re
 
+from yatapi.scvalue import SCRegistry, SCValue
+
 DIGITS = re.compile(r'[0-9+]')
 
 
-class SCPlayer:
-    def __init__(self, value: str):
-        self.value = value
+class SCPlayer(SCValue):
+    __slots__ = ()
 
     def to_int(self) -> int:
         return int(DIGITS.search(self.value).group())
 
-    def __hash__(self):
-        return hash(self.value)
-
-    def __eq__(self, other):
-        return self.value == other.value
-
-    def __repr__(self):
-        return self.value
-
 
 ALL_PLAYERS = SCPlayer('"All players"')
 ALLIES = SCPlayer('"Allies"')
@@ -40,3 +32,8 @@ PLAYER_9 = SCPlayer('"Player 9"')
 PLAYER_10 = SCPlayer('"Player 10"')
 PLAYER_11 = SCPlayer('"Player 11"')
 PLAYER_12 = SCPlayer('"Player 12"')
+
+# ids are the player numbers stored in a map's trigger data
+REGISTRY = SCRegistry(SCPlayer, globals(), ids={
+    PLAYER_1: 0, PLAYER_2: 1, PLAYER_3: 2, PLAYER_4: 3, PLAYER_5: 4, PLAYER_6: 5, PLAYER_7: 6, PLAYER_8: 7,
+    PLAYER_9: 8, PLAYER_10: 9, PLAYER_11: 10, PLAYER_12: 11, CURRENT_PLAYER: 13, FOES: 14, ALLIES: 15, ALL_PLAYERS: 17})
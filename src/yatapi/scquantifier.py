@@ -2,15 +2,15 @@
 
 """
 
+from yatapi.scvalue import SCRegistry, SCValue
 
-class SCQuantifier:
-    def __init__(self, value: str):
-        self.value = value
 
-    def __repr__(self):
-        return self.value
+class SCQuantifier(SCValue):
+    __slots__ = ()
 
 
 AT_LEAST = SCQuantifier('At least')
 AT_MOST = SCQuantifier('At most')
 EXACTLY = SCQuantifier('Exactly')
+
+REGISTRY = SCRegistry(SCQuantifier, globals(), ids={AT_LEAST: 0, AT_MOST: 1, EXACTLY: 10})
@@ -2,14 +2,15 @@
 
 """
 
+from yatapi.scvalue import SCRegistry, SCValue
 
-class SCResource:
-    def __init__(self, value: str):
-        self.value = value
 
-    def __repr__(self):
-        return self.value
+class SCResource(SCValue):
+    __slots__ = ()
 
 
 GAS = SCResource('gas')
 ORE = SCResource('ore')
+ORE_AND_GAS = SCResource('ore and gas')
+
+REGISTRY = SCRegistry(SCResource, globals(), ids={ORE: 0, GAS: 1, ORE_AND_GAS: 2})
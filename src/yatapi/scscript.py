@@ -2,15 +2,15 @@
 
 """
 
+from yatapi.scvalue import SCRegistry, SCValue
 
-class SCScript:
-    def __init__(self, value: str):
-        self.value = value
 
-    def __repr__(self):
-        return self.value
+class SCScript(SCValue):
+    __slots__ = ()
 
 
 VI6 = SCScript('"+Vi6"')
 VI7 = SCScript('"+Vi7"')
 JYDG = SCScript('"JYDg"')
+
+REGISTRY = SCRegistry(SCScript, globals())
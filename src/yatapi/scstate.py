@@ -2,15 +2,15 @@
 
 """
 
+from yatapi.scvalue import SCRegistry, SCValue
 
-class SCState:
-    def __init__(self, value: str):
-        self.value = value
 
-    def __repr__(self):
-        return self.value
+class SCState(SCValue):
+    __slots__ = ()
 
 
 DISABLED = SCState('disabled')
 ENABLED = SCState('enabled')
 NOT_SET = SCState('not set')
+
+REGISTRY = SCRegistry(SCState, globals(), ids={NOT_SET: 3, ENABLED: 4, DISABLED: 5})
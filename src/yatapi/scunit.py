@@ -2,13 +2,11 @@
 
 """
 
+from yatapi.scvalue import SCRegistry, SCValue
 
-class SCUnit:
-    def __init__(self, value: str):
-        self.value = value
 
-    def __repr__(self):
-        return self.value
+class SCUnit(SCValue):
+    __slots__ = ()
 
 
 # meta units
@@ -246,3 +244,80 @@ ZERG_SUNKEN_COLONY = SCUnit('"Zerg Sunken Colony"')
 ZERG_ULTRALISK = SCUnit('"Zerg Ultralisk"')
 ZERG_ULTRALISK_CAVERN = SCUnit('"Zerg Ultralisk Cavern"')
 ZERG_ZERGLING = SCUnit('"Zerg Zergling"')
+
+
+# every unit in order of its numeric game id (its index in units.dat), e.g. UNITS_BY_ID[0] is TERRAN_MARINE
+UNITS_BY_ID = (
+    TERRAN_MARINE, TERRAN_GHOST, TERRAN_VULTURE, TERRAN_GOLIATH, GOLIATH_TURRET, TERRAN_SIEGE_TANK_TANK_MODE,
+    TANK_TURRET_TYPE_1, TERRAN_SCV, TERRAN_WRAITH, TERRAN_SCIENCE_VESSEL, GUI_MONTAG_FIREBAT, TERRAN_DROPSHIP,
+    TERRAN_BATTLECRUISER, VULTURE_SPIDER_MINE, NUCLEAR_MISSILE, TERRAN_CIVILIAN, SARAH_KERRIGAN_GHOST,
+    ALAN_SCHEZAR_GOLIATH, ALAN_TURRET, JIM_RAYNOR_VULTURE, JIM_RAYNOR_MARINE, TOM_KAZANSKY_WRAITH,
+    MAGELLAN_SCIENCE_VESSEL, EDMUND_DUKE_SIEGE_TANK, DUKE_TURRET_TYPE_1, EDMUND_DUKE_SIEGE_MODE, DUKE_TURRET_TYPE_2,
+    ARCTURUS_MENGSK_BATTLECRUISER, HYPERION_BATTLECRUISER, NORAD_II_BATTLECRUISER, TERRAN_SIEGE_TANK_SIEGE_MODE,
+    TANK_TURRET_TYPE_2, TERRAN_FIREBAT, SCANNER_SWEEP, TERRAN_MEDIC, ZERG_LARVA, ZERG_EGG, ZERG_ZERGLING,
+    ZERG_HYDRALISK, ZERG_ULTRALISK, ZERG_BROODLING, ZERG_DRONE, ZERG_OVERLORD, ZERG_MUTALISK, ZERG_GUARDIAN,
+    ZERG_QUEEN, ZERG_DEFILER, ZERG_SCOURGE, TORRASQUE_ULTRALISK, MATRIARCH_QUEEN, INFESTED_TERRAN,
+    INFESTED_KERRIGAN_INFESTED_TERRAN, UNCLEAN_ONE_DEFILER, HUNTER_KILLER_HYDRALISK, DEVOURING_ONE_ZERGLING,
+    KUKULZA_MUTALISK, KUKULZA_GUARDIAN, YGGDRASILL_OVERLORD, TERRAN_VALKYRIE, COCOON, PROTOSS_CORSAIR,
+    PROTOSS_DARK_TEMPLAR, ZERG_DEVOURER, PROTOSS_DARK_ARCHON, PROTOSS_PROBE, PROTOSS_ZEALOT, PROTOSS_DRAGOON,
+    PROTOSS_HIGH_TEMPLAR, PROTOSS_ARCHON, PROTOSS_SHUTTLE, PROTOSS_SCOUT, PROTOSS_ARBITER, PROTOSS_CARRIER,
+    PROTOSS_INTERCEPTOR, DARK_TEMPLAR_HERO, ZERATUL_DARK_TEMPLAR, TASSADARZERATUL_ARCHON, FENIX_ZEALOT, FENIX_DRAGOON,
+    TASSADAR_TEMPLAR, MOJO_SCOUT, WARBRINGER_REAVER, GANTRITHOR_CARRIER, PROTOSS_REAVER, PROTOSS_OBSERVER,
+    PROTOSS_SCARAB, DANIMOTH_ARBITER, ALDARIS_TEMPLAR, ARTANIS_SCOUT, RHYNADON_BADLANDS, BENGALAAS_JUNGLE,
+    UNUSED_TYPE_1, UNUSED_TYPE_2, SCANTID_DESERT, KAKARU_TWILIGHT, RAGNASAUR_ASH_WORLD, URSADON_ICE_WORLD,
+    ZERG_LURKER_EGG, RASZAGAL_DARK_TEMPLAR, SAMIR_DURAN_GHOST, ALEXEI_STUKOV_GHOST, MAP_REVEALER,
+    GERARD_DUGALLE_GHOST, ZERG_LURKER, INFESTED_DURAN, DISRUPTION_FIELD, TERRAN_COMMAND_CENTER, TERRAN_COMSAT_STATION,
+    TERRAN_NUCLEAR_SILO, TERRAN_SUPPLY_DEPOT, TERRAN_REFINERY, TERRAN_BARRACKS, TERRAN_ACADEMY, TERRAN_FACTORY,
+    TERRAN_STARPORT, TERRAN_CONTROL_TOWER, TERRAN_SCIENCE_FACILITY, TERRAN_COVERT_OPS, TERRAN_PHYSICS_LAB,
+    UNUSED_TERRAN_BLDG_TYPE_1, TERRAN_MACHINE_SHOP, UNUSED_TERRAN_BLDG_TYPE_2, TERRAN_ENGINEERING_BAY, TERRAN_ARMORY,
+    TERRAN_MISSILE_TURRET, TERRAN_BUNKER, NORAD_II_CRASHED_BATTLECRUISER, ION_CANNON, URAJ_CRYSTAL, KHALIS_CRYSTAL,
+    INFESTED_COMMAND_CENTER, ZERG_HATCHERY, ZERG_LAIR, ZERG_HIVE, ZERG_NYDUS_CANAL, ZERG_HYDRALISK_DEN,
+    ZERG_DEFILER_MOUND, ZERG_GREATER_SPIRE, ZERG_QUEENS_NEST, ZERG_EVOLUTION_CHAMBER, ZERG_ULTRALISK_CAVERN,
+    ZERG_SPIRE, ZERG_SPAWNING_POOL, ZERG_CREEP_COLONY, ZERG_SPORE_COLONY, UNUSED_ZERG_BLDG, ZERG_SUNKEN_COLONY,
+    ZERG_OVERMIND_WITH_SHELL, ZERG_OVERMIND, ZERG_EXTRACTOR, MATURE_CRYSALIS, ZERG_CEREBRATE, ZERG_CEREBRATE_DAGGOTH,
+    UNUSED_ZERG_BLDG_5, PROTOSS_NEXUS, PROTOSS_ROBOTICS_FACILITY, PROTOSS_PYLON, PROTOSS_ASSIMILATOR,
+    PROTOSS_UNUSED_TYPE_1, PROTOSS_OBSERVATORY, PROTOSS_GATEWAY, PROTOSS_UNUSED_TYPE_2, PROTOSS_PHOTON_CANNON,
+    PROTOSS_CITADEL_OF_ADUN, PROTOSS_CYBERNETICS_CORE, PROTOSS_TEMPLAR_ARCHIVES, PROTOSS_FORGE, PROTOSS_STARGATE,
+    STASIS_CELLPRISON, PROTOSS_FLEET_BEACON, PROTOSS_ARBITER_TRIBUNAL, PROTOSS_ROBOTICS_SUPPORT_BAY,
+    PROTOSS_SHIELD_BATTERY, KHAYDARIN_CRYSTAL_FORMATION, PROTOSS_TEMPLE, XELNAGA_TEMPLE, MINERAL_FIELD_TYPE_1,
+    MINERAL_FIELD_TYPE_2, MINERAL_FIELD_TYPE_3, CAVE, CAVEIN, CANTINA, MINING_PLATFORM, INDEPENDENT_COMMAND_CENTER,
+    INDEPENDENT_STARPORT, JUMP_GATE, RUINS, KYADARIN_CRYSTAL_FORMATION, VESPENE_GEYSER, WARP_GATE, PSI_DISRUPTER,
+    ZERG_MARKER, TERRAN_MARKER, PROTOSS_MARKER, ZERG_BEACON, TERRAN_BEACON, PROTOSS_BEACON, ZERG_FLAG_BEACON,
+    TERRAN_FLAG_BEACON, PROTOSS_FLAG_BEACON, POWER_GENERATOR, OVERMIND_COCOON, DARK_SWARM, FLOOR_MISSILE_TRAP,
+    FLOOR_HATCH_UNUSED, LEFT_UPPER_LEVEL_DOOR, RIGHT_UPPER_LEVEL_DOOR, LEFT_PIT_DOOR, RIGHT_PIT_DOOR, FLOOR_GUN_TRAP,
+    LEFT_WALL_MISSILE_TRAP, LEFT_WALL_FLAME_TRAP, RIGHT_WALL_MISSILE_TRAP, RIGHT_WALL_FLAME_TRAP, START_LOCATION,
+    FLAG, YOUNG_CHRYSALIS, PSI_EMITTER, DATA_DISC, KHAYDARIN_CRYSTAL, MINERAL_CHUNK_TYPE_1, MINERAL_CHUNK_TYPE_2,
+    VESPENE_ORB_PROTOSS_TYPE_1, VESPENE_ORB_PROTOSS_TYPE_2, VESPENE_SAC_ZERG_TYPE_1, VESPENE_SAC_ZERG_TYPE_2,
+    VESPENE_TANK_TERRAN_TYPE_1, VESPENE_TANK_TERRAN_TYPE_2, UNUSED_UNIT_228, ANY_UNIT, MEN, BUILDINGS, FACTORIES
+)
+# hero versions of units, which have unique names and better stats
+HERO_UNITS = frozenset([
+    ALAN_SCHEZAR_GOLIATH, ALDARIS_TEMPLAR, ALEXEI_STUKOV_GHOST, ARCTURUS_MENGSK_BATTLECRUISER, ARTANIS_SCOUT,
+    DANIMOTH_ARBITER, DARK_TEMPLAR_HERO, DEVOURING_ONE_ZERGLING, EDMUND_DUKE_SIEGE_MODE, EDMUND_DUKE_SIEGE_TANK,
+    FENIX_DRAGOON, FENIX_ZEALOT, GANTRITHOR_CARRIER, GERARD_DUGALLE_GHOST, GUI_MONTAG_FIREBAT,
+    HUNTER_KILLER_HYDRALISK, HYPERION_BATTLECRUISER, INFESTED_DURAN, INFESTED_KERRIGAN_INFESTED_TERRAN,
+    JIM_RAYNOR_MARINE, JIM_RAYNOR_VULTURE, KUKULZA_GUARDIAN, KUKULZA_MUTALISK, MAGELLAN_SCIENCE_VESSEL,
+    MATRIARCH_QUEEN, MOJO_SCOUT, NORAD_II_BATTLECRUISER, RASZAGAL_DARK_TEMPLAR, SAMIR_DURAN_GHOST,
+    SARAH_KERRIGAN_GHOST, TASSADARZERATUL_ARCHON, TASSADAR_TEMPLAR, TOM_KAZANSKY_WRAITH, TORRASQUE_ULTRALISK,
+    UNCLEAN_ONE_DEFILER, WARBRINGER_REAVER, YGGDRASILL_OVERLORD, ZERATUL_DARK_TEMPLAR
+])
+# units that cannot be killed by the Kill Unit actions
+UNKILLABLE_UNITS = frozenset([
+    ALAN_TURRET, CANTINA, CAVE, CAVEIN, DARK_SWARM, DATA_DISC, DISRUPTION_FIELD, DUKE_TURRET_TYPE_1,
+    DUKE_TURRET_TYPE_2, FLAG, FLOOR_HATCH_UNUSED, GOLIATH_TURRET, INDEPENDENT_COMMAND_CENTER, INDEPENDENT_STARPORT,
+    KHALIS_CRYSTAL, KHAYDARIN_CRYSTAL, KHAYDARIN_CRYSTAL_FORMATION, LEFT_PIT_DOOR, LEFT_UPPER_LEVEL_DOOR,
+    MAP_REVEALER, MINERAL_FIELD_TYPE_1, MINERAL_FIELD_TYPE_2, MINERAL_FIELD_TYPE_3, MINING_PLATFORM, NUCLEAR_MISSILE,
+    PROTOSS_BEACON, PROTOSS_FLAG_BEACON, PROTOSS_MARKER, PROTOSS_UNUSED_TYPE_1, PROTOSS_UNUSED_TYPE_2, PSI_EMITTER,
+    RIGHT_PIT_DOOR, RIGHT_UPPER_LEVEL_DOOR, RUINS, SCANNER_SWEEP, START_LOCATION, TANK_TURRET_TYPE_1,
+    TANK_TURRET_TYPE_2, TERRAN_BEACON, TERRAN_FLAG_BEACON, TERRAN_MARKER, UNUSED_TERRAN_BLDG_TYPE_1,
+    UNUSED_TERRAN_BLDG_TYPE_2, UNUSED_TYPE_1, UNUSED_TYPE_2, UNUSED_UNIT_228, UNUSED_ZERG_BLDG, UNUSED_ZERG_BLDG_5,
+    URAJ_CRYSTAL, VESPENE_GEYSER, ZERG_BEACON, ZERG_FLAG_BEACON, ZERG_MARKER
+])
+# minerals and gas carried by workers
+RESOURCE_UNITS = frozenset([
+    MINERAL_CHUNK_TYPE_1, MINERAL_CHUNK_TYPE_2, VESPENE_ORB_PROTOSS_TYPE_1, VESPENE_ORB_PROTOSS_TYPE_2,
+    VESPENE_SAC_ZERG_TYPE_1, VESPENE_SAC_ZERG_TYPE_2, VESPENE_TANK_TERRAN_TYPE_1, VESPENE_TANK_TERRAN_TYPE_2
+])
+
+REGISTRY = SCRegistry(SCUnit, globals(), ids={x: i for i, x in enumerate(UNITS_BY_ID)},
+                      categories={'hero': HERO_UNITS, 'unkillable': UNKILLABLE_UNITS, 'resource': RESOURCE_UNITS})
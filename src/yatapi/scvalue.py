@@ -0,0 +1,119 @@
+"""Base wrapper for a Starcraft value reference (unit, player, quantifier, etc.).
+
+"""
+
+import typing
+
+
+class SCValue:
+    __slots__ = ('value',)
+
+    def __init__(self, value: str):
+        self.value = value
+
+    def __reduce__(self):
+        # pickle as just the class and TrigEdit string, e.g. when sending triggers to worker processes
+        return self.__class__, (self.value,)
+
+    def __eq__(self, other):
+        if not isinstance(other, SCValue):
+            return NotImplemented
+        return self.__class__ is other.__class__ and self.value == other.value
+
+    def __hash__(self):
+        # the string caches its own hash; values of different classes that compare unequal may share a hash
+        return hash(self.value)
+
+    def __repr__(self):
+        return self.value
+
+
+# registry of each SC value type, filled in as the modules defining the constants are imported
+REGISTRIES = {}
+# every registered constant keyed by its TrigEdit string, across all SC value types
+_CONSTANTS_BY_VALUE = {}
+
+
+class SCRegistry:
+    def __init__(self, sc_class, namespace: typing.Mapping[str, typing.Any],
+                 ids: typing.Optional[typing.Mapping[SCValue, int]] = None,
+                 categories: typing.Optional[typing.Mapping[str, typing.Iterable[SCValue]]] = None):
+        """Constant time lookups of the constants of an SC value type.
+
+        Constants can be found by TrigEdit string (e.g. '"Terran Marine"'), by constant name (e.g. "TERRAN_MARINE"),
+        or by the numeric id the game stores in a map's trigger data.
+
+        :param sc_class: e.g. `SCUnit`
+        :param namespace: the module namespace defining the constants, i.e. its `globals()`
+        :param ids: numeric game id of each constant, if the type has them
+        :param categories: named groups of constants, e.g. {'hero': HERO_UNITS}
+        """
+        self.sc_class = sc_class
+        self.by_name = {name: value for name, value in namespace.items()
+                        if isinstance(value, sc_class) and name.isupper()}
+        self.by_value = {x.value: x for x in self.by_name.values()}
+        self.names = {x: name for name, x in self.by_name.items()}
+        self.ids = dict(ids) if ids else {}
+        self.by_id = {id_: x for x, id_ in self.ids.items()}
+        self.categories = {name: frozenset(members) for name, members in (categories or {}).items()}
+        REGISTRIES[sc_class] = self
+        for value, constant in self.by_value.items():
+            _CONSTANTS_BY_VALUE[value] = _CONSTANTS_BY_VALUE.get(value, ()) + (constant,)
+
+    def get(self, value: str) -> typing.Optional[SCValue]:
+        """Gets the constant with a TrigEdit string; the surrounding double quotes may be left out.
+
+        :param value: e.g. '"Terran Marine"' or 'Terran Marine'
+        :return: the constant, or None if there is none
+        """
+        constant = self.by_value.get(value)
+        if constant is None and value[:1] != '"':
+            constant = self.by_value.get('"{}"'.format(value))
+        return constant
+
+    def get_by_name(self, name: str) -> typing.Optional[SCValue]:
+        return self.by_name.get(name)
+
+    def get_by_id(self, id_: int) -> typing.Optional[SCValue]:
+        return self.by_id.get(id_)
+
+    def name_of(self, value: SCValue) -> typing.Optional[str]:
+        return self.names.get(value)
+
+    def id_of(self, value: SCValue) -> typing.Optional[int]:
+        return self.ids.get(value)
+
+    def in_category(self, value: SCValue, category: str) -> bool:
+        """Checks if a value belongs to a named category, e.g. `in_category(scunit.FLAG, 'unkillable')`.
+
+        :param value:
+        :param category:
+        :return:
+        """
+        return value in self.categories[category]
+
+    def __contains__(self, value):
+        if isinstance(value, str):
+            return self.get(value) is not None
+        return value in self.names
+
+    def __iter__(self):
+        return iter(self.by_name.values())
+
+    def __len__(self):
+        return len(self.by_name)
+
+    def __repr__(self):
+        return 'SCRegistry({}, constants={}, categories={})'.format(
+            self.sc_class.__name__, len(self), sorted(self.categories))
+
+
+def classify(value: str) -> typing.Tuple[SCValue, ...]:
+    """Finds every registered constant, of any SC value type, with a TrigEdit string.
+
+    E.g. classify('"Terran Marine"') gives (scunit.TERRAN_MARINE,).
+
+    :param value: a raw TrigEdit argument
+    :return: the matching constants; empty if the value is not a known constant
+    """
+    return _CONSTANTS_BY_VALUE.get(value, ())
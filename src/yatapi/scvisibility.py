@@ -2,13 +2,13 @@
 
 """
 
+from yatapi.scvalue import SCRegistry, SCValue
 
-class SCVisibility:
-    def __init__(self, value: str):
-        self.value = value
 
-    def __repr__(self):
-        return self.value
+class SCVisibility(SCValue):
+    __slots__ = ()
 
 
 ALWAYS_DISPLAY = SCVisibility('Always Display')
+
+REGISTRY = SCRegistry(SCVisibility, globals())
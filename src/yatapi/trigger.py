@@ -2,12 +2,20 @@
 
 """
 
+import collections
+import concurrent.futures
+import glob
+import io
+import itertools
 import json
+import locale
+import os
 import re
 import typing
 
 import yatapi.logger
 import yatapi.scplayer
+import yatapi.scvalue
 import yatapi.trigger_statements
 
 WIN_NEWLINE = '\r\n'
@@ -19,23 +27,64 @@ TRIGGER_START = '{'
 TRIGGER_END = '}'
 TRIGGER_ACTION = 'action'
 TRIGGER_CONDITION = 'condition'
+# most actions a trigger can hold
+MAX_ACTIONS = 64
+
+# number of triggers handed to a worker process at a time when compiling in parallel
+DEFAULT_CHUNKSIZE = 500
+# number of compiled triggers kept by a `CompileCache` unless told otherwise
+DEFAULT_CACHE_SIZE = 10000
+# number of bytes read at a time when streaming triggers from a file
+DEFAULT_READ_SIZE = 1 << 20
+# number of parsed statements kept by a `TrigEditParser` statement cache unless told otherwise
+DEFAULT_STATEMENT_CACHE_SIZE = 4096
 
 # regular expressions to parse TrigEdit format
-PLAYERS_RE = re.compile(r'Trigger\((?P<players>[^\)]+?)\){', re.IGNORECASE)
-CONDITIONS_RE = re.compile(r'Conditions:(?P<conditions>.+?)Actions:', re.IGNORECASE | re.DOTALL)
-ACTIONS_RE = re.compile(r'Actions:(?P<actions>.+)', re.IGNORECASE | re.DOTALL)
 STATEMENT_RE = re.compile(r'(?P<name>[^\(]+)\((?P<args>.*?)\)$', re.DOTALL)
+# a double quoted string, allowing escaped quotes inside
+_QUOTED = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+# single pass tokenizer of TrigEdit text; quotes are matched whole so ; , ( ) { } inside strings are just text.
+# A statement's arguments run until the first ")" outside quotes that is followed by ";" (or the closing "}").
+# Repeated groups are written as unrolled loops so malformed text cannot cause catastrophic backtracking.
+TOKEN_RE = re.compile(r"""
+    \s*(?:
+    (?P<separator>//-+//)
+  | (?P<header>Trigger\s*\((?P<players>[^")]*(?:{quoted}[^")]*)*)\)\s*\{{)
+  | (?P<section>Conditions|Actions)\s*:
+  | (?P<statement>(?P<text>(?P<name>[^\s(){{}};:"][^(){{}};"\r\n]*)\((?P<args>[^";)]*(?:(?:{quoted}|\)(?!\s*[;}}]))[^";)]*)*)\))
+                   \s*(?:;|(?=\}})))
+  | (?P<end>\}})
+    )
+""".format(quoted=_QUOTED), re.VERBOSE | re.IGNORECASE | re.DOTALL)
+
+# kinds of tokens emitted by `iter_tokens`
+TOKEN_SEPARATOR = 'separator'
+TOKEN_HEADER = 'header'
+TOKEN_SECTION = 'section'
+TOKEN_STATEMENT = 'statement'
+TOKEN_END = 'end'
 
 # prefix/regex for indicating if comment is JSON data
 JSON_COMMENT_PREFIX = 'JSON='
 JSON_COMMENT_REGEX = re.compile(r'^"JSON=(?P<json>.+?)"\);$')
+# prefix of a single JSON comment marking a whole run of triggers, followed by how many triggers, e.g.
+# Comment("JSON*120={'system': 'Hero Revival'}") in the last of 120 triggers
+JSON_MARKER_PREFIX = 'JSON*'
+
+# how `compile_triggers` records `jsondata`
+# a JSON comment appended to every trigger (through `Trigger.add_action`, so the triggers keep it)
+METADATA_COMMENT = 'comment'
+# one JSON marker comment, in the last trigger only; the triggers given are left untouched
+METADATA_MARKER = 'marker'
+# no comments at all: a line of JSON (see `sidecar_record`) is written to a separate sidecar file instead
+METADATA_SIDECAR = 'sidecar'
+METADATA_MODES = (METADATA_COMMENT, METADATA_MARKER, METADATA_SIDECAR)
 
 
 def parse_comma_separated_args(raw_args):
     """Parses an string of comma separated arguments into each argument.
 
-    Ignores commas inside double quotes.
-    Does not handle multiple double quotes or incorrectly nested double quotes.
+    Ignores commas inside double quotes, including escaped double quotes (\\") inside them.
 
     Input: 'Always Display, "Please wait for Player 1 to decide to enable or skip tutorial."'
     Output: ['Always Display', '"Please wait for Player 1 to decide to enable or skip tutorial."']
@@ -44,82 +93,441 @@ def parse_comma_separated_args(raw_args):
     :type raw_args: str
     :return:
     """
-    start = 0
+    args = raw_args.split(',')
+    if len(args) > 1 and '"' in raw_args:
+        # only rejoin when a quoted string actually holds a comma (or an escaped quote)
+        quoted = ''.join(raw_args.split('"')[1::2])
+        if ',' in quoted or '\\' in quoted:
+            args = _rejoin_quoted_args(args)
+    if not args[-1]:
+        args.pop()
+    return args
+
+
+def _rejoin_quoted_args(pieces):
+    """Rejoins pieces of a comma split that fall inside a double quoted string.
+
+    A quote opens in a piece with an odd number of (unescaped) quotes and closes in the next such piece.
+    Counting quotes with `str.count` keeps the scan in C, which matters for long text messages.
+
+    :param pieces:
+    :return:
+    """
+    odd = [i for i, piece in enumerate(pieces) if (piece.count('"') - piece.count('\\"')) % 2]
+    if not odd:
+        return pieces
     args = []
-    curr_arg = ''
-    inside_quote = False
-    while start < len(raw_args):
-        car = raw_args[start]
-        if car == ',':
-            if inside_quote:
-                curr_arg += car
-            else:
-                args.append(curr_arg)
-                curr_arg = ''
-        elif car == '"':
-            curr_arg += car
-            if inside_quote:
-                inside_quote = False
-            else:
-                inside_quote = True
-        else:
-            curr_arg += car
-        start += 1
-    if curr_arg != '':
-        args.append(curr_arg)
+    previous = 0
+    # an unterminated quote runs to the last piece
+    for start, end in itertools.zip_longest(odd[::2], odd[1::2], fillvalue=len(pieces) - 1):
+        args.extend(pieces[previous:start])
+        args.append(','.join(pieces[start:end + 1]))
+        previous = end + 1
+    args.extend(pieces[previous:])
     return args
 
 
+def iter_tokens(text: str, pos: int = 0, endpos: typing.Optional[int] = None) -> typing.Iterator[typing.Tuple[str, typing.Match]]:
+    """Tokenizes TrigEdit text in a single pass.
+
+    Each token is the kind (e.g. `TOKEN_STATEMENT`) and its match, whose groups give the spans of
+    the players (`players`), or a statement's text without the semicolon (`text`), name (`name`) and arguments (`args`).
+    Text outside of any token (whitespace or anything unrecognized) is skipped.
+
+    :param text: TrigEdit text, one or many triggers
+    :param pos: offset to start tokenizing from
+    :param endpos: offset to stop tokenizing at; defaults to the end of the text
+    :return:
+    """
+    if endpos is None:
+        endpos = len(text)
+    for match in TOKEN_RE.finditer(text, pos, endpos):
+        yield match.lastgroup, match
+
+
+def decode_text(data: bytes, encoding: str) -> str:
+    """Decodes TrigEdit bytes with the newline translation of a file opened in text mode: "\r\n" and "\r" become
+    "\n", as the parser gave for files before it read them as bytes.
+
+    :param data:
+    :param encoding:
+    :return:
+    """
+    text = data.decode(encoding)
+    if '\r' in text:
+        return text.replace(WIN_NEWLINE, NIX_NEWLINE).replace('\r', NIX_NEWLINE)
+    return text
+
+
+# a trigger's byte range in a file (`start` to `end`, from "Trigger(" through its closing brace) and the parsed trigger
+TriggerSpan = collections.namedtuple('TriggerSpan', ['start', 'end', 'trigger'])
+
+
+def iter_trigger_blocks(infile: typing.Union[str, typing.BinaryIO], start: int = 0, end: typing.Optional[int] = None,
+                        read_size: int = DEFAULT_READ_SIZE) -> typing.Iterator[typing.Tuple[int, int, bytes]]:
+    """Lazily splits a TrigEdit file into trigger blocks, as separated by `TRIGGER_SEPARATOR`.
+
+    The file is read `read_size` bytes at a time, so memory is bounded by the largest single trigger
+    rather than the file size.
+
+    :param infile: path to the file, or a binary file object
+    :param start: byte offset to start reading from; should be the start of the file or just after a separator
+    :param end: byte offset to stop reading at; defaults to the end of the file
+    :param read_size: number of bytes read at a time
+    :return: the start and end byte offsets of each non-blank block (surrounding whitespace excluded) and its bytes
+    """
+    if not hasattr(infile, 'read'):
+        with open(infile, 'rb') as f:
+            yield from iter_trigger_blocks(f, start=start, end=end, read_size=read_size)
+        return
+    separator = TRIGGER_SEPARATOR.encode('ascii')
+    infile.seek(start)
+    remaining = None if end is None else end - start
+    buffer = bytearray()
+    # file offset of buffer[0], and how far the buffer was already searched for a separator
+    offset = start
+    searched = 0
+    while True:
+        size = read_size if remaining is None else min(read_size, remaining)
+        chunk = infile.read(size) if size else b''
+        if remaining is not None:
+            remaining -= len(chunk)
+        buffer += chunk
+        block_start = 0
+        index = buffer.find(separator, searched)
+        while index >= 0:
+            block = _strip_block(buffer, block_start, index, offset)
+            if block:
+                yield block
+            block_start = index + len(separator)
+            index = buffer.find(separator, block_start)
+        del buffer[:block_start]
+        offset += block_start
+        # a separator may straddle the next read
+        searched = max(0, len(buffer) - len(separator) + 1)
+        if not chunk:
+            block = _strip_block(buffer, 0, len(buffer), offset)
+            if block:
+                yield block
+            return
+
+
+def _strip_block(buffer: bytearray, start: int, end: int, offset: int) -> typing.Optional[typing.Tuple[int, int, bytes]]:
+    block = bytes(buffer[start:end])
+    stripped = block.strip()
+    if not stripped:
+        return None
+    leading = len(block) - len(block.lstrip())
+    return offset + start + leading, offset + start + leading + len(stripped), stripped
+
+
+class LRUCache:
+    def __init__(self, maxsize: int):
+        """Bounded least recently used cache that counts its hits and misses.
+
+        :param maxsize: maximum number of entries kept; least recently used are evicted first
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+
+    def get(self, key):
+        """Looks up a key, counting the lookup as a hit or a miss.
+
+        :param key:
+        :return: the cached value, or None if the key is not cached
+        """
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return '{}(hits={}, misses={}, size={}, maxsize={})'.format(
+            type(self).__name__, self.hits, self.misses, len(self), self.maxsize)
+
+
+class ParsedStatement(dict):
+    """A parsed statement that cannot be modified, so one instance can be shared by every occurrence
+    of the same statement text.  Its args are a tuple.
+    """
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError('{} is immutable'.format(type(self).__name__))
+
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self):
+        return ParsedStatement, (dict(self),)
+
+
+class TriggerFilter:
+    def __init__(self, statements: typing.Iterable[str] = (), values: typing.Iterable = (),
+                 predicate: typing.Optional[typing.Callable[[typing.Dict], bool]] = None, match_all: bool = True):
+        """Selects triggers while extracting them (see `TrigEditParser.extract_triggers`).
+
+        Each block of text between separators is first checked for the literal text of every term, which rejects most
+        blocks without parsing them; only the remaining candidates are parsed and checked exactly.
+
+        :param statements: TrigEdit names of statements, e.g. "Set Switch"
+        :param values: arguments of statements (or players of the trigger), e.g. `scunit.TERRAN_MARINE`, 'Anywhere'
+                       or 12; quotes may be left out of quoted values
+        :param predicate: further check on each parsed trigger that passed the terms (called with the trigger as
+                          extracted)
+        :param match_all: whether a trigger needs every term rather than any of them
+        """
+        self.statements = tuple(dict.fromkeys(statements))
+        self.values = tuple(dict.fromkeys(self._value_text(x) for x in values))
+        self.predicate = predicate
+        self.match_all = match_all
+        # literal text of each term, in the order they are checked
+        self.literals = tuple(['{}('.format(x) for x in self.statements] + list(self.values))
+        self._prefilters = {}
+
+    @staticmethod
+    def _value_text(value) -> str:
+        if isinstance(value, yatapi.scvalue.SCValue):
+            return value.value
+        return value if type(value) is str else str(value)
+
+    @classmethod
+    def coerce(cls, where: typing.Union['TriggerFilter', typing.Callable[[typing.Dict], bool]]) -> 'TriggerFilter':
+        """Gets a filter from the `where` argument of the extract methods: a filter, or a predicate on each trigger.
+
+        :param where:
+        :return:
+        """
+        return where if isinstance(where, TriggerFilter) else cls(predicate=where)
+
+    def prefilter(self, encoding: typing.Optional[str] = None) -> typing.Callable:
+        """Gets the cheap check of a block of text, e.g. `prefilter()(text, start, end)`.
+
+        With `match_all` every literal is searched for as a substring; otherwise a single regular expression of all
+        the literals finds the first one.  Blocks failing the check cannot match; blocks passing it may.
+
+        :param encoding: encoding of the blocks if they are bytes
+        :return: a function of the text, start and end of a block returning whether the block is a candidate
+        """
+        check = self._prefilters.get(encoding)
+        if check is None:
+            literals = [x.encode(encoding) for x in self.literals] if encoding else list(self.literals)
+            if not literals:
+                def check(text, start, end):
+                    return True
+            elif self.match_all:
+                # rarer (usually longer) text first, so most blocks are rejected by the first search
+                literals.sort(key=len, reverse=True)
+
+                def check(text, start, end):
+                    for literal in literals:
+                        if text.find(literal, start, end) < 0:
+                            return False
+                    return True
+            else:
+                search = re.compile(b'|'.join(map(re.escape, literals)) if encoding else
+                                    '|'.join(map(re.escape, literals))).search
+
+                def check(text, start, end):
+                    return search(text, start, end) is not None
+            self._prefilters[encoding] = check
+        return check
+
+    def matches(self, trigger: typing.Dict, parser: 'TrigEditParser') -> bool:
+        """Checks a parsed trigger exactly.
+
+        :param trigger: as extracted, with or without `parse_statements`
+        :param parser: parser used to parse statements given as raw text
+        :return:
+        """
+        if self.literals:
+            names = set()
+            args = set(x.strip() for x in parse_comma_separated_args(trigger['players']))
+            for statement in itertools.chain(trigger['conditions'], trigger['actions']):
+                if type(statement) is str:
+                    statement = parser.parse_statement(statement)
+                names.add(statement['name'])
+                args.update(statement['args'])
+            found = [x in names for x in self.statements]
+            found.extend(x in args or '"{}"'.format(x) in args for x in self.values)
+            if not (all(found) if self.match_all else any(found)):
+                return False
+        return self.predicate is None or bool(self.predicate(trigger))
+
+    def __repr__(self):
+        return 'TriggerFilter(statements={}, values={}, predicate={}, match_all={})'.format(
+            list(self.statements), list(self.values), self.predicate, self.match_all)
+
+
 class TrigEditParser:
-    def __init__(self):
+    def __init__(self, statement_cache_size: typing.Optional[int] = None):
+        """
+        :param statement_cache_size: if given, parsed statements are memoized by their raw text in a bounded cache
+                                     of this size (see `DEFAULT_STATEMENT_CACHE_SIZE`), and repeated statements share
+                                     one immutable `ParsedStatement`
+        """
         self.log = yatapi.logger.get_log(TrigEditParser.__name__)
+        self.statement_cache = LRUCache(statement_cache_size) if statement_cache_size else None
 
-    def _get_trigger_blocks(self, text):
-        """Gets each trigger block from the text, as separated by `TRIGGER_SEPARATOR`.
+    def _parse_tokens(self, matches, parse_statements=False):
+        """Assembles triggers from a stream of token matches, yielding each trigger as soon as it ends.
 
+        :param matches: matches of `TOKEN_RE`, e.g. from `TOKEN_RE.finditer`
+        :param parse_statements: whether to give each condition and action as a parsed statement
+                                 (see `parse_statement`) rather than its raw text
         :return:
-        :param text: text contained TrigEdit triggers separated by `TRIGGER_SEPARATOR`.
         """
-        return text.split(TRIGGER_SEPARATOR)
+        trigger = None
+        statements = None
+        match = None
+        position = None
+        for match in matches:
+            if match.start() != position and position is not None:
+                self._log_skipped(match.string, position, match.start())
+            position = match.end()
+            kind = match.lastgroup
+            if kind == TOKEN_STATEMENT:
+                if statements is None:
+                    self.log.error('Statement outside of Conditions or Actions: {}'.format(match.group('text')))
+                elif parse_statements:
+                    statements.append(self._parse_statement_match(match))
+                else:
+                    statements.append(match.group('text'))
+            elif kind == TOKEN_SECTION:
+                if trigger is not None:
+                    section = match.group('section').lower()
+                    statements = trigger['conditions'] if section == 'conditions' else trigger['actions']
+            elif kind == TOKEN_HEADER:
+                if trigger is not None:
+                    yield trigger
+                trigger = {'players': match.group('players'), 'conditions': [], 'actions': []}
+                statements = None
+            elif kind == TOKEN_SEPARATOR:
+                if trigger is not None:
+                    yield trigger
+                trigger = None
+                statements = None
+        if match is not None and position != match.endpos:
+            self._log_skipped(match.string, position, match.endpos)
+        if trigger is not None:
+            yield trigger
 
-    def parse_trigger(self, text):
+    def _log_skipped(self, text, start, end):
+        """Logs text the tokenizer could not match, e.g. a statement with an unquoted ";" in its arguments."""
+        skipped = text[start:end].strip()
+        if skipped:
+            self.log.error('Unable to parse this TrigEdit text, skipping it: {}'.format(skipped))
+
+    def parse_trigger(self, text, parse_statements=False):
         """Parses an SCMDraft TrigEdit text based trigger into players, conditions, and actions.
 
         :param text:
+        :param parse_statements: whether to give each condition and action as a parsed statement
+                                 (see `parse_statement`) rather than its raw text
         :return: a dictionary with players, conditions, and actions keys
         :rtype: dict
         """
-        pm = PLAYERS_RE.search(text)
-        if not pm:
+        triggers = list(self._parse_tokens(TOKEN_RE.finditer(text), parse_statements=parse_statements))
+        if not triggers:
             self.log.error('Unable to extract players from trigger: {}'.format(text))
-        players = pm.group('players')
-        conds_match = CONDITIONS_RE.search(text)
-        if not conds_match:
-            self.log.error('Unable to extract conditions from trigger: {}'.format(text))
-        raw_conditions = conds_match.group('conditions')
-        conditions = [x.strip() for x in raw_conditions.split(';')]
-        conditions = [x for x in conditions if x]
-        actions_match = ACTIONS_RE.search(text)
-        if not actions_match:
-            self.log.error('Unable to extract actions from trigger: {}'.format(text))
-        raw_actions = actions_match.group('actions')
-        actions = [x.strip() for x in raw_actions.split(';')]
-        actions = [x for x in actions if x]
-        # filter end brace to allow JSON in Comment actions
-        actions = [x for x in actions if x != '}']
-        return {'players': players, 'conditions': conditions, 'actions': actions}
-
-    def extract_triggers(self, text):
-        blocks = self._get_trigger_blocks(text)
-        for block in blocks:
-            block = block.strip()
-            if block:
-                yield self.parse_trigger(block)
+            return None
+        return triggers[0]
+
+    def extract_triggers(self, text, parse_statements=False, where=None):
+        """Lazily parses every trigger in TrigEdit text.
+
+        :param text: TrigEdit triggers separated by `TRIGGER_SEPARATOR`
+        :param parse_statements: whether to give each condition and action as a parsed statement
+                                 (see `parse_statement`) rather than its raw text
+        :param where: only give the triggers selected by a `TriggerFilter` (or a predicate on each parsed trigger);
+                      blocks of text that cannot match the filter's terms are skipped without being parsed
+        :return:
+        """
+        if where is None:
+            return self._parse_tokens(TOKEN_RE.finditer(text), parse_statements=parse_statements)
+        return self._extract_where(text, parse_statements, TriggerFilter.coerce(where))
+
+    def _extract_where(self, text, parse_statements, where):
+        candidate = where.prefilter()
+        separator = TRIGGER_SEPARATOR
+        start = 0
+        end = 0
+        while end >= 0:
+            end = text.find(separator, start)
+            block_end = len(text) if end < 0 else end
+            if candidate(text, start, block_end):
+                for trigger in self._parse_tokens(TOKEN_RE.finditer(text, start, block_end),
+                                                  parse_statements=parse_statements):
+                    if where.matches(trigger, self):
+                        yield trigger
+            start = end + len(separator)
+
+    def extract_triggers_from_file(self, infile, parse_statements=False, encoding=None, where=None):
+        """Lazily parses every trigger in a TrigEdit file, reading it one trigger at a time.
+
+        :param infile: path to the file, or a binary file object
+        :param parse_statements: whether to give each condition and action as a parsed statement
+                                 (see `parse_statement`) rather than its raw text
+        :param encoding: encoding of the file; defaults to the platform's preferred encoding, like `open`
+        :param where: only give the triggers selected by a `TriggerFilter` (or a predicate on each parsed trigger);
+                      see `extract_triggers`
+        :return:
+        """
+        for span in self.iter_spans_from_file(infile, parse_statements=parse_statements, encoding=encoding,
+                                              where=where):
+            yield span.trigger
 
-    def extract_triggers_from_file(self, infile):
-        with open(infile, 'r') as f:
-            text = f.read()
-        return self.extract_triggers(text)
+    def iter_spans_from_file(self, infile, parse_statements=False, encoding=None, start=0, end=None,
+                             read_size=DEFAULT_READ_SIZE, where=None) -> typing.Iterator[TriggerSpan]:
+        """Lazily parses every trigger in a TrigEdit file along with its byte range in the file.
+
+        Seeking to a span's `start` and reading `end - start` bytes gives back the trigger's exact text.  Like a file
+        opened in text mode, newlines in the parsed triggers are given as "\n" (see `decode_text`).
+
+        :param infile: path to the file, or a binary file object
+        :param parse_statements: whether to give each condition and action as a parsed statement
+                                 (see `parse_statement`) rather than its raw text
+        :param encoding: encoding of the file; defaults to the platform's preferred encoding, like `open`
+        :param start: byte offset to start reading from; should be the start of the file or just after a separator
+        :param end: byte offset to stop reading at; defaults to the end of the file
+        :param read_size: number of bytes read at a time
+        :param where: only give the triggers selected by a `TriggerFilter` (or a predicate on each parsed trigger);
+                      blocks that cannot match the filter's terms are skipped before being decoded
+        :return:
+        """
+        encoding = encoding or locale.getpreferredencoding(False)
+        if where is not None:
+            where = TriggerFilter.coerce(where)
+            candidate = where.prefilter(encoding)
+        for block_start, block_end, block in iter_trigger_blocks(infile, start=start, end=end, read_size=read_size):
+            if where is not None and not candidate(block, 0, len(block)):
+                continue
+            text = decode_text(block, encoding)
+            for trigger in self._parse_tokens(TOKEN_RE.finditer(text), parse_statements=parse_statements):
+                if where is None or where.matches(trigger, self):
+                    yield TriggerSpan(block_start, block_end, trigger)
 
     def parse_statement(self, text, statement_type=None):
         """Parses a statement (condition or action) into its name (e.g. "Kills") and arguments.
@@ -134,6 +542,35 @@ class TrigEditParser:
         :param statement_type: whether the statement is a trigger action or condition.
         :return:
         """
+        if self.statement_cache is None:
+            return self._parse_statement_text(text, statement_type)
+        key = (text, statement_type)
+        out = self.statement_cache.get(key)
+        if out is None:
+            out = ParsedStatement(self._parse_statement_text(text, statement_type, immutable=True))
+            self.statement_cache.put(key, out)
+        return out
+
+    def parse_statements(self, texts, statement_type=None):
+        """Parses many statements, parsing each distinct statement text only once.
+
+        Occurrences of the same text share one immutable `ParsedStatement`, whether or not the parser has
+        a statement cache.
+
+        :param texts: statement texts, e.g. the conditions or actions of many triggers
+        :param statement_type: whether the statements are trigger actions or conditions.
+        :return: the parsed statements, in the same order as `texts`
+        """
+        texts = list(texts)
+        parsed = {}
+        for text in dict.fromkeys(texts):
+            if self.statement_cache is None:
+                parsed[text] = ParsedStatement(self._parse_statement_text(text, statement_type, immutable=True))
+            else:
+                parsed[text] = self.parse_statement(text, statement_type)
+        return [parsed[text] for text in texts]
+
+    def _parse_statement_text(self, text, statement_type=None, immutable=False):
         match = STATEMENT_RE.search(text)
         if not match:
             self.log.error('Unable to parse this trigger statement: {}'.format(text))
@@ -141,11 +578,135 @@ class TrigEditParser:
         raw_args = match.group('args')
         args = parse_comma_separated_args(raw_args)
         args = [x.strip() for x in args]
-        out = {'name': name, 'args': args}
+        out = {'name': name, 'args': tuple(args) if immutable else args}
         if statement_type:
             out['type'] = statement_type
         return out
 
+    def _parse_statement_match(self, match):
+        """Parses a statement token, memoizing it by its text when the parser has a statement cache."""
+        if self.statement_cache is None:
+            return {'name': match.group('name'),
+                    'args': [x.strip() for x in parse_comma_separated_args(match.group('args'))]}
+        key = (match.group('text'), None)
+        out = self.statement_cache.get(key)
+        if out is None:
+            out = ParsedStatement(name=match.group('name'),
+                                  args=tuple(x.strip() for x in parse_comma_separated_args(match.group('args'))))
+            self.statement_cache.put(key, out)
+        return out
+
+
+def _next_separator_end(infile: typing.BinaryIO, offset: int, read_size: int = 1 << 16) -> typing.Optional[int]:
+    """Finds the byte offset just after the first `TRIGGER_SEPARATOR` at or after `offset`.
+
+    :param infile: binary file object
+    :param offset:
+    :param read_size:
+    :return: the offset, or None if there is no separator after `offset`
+    """
+    separator = TRIGGER_SEPARATOR.encode('ascii')
+    infile.seek(offset)
+    carry = b''
+    position = offset
+    while True:
+        chunk = infile.read(read_size)
+        if not chunk:
+            return None
+        data = carry + chunk
+        index = data.find(separator)
+        if index >= 0:
+            return position - len(carry) + index + len(separator)
+        carry = data[-(len(separator) - 1):]
+        position += len(chunk)
+
+
+def split_trigger_ranges(infile: str, parts: int, min_size: int = DEFAULT_READ_SIZE) -> typing.List[typing.Tuple[int, int]]:
+    """Splits a TrigEdit file into byte ranges that each hold whole triggers.
+
+    Each range after the first starts just after a `TRIGGER_SEPARATOR`, so the ranges can be parsed independently
+    (see `TrigEditParser.iter_spans_from_file`).
+
+    :param infile: path to the file
+    :param parts: number of ranges wanted; fewer are returned for small files
+    :param min_size: smallest range worth splitting off, in bytes
+    :return: (start, end) byte offsets of each range, in file order
+    """
+    size = os.path.getsize(infile)
+    parts = max(1, min(parts, size // max(1, min_size)))
+    bounds = [0]
+    with open(infile, 'rb') as f:
+        for i in range(1, parts):
+            bound = _next_separator_end(f, max(bounds[-1], size * i // parts))
+            if bound is None or bound >= size:
+                break
+            if bound > bounds[-1]:
+                bounds.append(bound)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _parse_file_range(infile: str, start: int, end: typing.Optional[int], parse_statements: bool,
+                      encoding: typing.Optional[str]) -> typing.List[TriggerSpan]:
+    """Parses a byte range of a TrigEdit file inside a worker process.
+
+    :return:
+    """
+    parser = TrigEditParser()
+    return list(parser.iter_spans_from_file(infile, parse_statements=parse_statements, encoding=encoding,
+                                            start=start, end=end))
+
+
+def extract_triggers_parallel(infile: str, workers: typing.Optional[int] = None, parse_statements: bool = False,
+                              encoding: typing.Optional[str] = None,
+                              min_size: int = DEFAULT_READ_SIZE) -> typing.Iterator[TriggerSpan]:
+    """Parses a single large TrigEdit file on several cores.
+
+    The file is split at trigger separators into byte ranges (about four per worker, for balance) that are
+    parsed in a process pool.  Triggers are yielded in file order, exactly as `TrigEditParser.iter_spans_from_file`
+    would give them.
+
+    :param infile: path to the file
+    :param workers: number of worker processes; defaults to the number of CPUs
+    :param parse_statements: whether to give each condition and action as a parsed statement
+                             (see `TrigEditParser.parse_statement`) rather than its raw text
+    :param encoding: encoding of the file; defaults to the platform's preferred encoding, like `open`
+    :param min_size: smallest byte range handed to a worker
+    :return:
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = split_trigger_ranges(infile, workers * 4, min_size=min_size)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_parse_file_range, itertools.repeat(infile), [x[0] for x in ranges],
+                               [x[1] for x in ranges], itertools.repeat(parse_statements),
+                               itertools.repeat(encoding))
+        for spans in results:
+            yield from spans
+
+
+def extract_corpus_parallel(paths: typing.Union[str, typing.Iterable[str]], workers: typing.Optional[int] = None,
+                            parse_statements: bool = False, encoding: typing.Optional[str] = None,
+                            pattern: str = '*.txt') -> typing.Iterator[typing.Tuple[str, typing.List[TriggerSpan]]]:
+    """Parses many TrigEdit files, spreading whole files across a process pool.
+
+    :param paths: a directory (its files matching `pattern` are parsed, in sorted order) or a list of file paths
+    :param workers: number of worker processes; defaults to the number of CPUs
+    :param parse_statements: whether to give each condition and action as a parsed statement
+                             (see `TrigEditParser.parse_statement`) rather than its raw text
+    :param encoding: encoding of the files; defaults to the platform's preferred encoding, like `open`
+    :param pattern: glob pattern of the files to parse when `paths` is a directory
+    :return: each path with its parsed triggers, in the same order as the paths
+    """
+    if isinstance(paths, str):
+        paths = sorted(glob.glob(os.path.join(paths, pattern)))
+    else:
+        paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_parse_file_range, paths, itertools.repeat(0), itertools.repeat(None),
+                               itertools.repeat(parse_statements), itertools.repeat(encoding))
+        yield from zip(paths, results)
+
 
 def parse_trigedit_trigs_into_text():
     with open('data/compiled-triggers/demon-lore-triggers-2019-02-7.txt', 'r') as f:
@@ -186,32 +747,292 @@ class Trigger:
     def add_action(self, action):
         self.actions.append(action)
 
-    def compile(self, newline: str = WIN_NEWLINE) -> str:
+    def intern_statements(self):
+        """Replaces each condition and action with its shared immutable instance.
+
+        Large maps repeat the same statements (e.g. `PreserveTrigger()`) across thousands of triggers;
+        after interning each distinct statement is stored once.
+
+        :return:
+        """
+        self.conditions = [yatapi.trigger_statements.intern_statement(x) for x in self.conditions]
+        self.actions = [yatapi.trigger_statements.intern_statement(x) for x in self.actions]
+
+    def structural_key(self) -> tuple:
+        """Gets a hashable key identifying the trigger by its players, conditions, and actions.
+
+        Two triggers with the same key compile to the same text.  The key is computed on every call, so a trigger
+        mutated in any way (e.g. replacing a statement or changing its arguments) never gets stale text from a
+        `CompileCache`; building it is still far cheaper than rendering.
+
+        :return:
+        """
+        return (tuple(self.players), tuple([x.structural_key() for x in self.conditions]),
+                tuple([x.structural_key() for x in self.actions]))
+
+    def compile(self, newline: str = WIN_NEWLINE, cache: typing.Optional['CompileCache'] = None) -> str:
         """Generates SCMDraft TrigEdit text based representation of the trigger.
 
         :param newline: whether to use Windows or *Nix newline endings;
                         default is Windows: '\r\n'
         :type newline: str
+        :param cache: optional cache to reuse the text of structurally identical triggers already compiled
         :return: SCMDraft TrigEdit text representation of the trigger
         :rtype: str
         """
-        raw_players = ','.join([str(x) for x in self.players])
-        trig = 'Trigger({}){{'.format(raw_players)
-        conds = '\n\t'.join([x.compile() for x in self.conditions])
-        trig += '\nConditions:\n\t{}\n'.format(conds)
-        actions = '\n\t'.join([x.compile() for x in self.actions])
-        trig += '\nActions:\n\t{}\n\n'.format(actions)
-        trig += '}\n\n'
-        trig += TRIGGER_SEPARATOR
-        # use Windows newline endings if applicable
-        trig = trig.replace('\n', newline)
-        return trig
+        if cache is not None:
+            return cache.compile(self, newline=newline)
+        return self._render(newline)
+
+    def _render(self, newline: str) -> str:
+        indent = newline + '\t'
+        raw_players = _with_newline(','.join([str(x) for x in self.players]), newline)
+        conds = indent.join([_with_newline(x.compile(), newline) for x in self.conditions])
+        actions = indent.join([_with_newline(x.compile(), newline) for x in self.actions])
+        return ''.join(['Trigger(', raw_players, '){', newline,
+                        'Conditions:', indent, conds, newline, newline,
+                        'Actions:', indent, actions, newline, newline,
+                        '}', newline, newline, TRIGGER_SEPARATOR])
 
     def __repr__(self):
         return self.compile()
 
 
-def compile_triggers(triggers: typing.List[Trigger], jsondata: typing.Optional[typing.Dict]=None, newline: str=WIN_NEWLINE):
+class _HashedKey:
+    __slots__ = ('key', 'hash')
+
+    def __init__(self, key: tuple):
+        """A nested key hashed once: tuples do not keep their hash, and each cache lookup hashes the key twice."""
+        self.key = key
+        self.hash = hash(key)
+
+    def __hash__(self):
+        return self.hash
+
+    def __eq__(self, other):
+        return self.hash == other.hash and self.key == other.key
+
+
+class CompileCache(LRUCache):
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        """Bounded LRU cache of compiled trigger text, keyed by each trigger's structural key.
+
+        Opt-in: pass the same cache to `compile_triggers` (or `Trigger.compile`) across a build so
+        triggers that are rebuilt identically are only rendered once.
+
+        :param maxsize: maximum number of compiled triggers kept; least recently used are evicted first
+        """
+        super().__init__(maxsize)
+
+    def compile(self, trigger: Trigger, newline: str = WIN_NEWLINE) -> str:
+        key = _HashedKey((trigger.structural_key(), newline))
+        text = self.get(key)
+        if text is None:
+            text = trigger._render(newline)
+            self.put(key, text)
+        return text
+
+
+def _with_newline(text: str, newline: str) -> str:
+    """Converts any *Nix newlines inside a compiled statement to the target newline style.
+
+    :param text:
+    :param newline:
+    :return:
+    """
+    if newline != NIX_NEWLINE and NIX_NEWLINE in text:
+        return text.replace(NIX_NEWLINE, newline)
+    return text
+
+
+def _safe_json(jsondata: typing.Dict) -> str:
+    # double quotes would end the comment's string
+    return json.dumps(jsondata).replace('"', '\'')
+
+
+def _json_comment(jsondata: typing.Optional[typing.Dict]) -> typing.Optional[str]:
+    if not jsondata:
+        return None
+    return JSON_COMMENT_PREFIX + _safe_json(jsondata)
+
+
+def _json_marker(jsondata: typing.Dict, count: int) -> yatapi.trigger_statements.Comment:
+    return yatapi.trigger_statements.Comment('{}{}={}'.format(JSON_MARKER_PREFIX, count, _safe_json(jsondata)))
+
+
+def sidecar_record(count: int, jsondata: typing.Optional[typing.Dict]) -> str:
+    """Gets the sidecar line describing a run of triggers written with `METADATA_SIDECAR`.
+
+    A sidecar file holds one line per `write_triggers` (or `compile_triggers`) call, in the order the runs of triggers
+    appear in the TrigEdit file, e.g. '{"count": 120, "metadata": {"system": "Hero Revival"}}'.
+
+    :param count: number of triggers in the run
+    :param jsondata: metadata of the run's triggers
+    :return:
+    """
+    return json.dumps({'count': count, 'metadata': jsondata or None}) + NIX_NEWLINE
+
+
+def _add_json_comment(triggers: typing.Iterable[Trigger], comment: typing.Optional[str]) -> typing.Iterator[Trigger]:
+    for trigger in triggers:
+        if comment:
+            # a comment of its own, so the trigger it is added to can still be changed
+            trigger.add_action(yatapi.trigger_statements.Comment(comment))
+        yield trigger
+
+
+def _add_json_marker(triggers: typing.Iterable[Trigger], jsondata: typing.Dict) -> typing.Iterator[Trigger]:
+    """Yields the triggers, with a copy of the last one carrying a marker for all of them."""
+    last = None
+    count = 0
+    for trigger in triggers:
+        if last is not None:
+            yield last
+        last = trigger
+        count += 1
+    if last is not None:
+        if len(last.actions) >= MAX_ACTIONS:
+            raise ValueError('The last trigger already has {} actions, leaving no room for the {!r} metadata marker; '
+                             'use the {!r} metadata mode instead'.format(len(last.actions), METADATA_MARKER,
+                                                                         METADATA_SIDECAR))
+        yield Trigger(last.players, last.conditions, last.actions + [_json_marker(jsondata, count)])
+
+
+def _add_sidecar_record(triggers: typing.Iterable[Trigger], jsondata: typing.Optional[typing.Dict],
+                        sidecar: typing.IO) -> typing.Iterator[Trigger]:
+    """Yields the triggers as is, then writes their sidecar line once all were given."""
+    count = 0
+    for trigger in triggers:
+        count += 1
+        yield trigger
+    sidecar.write(sidecar_record(count, jsondata))
+
+
+def _add_metadata(triggers: typing.Iterable[Trigger], jsondata: typing.Optional[typing.Dict], metadata: str,
+                  sidecar: typing.Optional[typing.IO]) -> typing.Iterable[Trigger]:
+    if metadata not in METADATA_MODES:
+        raise ValueError('Unknown metadata mode {!r}; expected one of {}'.format(metadata, METADATA_MODES))
+    if metadata == METADATA_SIDECAR:
+        if sidecar is None:
+            raise ValueError('A sidecar file is required with the {!r} metadata mode'.format(METADATA_SIDECAR))
+        return _add_sidecar_record(triggers, jsondata, sidecar)
+    if not jsondata:
+        return triggers
+    if metadata == METADATA_MARKER:
+        return _add_json_marker(triggers, jsondata)
+    return _add_json_comment(triggers, _json_comment(jsondata))
+
+
+def _chunked(iterable: typing.Iterable, size: int) -> typing.Iterator[typing.List]:
+    iterator = iter(iterable)
+    chunk = list(itertools.islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(itertools.islice(iterator, size))
+
+
+def _compile_chunk(triggers: typing.List[Trigger], newline: str) -> str:
+    """Compiles a chunk of triggers inside a worker process.
+
+    :param triggers:
+    :param newline:
+    :return: the chunk's triggers compiled and joined exactly as `compile_triggers` would
+    """
+    return (newline * 2).join([x.compile(newline=newline) for x in triggers])
+
+
+def _iter_compiled_chunks(triggers: typing.Iterable[Trigger], newline: str, workers: int,
+                          chunksize: int) -> typing.Iterator[str]:
+    """Compiles chunks of triggers in a process pool, yielding each chunk's text in the original order.
+
+    At most two chunks per worker are in flight, so a generator of triggers is never fully materialized.
+
+    :param triggers:
+    :param newline:
+    :param workers: number of worker processes
+    :param chunksize: number of triggers sent to a worker at a time
+    :return:
+    """
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque()
+        for chunk in _chunked(triggers, chunksize):
+            pending.append(executor.submit(_compile_chunk, chunk, newline))
+            if len(pending) > workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_compiled_triggers(triggers: typing.Iterable[Trigger], jsondata: typing.Optional[typing.Dict]=None,
+                           newline: str=WIN_NEWLINE, workers: typing.Optional[int]=None,
+                           chunksize: int=DEFAULT_CHUNKSIZE, cache: typing.Optional[CompileCache]=None,
+                           metadata: str=METADATA_COMMENT,
+                           sidecar: typing.Optional[typing.IO]=None) -> typing.Iterator[str]:
+    """Lazily compiles triggers, yielding the TrigEdit text in chunks.
+
+    Only one trigger (or one chunk of triggers per worker) is compiled at a time, so memory stays flat regardless
+    of how many triggers (or how large a generator of triggers) is given.
+    Joining the chunks gives the same text as `compile_triggers`.
+
+    :param triggers: iterable of Triggers ready to be compiled to TrigEdit format
+    :param jsondata: arbitrary JSON data to be placed in a comment added to each trigger
+    :param newline: which newline to use; default will use Windows newlines
+    :param workers: number of processes to compile with; default compiles in this process
+    :param chunksize: number of triggers compiled per worker task when `workers` is set
+    :param cache: optional cache reused across calls so identical triggers are rendered once;
+                  only consulted when compiling in this process
+    :param metadata: how `jsondata` is recorded: `METADATA_COMMENT`, `METADATA_MARKER` or `METADATA_SIDECAR`
+    :param sidecar: text file the sidecar line is written to once every trigger was compiled,
+                    with `METADATA_SIDECAR`
+    :return: TrigEdit text of each trigger (or chunk of triggers), prefixed by the separating newlines
+             after the first one
+    """
+    separator = newline * 2
+    triggers = _add_metadata(triggers, jsondata, metadata, sidecar)
+    if workers and workers > 1:
+        texts = _iter_compiled_chunks(triggers, newline, workers, chunksize)
+    else:
+        texts = (x.compile(newline=newline, cache=cache) for x in triggers)
+    for i, text in enumerate(texts):
+        yield separator + text if i else text
+
+
+def write_triggers(triggers: typing.Iterable[Trigger], outfile: typing.IO, jsondata: typing.Optional[typing.Dict]=None,
+                   newline: str=WIN_NEWLINE, encoding: str='utf-8', workers: typing.Optional[int]=None,
+                   chunksize: int=DEFAULT_CHUNKSIZE, cache: typing.Optional[CompileCache]=None,
+                   metadata: str=METADATA_COMMENT, sidecar: typing.Optional[typing.IO]=None) -> int:
+    """Streams compiled triggers into a text or binary file-like object.
+
+    Text files should be opened with `newline=''` so the chosen newline style is written as is.
+
+    :param triggers: iterable of Triggers ready to be compiled to TrigEdit format
+    :param outfile: file-like object with a `write` method, opened in text or binary mode
+    :param jsondata: arbitrary JSON data to be placed in a comment added to each trigger
+    :param newline: which newline to use; default will use Windows newlines
+    :param encoding: encoding used when `outfile` is binary
+    :param workers: number of processes to compile with; default compiles in this process
+    :param chunksize: number of triggers compiled per worker task when `workers` is set
+    :param cache: optional cache reused across calls so identical triggers are rendered once
+    :param metadata: how `jsondata` is recorded; see `compile_triggers`
+    :param sidecar: text file the sidecar line is written to, with `METADATA_SIDECAR`
+    :return: number of characters (or bytes for a binary file) written
+    """
+    binary = isinstance(outfile, (io.RawIOBase, io.BufferedIOBase)) or 'b' in getattr(outfile, 'mode', '')
+    written = 0
+    for chunk in iter_compiled_triggers(triggers, jsondata=jsondata, newline=newline,
+                                        workers=workers, chunksize=chunksize, cache=cache,
+                                        metadata=metadata, sidecar=sidecar):
+        if binary:
+            chunk = chunk.encode(encoding)
+        outfile.write(chunk)
+        written += len(chunk)
+    return written
+
+
+def compile_triggers(triggers: typing.List[Trigger], jsondata: typing.Optional[typing.Dict]=None, newline: str=WIN_NEWLINE,
+                     workers: typing.Optional[int]=None, chunksize: int=DEFAULT_CHUNKSIZE,
+                     cache: typing.Optional[CompileCache]=None, metadata: str=METADATA_COMMENT,
+                     sidecar: typing.Optional[typing.IO]=None):
     """Compiles a set of triggers ready for copy into SCMDraft.
 
     :param triggers: list of Triggers ready to be compiled to TrigEdit format
@@ -219,15 +1040,25 @@ def compile_triggers(triggers: typing.List[Trigger], jsondata: typing.Optional[t
                      added to each trigger.  Very useful to keep track of trigger systems in
                      larger maps.
     :param newline: which newline to use; default will use Windows newlines
+    :param workers: number of processes to compile with; output is identical to compiling in this process.
+                    Worth it only for thousands of triggers.
+    :param chunksize: number of triggers compiled per worker task when `workers` is set
+    :param cache: optional `CompileCache` shared across calls so triggers rebuilt identically are rendered once
+    :param metadata: how `jsondata` is recorded:
+
+                     * `METADATA_COMMENT` (default): a JSON `Comment` action appended to every trigger; each trigger
+                       gives up an action slot and the comment is added to the given triggers themselves
+                     * `METADATA_MARKER`: a single comment, in a copy of the last trigger, marking all of them
+                     * `METADATA_SIDECAR`: no comments; a line of JSON is written to `sidecar` instead
+
+                     Neither marker nor sidecar mode changes the triggers given.  See `trigger_metadata` to read
+                     the metadata back in any mode.
+    :param sidecar: text file the sidecar line is written to, with `METADATA_SIDECAR`
     :return: TrigEdit triggers ready to be copied into SCMDraft
     """
-    # add in json comment if needed
-    if jsondata:
-        safe_json = json.dumps(jsondata).replace('"', '\'')
-        comment = yatapi.trigger_statements.Comment(JSON_COMMENT_PREFIX + safe_json)
-        for trigger in triggers:
-            trigger.add_action(comment)
-    return (newline * 2).join([x.compile(newline=newline) for x in triggers])
+    return ''.join(iter_compiled_triggers(triggers, jsondata=jsondata, newline=newline,
+                                          workers=workers, chunksize=chunksize, cache=cache,
+                                          metadata=metadata, sidecar=sidecar))
 
 
 if __name__ == '__main__':
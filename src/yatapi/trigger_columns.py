@@ -0,0 +1,294 @@
+"""Compact columnar storage of parsed TrigEdit triggers, for holding and querying large corpora in memory.
+
+Strings (statement names, arguments, player lists) are interned into integer ids, and each distinct statement
+is stored once.  Triggers are then just runs of statement ids in flat `array` columns.
+
+NumPy is optional; when it is installed the columns are viewed as NumPy arrays (without copying) to vectorize
+queries.
+
+"""
+
+import array
+import bisect
+import collections
+import typing
+
+import yatapi.scvalue
+import yatapi.trigger
+import yatapi.trigger_loader
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _as_numpy(column: array.array):
+    """Views an unsigned integer column as a NumPy array, without copying.
+
+    :param column:
+    :return:
+    """
+    dtype = numpy.dtype('u{}'.format(column.itemsize))
+    return numpy.frombuffer(column, dtype=dtype) if len(column) else numpy.zeros(0, dtype=dtype)
+
+
+# values of `TriggerColumns.statement_kinds`
+CONDITION = 0
+ACTION = 1
+
+
+class TriggerColumns:
+    def __init__(self):
+        """An empty columnar trigger store; add triggers with `append` or build one with `from_text`/`from_file`.
+
+        Columns (all `array.array`):
+
+        * strings: `strings[i]` is the text of string id `i`
+        * distinct statements: `statement_names` (string id), `statement_kinds` (`CONDITION` or `ACTION`),
+          and their arguments `args[arg_offsets[i]:arg_offsets[i + 1]]` (string ids)
+        * triggers: `players` (string id of the header's players), and their conditions then actions
+          `occurrences[trigger_offsets[i]:trigger_offsets[i + 1]]` (statement ids)
+        """
+        self.strings = []
+        self._string_ids = {}
+        self.statement_names = array.array('I')
+        self.statement_kinds = array.array('B')
+        self.arg_offsets = array.array('I', [0])
+        self.args = array.array('I')
+        self._statement_ids = {}
+        self.players = array.array('I')
+        self.occurrences = array.array('I')
+        self.trigger_offsets = array.array('I', [0])
+        self.parser = yatapi.trigger.TrigEditParser()
+        self._loader = None
+
+    @classmethod
+    def from_triggers(cls, triggers: typing.Iterable[typing.Dict]) -> 'TriggerColumns':
+        """Builds a store from triggers parsed by `TrigEditParser` (without `parse_statements`).
+
+        :param triggers:
+        :return:
+        """
+        columns = cls()
+        for trigger in triggers:
+            columns.append(trigger)
+        return columns
+
+    @classmethod
+    def from_text(cls, text: str) -> 'TriggerColumns':
+        columns = cls()
+        for trigger in columns.parser.extract_triggers(text):
+            columns.append(trigger)
+        return columns
+
+    @classmethod
+    def from_file(cls, infile: typing.Union[str, typing.BinaryIO],
+                  encoding: typing.Optional[str] = None) -> 'TriggerColumns':
+        """Builds a store from a TrigEdit file, streaming it one trigger at a time.
+
+        :param infile: path to the file, or a file opened in binary mode
+        :param encoding: encoding of the file; defaults to the platform's preferred encoding, like `open`
+        :return:
+        """
+        columns = cls()
+        for trigger in columns.parser.extract_triggers_from_file(infile, encoding=encoding):
+            columns.append(trigger)
+        return columns
+
+    def intern(self, text: str) -> int:
+        """Gets the id of a string, adding it if new.
+
+        :param text:
+        :return:
+        """
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings.append(text)
+            self._string_ids[text] = string_id
+        return string_id
+
+    def _statement_id(self, text: str, kind: int) -> int:
+        key = (text, kind)
+        statement_id = self._statement_ids.get(key)
+        if statement_id is None:
+            parsed = self.parser.parse_statement(text)
+            statement_id = len(self.statement_names)
+            self.statement_names.append(self.intern(parsed['name']))
+            self.statement_kinds.append(kind)
+            self.args.extend([self.intern(x) for x in parsed['args']])
+            self.arg_offsets.append(len(self.args))
+            self._statement_ids[key] = statement_id
+        return statement_id
+
+    def append(self, trigger: typing.Dict):
+        """Adds a trigger parsed by `TrigEditParser` (without `parse_statements`).
+
+        :param trigger: a dictionary with players, conditions, and actions keys
+        :return:
+        """
+        self.players.append(self.intern(trigger['players']))
+        self.occurrences.extend([self._statement_id(x, CONDITION) for x in trigger['conditions']])
+        self.occurrences.extend([self._statement_id(x, ACTION) for x in trigger['actions']])
+        self.trigger_offsets.append(len(self.occurrences))
+
+    def __len__(self):
+        return len(self.players)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the columns, excluding the interned strings themselves.
+
+        :return:
+        """
+        columns = (self.statement_names, self.statement_kinds, self.arg_offsets, self.args, self.players,
+                   self.occurrences, self.trigger_offsets)
+        return sum(x.itemsize * len(x) for x in columns)
+
+    def string_id(self, value: typing.Union[str, yatapi.scvalue.SCValue]) -> typing.Optional[int]:
+        """Gets the id of a string or SC value as it appears in TrigEdit text, if it occurs at all.
+
+        Quotes may be left out of quoted values, e.g. 'Terran Marine' finds '"Terran Marine"'.
+
+        :param value:
+        :return:
+        """
+        if isinstance(value, yatapi.scvalue.SCValue):
+            value = value.value
+        string_id = self._string_ids.get(value)
+        if string_id is None and value[:1] != '"':
+            string_id = self._string_ids.get('"{}"'.format(value))
+        return string_id
+
+    def _statement_arg_mask(self, string_id: int) -> typing.List[bool]:
+        """Marks each distinct statement with the string among its arguments."""
+        if numpy is not None:
+            args = _as_numpy(self.args)
+            offsets = _as_numpy(self.arg_offsets).astype(numpy.intp)
+            hits = numpy.zeros(len(args) + 1, dtype=numpy.intp)
+            hits[1:] = numpy.cumsum(args == string_id)
+            return (hits[offsets[1:]] - hits[offsets[:-1]]) > 0
+        found = set(bisect.bisect_right(self.arg_offsets, i) - 1 for i, x in enumerate(self.args) if x == string_id)
+        return [i in found for i in range(len(self.statement_names))]
+
+    def _occurrence_triggers(self, statement_mask) -> typing.List[int]:
+        """Gets the triggers with an occurrence of any statement selected by the mask, in order."""
+        if numpy is not None:
+            occurrences = _as_numpy(self.occurrences)
+            selected = numpy.flatnonzero(numpy.asarray(statement_mask, dtype=bool)[occurrences])
+            offsets = _as_numpy(self.trigger_offsets)
+            return numpy.unique(numpy.searchsorted(offsets, selected, side='right') - 1).tolist()
+        triggers = []
+        for i in range(len(self)):
+            start, end = self.trigger_offsets[i], self.trigger_offsets[i + 1]
+            if any(statement_mask[x] for x in self.occurrences[start:end]):
+                triggers.append(i)
+        return triggers
+
+    def statement_counts(self) -> typing.Dict[str, int]:
+        """Counts the occurrences of each statement type across all triggers, e.g. {'Preserve Trigger': 20000, ...}.
+
+        :return:
+        """
+        if numpy is not None and self.occurrences:
+            names = _as_numpy(self.statement_names)
+            occurrences = _as_numpy(self.occurrences)
+            counts = numpy.bincount(names[occurrences])
+            return {self.strings[i]: int(counts[i]) for i in numpy.flatnonzero(counts)}
+        per_statement = collections.Counter(self.occurrences)
+        counts = collections.Counter()
+        for statement_id, count in per_statement.items():
+            counts[self.strings[self.statement_names[statement_id]]] += count
+        return dict(counts)
+
+    def triggers_using(self, value: typing.Union[str, yatapi.scvalue.SCValue],
+                       statement: typing.Optional[str] = None) -> typing.List[int]:
+        """Finds the triggers with a statement taking a value as an argument, e.g. `triggers_using(scunit.TERRAN_MARINE)`.
+
+        :param value: an SC value, or an argument as written in TrigEdit
+        :param statement: only count statements with this TrigEdit name, e.g. "Set Deaths"
+        :return: the index of each matching trigger, in order
+        """
+        string_id = self.string_id(value)
+        if string_id is None:
+            return []
+        mask = self._statement_arg_mask(string_id)
+        if statement is not None:
+            mask = self._and_name(mask, statement)
+        return self._occurrence_triggers(mask)
+
+    def triggers_with_statement(self, statement: str) -> typing.List[int]:
+        """Finds the triggers with a statement of a type, e.g. "Set Deaths".
+
+        :param statement: TrigEdit name of the statement
+        :return: the index of each matching trigger, in order
+        """
+        return self._occurrence_triggers(self._and_name(None, statement))
+
+    def _and_name(self, mask, statement: str):
+        name_id = self._string_ids.get(statement)
+        if numpy is not None:
+            names = _as_numpy(self.statement_names)
+            named = names == name_id if name_id is not None else numpy.zeros(len(names), dtype=bool)
+            return named if mask is None else named & mask
+        named = [x == name_id for x in self.statement_names]
+        return named if mask is None else [x and y for x, y in zip(named, mask)]
+
+    def statement_text(self, statement_id: int) -> str:
+        """Gets the TrigEdit text of a distinct statement, without its trailing ";".
+
+        :param statement_id:
+        :return:
+        """
+        args = self.args[self.arg_offsets[statement_id]:self.arg_offsets[statement_id + 1]]
+        return '{}({})'.format(self.strings[self.statement_names[statement_id]],
+                               ', '.join([self.strings[x] for x in args]))
+
+    def get(self, index: int) -> typing.Dict:
+        """Gets a trigger as `TrigEditParser` gives it, with players, conditions, and actions keys.
+
+        Statements are rebuilt from their name and arguments, so spacing may differ from the original text.
+
+        :param index:
+        :return:
+        """
+        statements = self.occurrences[self.trigger_offsets[index]:self.trigger_offsets[index + 1]]
+        return {'players': self.strings[self.players[index]],
+                'conditions': [self.statement_text(x) for x in statements if self.statement_kinds[x] == CONDITION],
+                'actions': [self.statement_text(x) for x in statements if self.statement_kinds[x] == ACTION]}
+
+    def materialize(self, index: int) -> yatapi.trigger.Trigger:
+        """Builds the `Trigger` object of a stored trigger, on demand.
+
+        :param index:
+        :return:
+        """
+        if self._loader is None:
+            self._loader = yatapi.trigger_loader.TriggerLoader()
+        loader = self._loader
+        conditions = []
+        actions = []
+        for statement_id in self.occurrences[self.trigger_offsets[index]:self.trigger_offsets[index + 1]]:
+            name = self.strings[self.statement_names[statement_id]]
+            args = [self.strings[x] for x in
+                    self.args[self.arg_offsets[statement_id]:self.arg_offsets[statement_id + 1]]]
+            if self.statement_kinds[statement_id] == CONDITION:
+                conditions.append(loader.build_statement(name, args, condition=True))
+            else:
+                actions.append(loader.build_statement(name, args, condition=False))
+        return yatapi.trigger.Trigger(loader.load_players(self.strings[self.players[index]]), conditions, actions)
+
+    def iter_materialized(self, indexes: typing.Optional[typing.Iterable[int]] = None) -> typing.Iterator[
+            yatapi.trigger.Trigger]:
+        """Lazily builds `Trigger` objects, e.g. for the result of a query.
+
+        :param indexes: which triggers to build; defaults to all of them in order
+        :return:
+        """
+        for index in (range(len(self)) if indexes is None else indexes):
+            yield self.materialize(index)
+
+    def __repr__(self):
+        return 'TriggerColumns(triggers={}, statements={}, distinct_statements={}, strings={}, nbytes={})'.format(
+            len(self), len(self.occurrences), len(self.statement_names), len(self.strings), self.nbytes)
@@ -0,0 +1,277 @@
+"""Exports TrigEdit triggers of many maps into a SQLite database and queries them.
+
+Tables (statements are stored once however many triggers use them):
+
+* maps(id, name)
+* triggers(id, map_id, position, players)
+* statements(id, kind, name, text)
+* arguments(statement_id, position, field, value): `field` is the statement's argument name, e.g. "unit"
+* trigger_statements(trigger_id, position, statement_id): conditions then actions of each trigger
+
+"""
+
+import collections
+import sqlite3
+import typing
+
+import yatapi.scvalue
+import yatapi.trigger
+import yatapi.trigger_loader
+
+# number of triggers buffered before their rows are written with `executemany`
+DEFAULT_BATCH_SIZE = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS maps (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS triggers (id INTEGER PRIMARY KEY, map_id INTEGER NOT NULL REFERENCES maps (id),
+                                     position INTEGER NOT NULL, players TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS statements (id INTEGER PRIMARY KEY, kind TEXT NOT NULL, name TEXT NOT NULL,
+                                       text TEXT NOT NULL, UNIQUE (kind, text));
+CREATE TABLE IF NOT EXISTS arguments (statement_id INTEGER NOT NULL REFERENCES statements (id),
+                                      position INTEGER NOT NULL, field TEXT, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS trigger_statements (trigger_id INTEGER NOT NULL REFERENCES triggers (id),
+                                               position INTEGER NOT NULL,
+                                               statement_id INTEGER NOT NULL REFERENCES statements (id));
+"""
+
+# created after each export, so a first bulk load does not maintain them row by row
+INDEXES = """
+CREATE INDEX IF NOT EXISTS triggers_map ON triggers (map_id, position);
+CREATE INDEX IF NOT EXISTS statements_name ON statements (name);
+CREATE INDEX IF NOT EXISTS arguments_field_value ON arguments (field, value, statement_id);
+CREATE INDEX IF NOT EXISTS arguments_statement ON arguments (statement_id);
+CREATE INDEX IF NOT EXISTS trigger_statements_trigger ON trigger_statements (trigger_id, position);
+CREATE INDEX IF NOT EXISTS trigger_statements_statement ON trigger_statements (statement_id);
+"""
+
+TriggerRow = collections.namedtuple('TriggerRow', ['id', 'map', 'position', 'players'])
+
+
+def _sql_value(value: typing.Union[str, int, yatapi.scvalue.SCValue]) -> typing.List[str]:
+    """Gets the values an argument may be stored as: SC values by their TrigEdit string, and strings
+    with or without quotes.
+    """
+    if isinstance(value, yatapi.scvalue.SCValue):
+        return [value.value]
+    value = str(value)
+    if value[:1] == '"':
+        return [value]
+    return [value, '"{}"'.format(value)]
+
+
+class TriggerDatabase:
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE):
+        """Opens (creating if needed) a SQLite database of triggers.
+
+        :param path: database file, or ":memory:"
+        :param batch_size: number of triggers buffered before being written
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+        self.parser = yatapi.trigger.TrigEditParser(statement_cache_size=yatapi.trigger.DEFAULT_STATEMENT_CACHE_SIZE)
+        self._statement_ids = {(kind, text): statement_id for statement_id, kind, text in
+                               self.connection.execute('SELECT id, kind, text FROM statements')}
+        self._next_statement_id = self._max_id('statements') + 1
+        self._next_trigger_id = self._max_id('triggers') + 1
+        self._fields = {}
+
+    def _max_id(self, table: str) -> int:
+        return self.connection.execute('SELECT COALESCE(MAX(id), 0) FROM {}'.format(table)).fetchone()[0]
+
+    def _map_id(self, name: str) -> int:
+        """Gets the id of a map, replacing any triggers exported for it before.
+
+        :param name:
+        :return:
+        """
+        row = self.connection.execute('SELECT id FROM maps WHERE name = ?', (name,)).fetchone()
+        if row is None:
+            return self.connection.execute('INSERT INTO maps (name) VALUES (?)', (name,)).lastrowid
+        map_id = row[0]
+        self.connection.execute('DELETE FROM trigger_statements WHERE trigger_id IN '
+                                '(SELECT id FROM triggers WHERE map_id = ?)', (map_id,))
+        self.connection.execute('DELETE FROM triggers WHERE map_id = ?', (map_id,))
+        return map_id
+
+    def _statement_id(self, kind: str, text: str, statements: list, arguments: list) -> int:
+        key = (kind, text)
+        statement_id = self._statement_ids.get(key)
+        if statement_id is None:
+            statement_id = self._next_statement_id
+            self._next_statement_id += 1
+            self._statement_ids[key] = statement_id
+            parsed = self.parser.parse_statement(text)
+            name = parsed['name']
+            fields_key = (name, kind)
+            if fields_key not in self._fields:
+                self._fields[fields_key] = yatapi.trigger_loader.statement_fields(
+                    name, kind == yatapi.trigger.TRIGGER_CONDITION)
+            fields = self._fields[fields_key]
+            if fields is None or len(fields) != len(parsed['args']):
+                fields = [None] * len(parsed['args'])
+            statements.append((statement_id, kind, name, text))
+            arguments.extend((statement_id, i, field, value)
+                             for i, (field, value) in enumerate(zip(fields, parsed['args'])))
+        return statement_id
+
+    def _flush(self, triggers: list, statements: list, arguments: list, trigger_statements: list):
+        self.connection.executemany('INSERT INTO statements (id, kind, name, text) VALUES (?, ?, ?, ?)', statements)
+        self.connection.executemany('INSERT INTO arguments (statement_id, position, field, value) '
+                                    'VALUES (?, ?, ?, ?)', arguments)
+        self.connection.executemany('INSERT INTO triggers (id, map_id, position, players) VALUES (?, ?, ?, ?)',
+                                    triggers)
+        self.connection.executemany('INSERT INTO trigger_statements (trigger_id, position, statement_id) '
+                                    'VALUES (?, ?, ?)', trigger_statements)
+        for rows in (triggers, statements, arguments, trigger_statements):
+            rows.clear()
+
+    def export_parsed(self, map_name: str, triggers: typing.Iterable[typing.Dict]) -> int:
+        """Writes the triggers of a map, as parsed by `TrigEditParser` (without `parse_statements`).
+
+        Triggers are consumed lazily and written in batches, so a streamed file is never held in memory whole.
+        Exporting a map again replaces its triggers.
+
+        :param map_name: name identifying the map, e.g. its file name
+        :param triggers:
+        :return: number of triggers written
+        """
+        trigger_rows, statements, arguments, trigger_statements = [], [], [], []
+        count = 0
+        try:
+            map_id = self._map_id(map_name)
+            for position, trigger in enumerate(triggers):
+                trigger_id = self._next_trigger_id
+                self._next_trigger_id += 1
+                trigger_rows.append((trigger_id, map_id, position, trigger['players']))
+                i = 0
+                for kind, texts in ((yatapi.trigger.TRIGGER_CONDITION, trigger['conditions']),
+                                    (yatapi.trigger.TRIGGER_ACTION, trigger['actions'])):
+                    for text in texts:
+                        trigger_statements.append(
+                            (trigger_id, i, self._statement_id(kind, text, statements, arguments)))
+                        i += 1
+                count += 1
+                if len(trigger_rows) >= self.batch_size:
+                    self._flush(trigger_rows, statements, arguments, trigger_statements)
+            self._flush(trigger_rows, statements, arguments, trigger_statements)
+            self.connection.executescript(INDEXES)
+            self.connection.commit()
+        except BaseException:
+            self.connection.rollback()
+            # ids handed out for rows that were never written
+            self._statement_ids = {(kind, text): statement_id for statement_id, kind, text in
+                                   self.connection.execute('SELECT id, kind, text FROM statements')}
+            self._next_statement_id = self._max_id('statements') + 1
+            self._next_trigger_id = self._max_id('triggers') + 1
+            raise
+        return count
+
+    def export_text(self, map_name: str, text: str) -> int:
+        return self.export_parsed(map_name, self.parser.extract_triggers(text))
+
+    def export_file(self, infile: str, map_name: typing.Optional[str] = None,
+                    encoding: typing.Optional[str] = None) -> int:
+        """Streams the triggers of a TrigEdit file into the database.
+
+        :param infile: path to the file
+        :param map_name: name identifying the map; defaults to the path
+        :param encoding: encoding of the file; defaults to the platform's preferred encoding, like `open`
+        :return: number of triggers written
+        """
+        return self.export_parsed(map_name or infile, self.parser.extract_triggers_from_file(infile, encoding=encoding))
+
+    def export_triggers(self, map_name: str, triggers: typing.Iterable[yatapi.trigger.Trigger]) -> int:
+        """Writes generated `Trigger` objects, exactly as they compile to TrigEdit text.
+
+        :param map_name:
+        :param triggers:
+        :return: number of triggers written
+        """
+        def as_parsed(trigger):
+            return {'players': ','.join([str(x) for x in trigger.players]),
+                    'conditions': [x.compile()[:-1] for x in trigger.conditions],
+                    'actions': [x.compile()[:-1] for x in trigger.actions]}
+        return self.export_parsed(map_name, (as_parsed(x) for x in triggers))
+
+    def maps(self) -> typing.List[str]:
+        return [x[0] for x in self.connection.execute('SELECT name FROM maps ORDER BY id')]
+
+    def find_triggers(self, statement: typing.Optional[str] = None, map_name: typing.Optional[str] = None,
+                      **arguments) -> typing.List[TriggerRow]:
+        """Finds triggers with a statement matching every criterion, using the indexes.
+
+        E.g. the triggers that SetDeaths of a unit for Player 3:
+        `find_triggers('Set Deaths', unit=scunit.TERRAN_MARINE, player=scplayer.PLAYER_3)`
+
+        :param statement: TrigEdit name of the statement, e.g. "Set Deaths"
+        :param map_name: only search this map
+        :param arguments: argument name and value pairs the same statement must have, e.g. unit=..., location=...;
+                          values are SC values, ints, or strings (quotes may be left out)
+        :return: matching triggers ordered by map and position
+        """
+        clauses = []
+        params = []
+        if statement is not None:
+            clauses.append('s.name = ?')
+            params.append(statement)
+        for field, value in arguments.items():
+            values = _sql_value(value)
+            clauses.append('s.id IN (SELECT statement_id FROM arguments WHERE field = ? AND value IN ({}))'.format(
+                ', '.join(['?'] * len(values))))
+            params.append(field)
+            params.extend(values)
+        if map_name is not None:
+            clauses.append('m.name = ?')
+            params.append(map_name)
+        query = ('SELECT DISTINCT t.id, m.name, t.position, t.players FROM statements s '
+                 'JOIN trigger_statements ts ON ts.statement_id = s.id '
+                 'JOIN triggers t ON t.id = ts.trigger_id JOIN maps m ON m.id = t.map_id')
+        if clauses:
+            query += ' WHERE ' + ' AND '.join(clauses)
+        query += ' ORDER BY t.map_id, t.position'
+        return [TriggerRow(*x) for x in self.connection.execute(query, params)]
+
+    def statement_counts(self, map_name: typing.Optional[str] = None) -> typing.Dict[str, int]:
+        """Counts the occurrences of each statement type, e.g. {'Preserve Trigger': 20000, ...}.
+
+        :param map_name: only count this map
+        :return:
+        """
+        query = ('SELECT s.name, COUNT(*) FROM trigger_statements ts JOIN statements s ON s.id = ts.statement_id')
+        params = []
+        if map_name is not None:
+            query += ' JOIN triggers t ON t.id = ts.trigger_id JOIN maps m ON m.id = t.map_id WHERE m.name = ?'
+            params.append(map_name)
+        query += ' GROUP BY s.name ORDER BY COUNT(*) DESC'
+        return dict(self.connection.execute(query, params))
+
+    def get_trigger(self, trigger_id: int) -> typing.Dict:
+        """Gets a stored trigger as `TrigEditParser` gives it, with players, conditions, and actions keys.
+
+        :param trigger_id:
+        :return:
+        """
+        row = self.connection.execute('SELECT players FROM triggers WHERE id = ?', (trigger_id,)).fetchone()
+        if row is None:
+            raise KeyError(trigger_id)
+        trigger = {'players': row[0], 'conditions': [], 'actions': []}
+        rows = self.connection.execute('SELECT s.kind, s.text FROM trigger_statements ts '
+                                       'JOIN statements s ON s.id = ts.statement_id '
+                                       'WHERE ts.trigger_id = ? ORDER BY ts.position', (trigger_id,))
+        for kind, text in rows:
+            trigger['conditions' if kind == yatapi.trigger.TRIGGER_CONDITION else 'actions'].append(text)
+        return trigger
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self):
+        return 'TriggerDatabase({!r}, maps={})'.format(self.path, len(self.maps()))
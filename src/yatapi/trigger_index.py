@@ -0,0 +1,263 @@
+"""In-memory inverted index of the argument values used by triggers, e.g. to find every trigger referencing a
+location or switch instantly.
+
+"""
+
+import collections
+import typing
+
+import yatapi.scvalue
+import yatapi.trigger
+import yatapi.trigger_loader
+
+# field name under which the players of a trigger's header are indexed
+PLAYERS_FIELD = 'players'
+
+# an occurrence of a value: the trigger and the position of the statement among its conditions then actions,
+# or None for the trigger's header (players)
+Posting = collections.namedtuple('Posting', ['trigger_id', 'statement'])
+# a query term restricted to one argument, e.g. IndexTerm('location', 'Anywhere') or IndexTerm('switch', 'Switch 1')
+IndexTerm = collections.namedtuple('IndexTerm', ['field', 'value'])
+
+
+def _value_key(value) -> str:
+    """Gets the TrigEdit text of a value, which is how values are indexed."""
+    if isinstance(value, yatapi.scvalue.SCValue):
+        return value.value
+    return value if type(value) is str else str(value)
+
+
+class TriggerIndex:
+    def __init__(self):
+        """Inverted index mapping each argument value (SC value, location, switch name, number, ...) to the triggers
+        and statements using it.
+
+        Triggers are either parsed by `TrigEditParser` (without `parse_statements`) or `Trigger` objects.
+        Values are indexed by their TrigEdit text; when the statement is known to yatapi, they are also indexed by
+        argument name so that e.g. a location and a switch with the same name can be told apart.
+
+        Each posting list maps a trigger id to the positions of its statements using the value, so adding and
+        removing a trigger only touches the posting lists of its own values.
+        """
+        self.triggers = {}
+        # posting lists: value key (str, or (field, str)) to {trigger id: tuple of statement positions}
+        self._postings = {}
+        # keys of each trigger, to remove it without scanning the index
+        self._trigger_keys = {}
+        self._next_id = 0
+        self.parser = yatapi.trigger.TrigEditParser(
+            statement_cache_size=yatapi.trigger.DEFAULT_STATEMENT_CACHE_SIZE)
+        # keys of each statement text (parsed triggers) or structural key (`Trigger` objects)
+        self._statement_keys = yatapi.trigger.LRUCache(yatapi.trigger.DEFAULT_STATEMENT_CACHE_SIZE)
+        self._player_keys = {}
+
+    @classmethod
+    def from_triggers(cls, triggers: typing.Iterable[typing.Union[typing.Dict, yatapi.trigger.Trigger]]
+                      ) -> 'TriggerIndex':
+        index = cls()
+        for trigger in triggers:
+            index.add(trigger)
+        return index
+
+    def _parsed_statement_keys(self, text: str, condition: bool) -> tuple:
+        cache_key = (text, condition)
+        keys = self._statement_keys.get(cache_key)
+        if keys is None:
+            parsed = self.parser.parse_statement(text)
+            fields = yatapi.trigger_loader.statement_fields(parsed['name'], condition)
+            keys = self._argument_keys(parsed['args'], fields)
+            self._statement_keys.put(cache_key, keys)
+        return keys
+
+    def _typed_statement_keys(self, statement) -> tuple:
+        cache_key = statement.structural_key()
+        keys = self._statement_keys.get(cache_key)
+        if keys is None:
+            plan = statement._get_compile_plan()
+            keys = self._argument_keys([_value_key(x) for x in plan.values(statement)], plan.fields)
+            self._statement_keys.put(cache_key, keys)
+        return keys
+
+    @staticmethod
+    def _argument_keys(args: typing.Sequence[str], fields: typing.Optional[typing.Sequence[str]]) -> tuple:
+        """Gets the distinct keys of a statement's arguments: each value, and each (field, value) if fields are known."""
+        keys = dict.fromkeys(args)
+        if fields is not None and len(fields) == len(args):
+            keys.update(dict.fromkeys(zip(fields, args)))
+        return tuple(keys)
+
+    def _players_keys(self, players: typing.Union[str, typing.Sequence]) -> tuple:
+        if isinstance(players, str):
+            keys = self._player_keys.get(players)
+            if keys is None:
+                args = [x.strip() for x in yatapi.trigger.parse_comma_separated_args(players) if x.strip()]
+                keys = self._argument_keys(args, [PLAYERS_FIELD] * len(args))
+                self._player_keys[players] = keys
+            return keys
+        args = [_value_key(x) for x in players]
+        return self._argument_keys(args, [PLAYERS_FIELD] * len(args))
+
+    def _trigger_postings(self, trigger: typing.Union[typing.Dict, yatapi.trigger.Trigger]) -> typing.Dict:
+        """Groups the statement positions of a trigger by key."""
+        positions = {}
+        if isinstance(trigger, yatapi.trigger.Trigger):
+            players = trigger.players
+            statement_keys = [self._typed_statement_keys(x) for x in trigger.conditions]
+            statement_keys.extend([self._typed_statement_keys(x) for x in trigger.actions])
+        else:
+            players = trigger['players']
+            statement_keys = [self._parsed_statement_keys(x, True) for x in trigger['conditions']]
+            statement_keys.extend([self._parsed_statement_keys(x, False) for x in trigger['actions']])
+        for key in self._players_keys(players):
+            positions[key] = [None]
+        for i, keys in enumerate(statement_keys):
+            for key in keys:
+                found = positions.get(key)
+                if found is None:
+                    positions[key] = [i]
+                else:
+                    found.append(i)
+        return positions
+
+    def add(self, trigger: typing.Union[typing.Dict, yatapi.trigger.Trigger]) -> int:
+        """Indexes a trigger.
+
+        :param trigger: a trigger parsed by `TrigEditParser` (without `parse_statements`), or a `Trigger`
+        :return: the id of the trigger in the index; ids increase with each trigger added
+        """
+        trigger_id = self._next_id
+        self._next_id += 1
+        self.triggers[trigger_id] = trigger
+        positions = self._trigger_postings(trigger)
+        postings = self._postings
+        for key, statements in positions.items():
+            posting = postings.get(key)
+            if posting is None:
+                postings[key] = {trigger_id: tuple(statements)}
+            else:
+                posting[trigger_id] = tuple(statements)
+        self._trigger_keys[trigger_id] = tuple(positions)
+        return trigger_id
+
+    def add_all(self, triggers: typing.Iterable[typing.Union[typing.Dict, yatapi.trigger.Trigger]]) -> typing.List[int]:
+        return [self.add(x) for x in triggers]
+
+    def remove(self, trigger_id: int) -> typing.Union[typing.Dict, yatapi.trigger.Trigger]:
+        """Removes a trigger from the index.
+
+        :param trigger_id: id given by `add`
+        :return: the trigger removed
+        """
+        if trigger_id not in self.triggers:
+            raise KeyError('No trigger with id {} in the index'.format(trigger_id))
+        postings = self._postings
+        for key in self._trigger_keys.pop(trigger_id):
+            posting = postings[key]
+            del posting[trigger_id]
+            if not posting:
+                del postings[key]
+        return self.triggers.pop(trigger_id)
+
+    def replace(self, trigger_id: int, trigger: typing.Union[typing.Dict, yatapi.trigger.Trigger]) -> int:
+        """Re-indexes an edited trigger, e.g. for a `TriggerChange` of `trigger_session.TrigEditSession`.
+
+        :param trigger_id: id of the old version of the trigger
+        :param trigger: the new version
+        :return: the new id of the trigger
+        """
+        self.remove(trigger_id)
+        return self.add(trigger)
+
+    def _key(self, term) -> typing.Union[str, tuple]:
+        """Gets the key of a query term, e.g. scunit.TERRAN_MARINE, 'Anywhere', or IndexTerm('switch', 'Switch 1').
+
+        Quotes may be left out of quoted values, e.g. 'Anywhere' finds '"Anywhere"'.
+        """
+        if isinstance(term, tuple):
+            field, value = term
+            key = (field, _value_key(value))
+            if key not in self._postings and key[1][:1] != '"':
+                quoted = (field, '"{}"'.format(key[1]))
+                if quoted in self._postings:
+                    return quoted
+            return key
+        key = _value_key(term)
+        if key not in self._postings and key[:1] != '"':
+            quoted = '"{}"'.format(key)
+            if quoted in self._postings:
+                return quoted
+        return key
+
+    def postings(self, term) -> typing.List[Posting]:
+        """Gets every occurrence of a value, in order of trigger id then statement position.
+
+        :param term: an SC value, an argument as written in TrigEdit, or an `IndexTerm` restricted to one argument
+        :return:
+        """
+        posting = self._postings.get(self._key(term), {})
+        return [Posting(trigger_id, x) for trigger_id, statements in posting.items() for x in statements]
+
+    def find(self, term) -> typing.List[int]:
+        """Finds the triggers using a value, e.g. `find(IndexTerm('location', 'Anywhere'))`.
+
+        :param term: an SC value, an argument as written in TrigEdit, or an `IndexTerm` restricted to one argument
+        :return: ids of the triggers, in increasing order
+        """
+        return list(self._postings.get(self._key(term), ()))
+
+    def find_all(self, *terms) -> typing.List[int]:
+        """Finds the triggers using every value, e.g. `find_all(scunit.TERRAN_MARINE, IndexTerm('switch', 'Switch 1'))`.
+
+        :param terms: see `find`
+        :return: ids of the triggers, in increasing order
+        """
+        if not terms:
+            return []
+        postings = [self._postings.get(self._key(x)) for x in terms]
+        if any(x is None for x in postings):
+            return []
+        postings.sort(key=len)
+        found = postings[0].keys()
+        for posting in postings[1:]:
+            found = found & posting.keys()
+            if not found:
+                return []
+        return sorted(found)
+
+    def find_any(self, *terms) -> typing.List[int]:
+        """Finds the triggers using at least one of the values.
+
+        :param terms: see `find`
+        :return: ids of the triggers, in increasing order
+        """
+        found = set()
+        for term in terms:
+            found.update(self._postings.get(self._key(term), ()))
+        return sorted(found)
+
+    def count(self, term) -> int:
+        """Counts the triggers using a value.
+
+        :param term: see `find`
+        :return:
+        """
+        return len(self._postings.get(self._key(term), ()))
+
+    def values(self, field: typing.Optional[str] = None) -> typing.List[str]:
+        """Lists the indexed values, e.g. every switch name with `values('switch')`.
+
+        :param field: only list the values of this argument
+        :return:
+        """
+        if field is None:
+            return [x for x in self._postings if type(x) is str]
+        return [x[1] for x in self._postings if type(x) is tuple and x[0] == field]
+
+    def __contains__(self, term) -> bool:
+        return self._key(term) in self._postings
+
+    def __len__(self):
+        return len(self.triggers)
+
+    def __repr__(self):
+        return 'TriggerIndex(triggers={}, keys={})'.format(len(self), len(self._postings))
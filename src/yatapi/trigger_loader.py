@@ -0,0 +1,275 @@
+"""Loads SCMDraft TrigEdit text back into `Trigger` objects made of typed conditions and actions.
+
+"""
+
+import inspect
+import typing
+
+import yatapi.scaction
+import yatapi.scalliance
+import yatapi.scoperation
+import yatapi.scorder
+import yatapi.scplayer
+import yatapi.scquantifier
+import yatapi.scresource
+import yatapi.scscript
+import yatapi.scstate
+import yatapi.scunit
+import yatapi.scvalue
+import yatapi.scvisibility
+import yatapi.trigger
+import yatapi.trigger_statements
+
+
+class TriggerLoadError(ValueError):
+    pass
+
+
+def _statement_subclasses(base):
+    subclasses = []
+    for subclass in base.__subclasses__():
+        # frozen twins share the name and layout of the class they were made from
+        if not subclass.is_frozen:
+            subclasses.append(subclass)
+            subclasses.extend(_statement_subclasses(subclass))
+    return subclasses
+
+
+def _build_registry(base) -> typing.Dict[str, type]:
+    """Maps the TrigEdit name of every statement class deriving from `base` to the class, e.g. "Set Deaths" to SetDeaths.
+
+    :param base: `Condition` or `Action`
+    :return:
+    """
+    return {x._trigedit_name: x for x in _statement_subclasses(base)}
+
+
+CONDITIONS = _build_registry(yatapi.trigger_statements.Condition)
+ACTIONS = _build_registry(yatapi.trigger_statements.Action)
+# constants of each SC value type keyed by TrigEdit string, e.g. '"Terran Marine"' to `scunit.TERRAN_MARINE`;
+# see `scvalue.SCRegistry`
+SC_CONSTANTS = {x: registry.by_value for x, registry in yatapi.scvalue.REGISTRIES.items()}
+
+
+def statement_fields(name: str, condition: bool) -> typing.Optional[typing.Tuple[str, ...]]:
+    """Gets the argument names of a statement in TrigEdit order, e.g. ('player', 'unit', 'quantifier', 'count').
+
+    :param name: TrigEdit name of the statement, e.g. "Deaths"
+    :param condition: whether the statement is a condition rather than an action
+    :return: None for statements yatapi does not know
+    """
+    statement_class = (CONDITIONS if condition else ACTIONS).get(name)
+    if statement_class is None:
+        return None
+    return statement_class._get_compile_plan().fields
+
+
+def _int_converter(value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        raise TriggerLoadError('Expected an integer argument, got {}'.format(value)) from None
+
+
+def _from_newline(value: str) -> str:
+    """Converts the Windows newlines `Trigger.compile` writes inside strings back to *Nix ones, the inverse of
+    `trigger._with_newline`, so a multi-line text message compiles back to the same text."""
+    if yatapi.trigger.WIN_NEWLINE in value:
+        return value.replace(yatapi.trigger.WIN_NEWLINE, yatapi.trigger.NIX_NEWLINE)
+    return value
+
+
+def _str_converter(value: str) -> str:
+    return _from_newline(value)
+
+
+def _unquote_converter(value: str) -> str:
+    """Removes the quotes `Statement.compile` adds back to a quoted field, so a loaded statement equals
+    one written by hand, e.g. CreateUnit(..., 'spawn') rather than CreateUnit(..., '"spawn"').
+    Values that would not compile back to the same text are kept as is.
+    """
+    value = _from_newline(value)
+    if len(value) >= 2 and value[0] == '"' and value[-1] == '"':
+        inner = value[1:-1]
+        if yatapi.trigger_statements.QUOTED_RE.match(inner) is None:
+            return inner
+    return value
+
+
+def _sc_value_converter(sc_class):
+    constants = SC_CONSTANTS[sc_class]
+
+    def convert(value: str):
+        constant = constants.get(value)
+        return constant if constant is not None else sc_class(value)
+    return convert
+
+
+def _converter(annotation, quoted: bool):
+    if annotation is int:
+        return _int_converter
+    if annotation in SC_CONSTANTS:
+        return _sc_value_converter(annotation)
+    return _unquote_converter if quoted else _str_converter
+
+
+class StatementLoader:
+    def __init__(self, statement_class):
+        """Precomputed conversion of TrigEdit arguments into the `__init__` arguments of a statement class.
+
+        :param statement_class:
+        """
+        self.statement_class = statement_class
+        plan = statement_class._get_compile_plan()
+        params = inspect.signature(statement_class.__init__).parameters
+        # TrigEdit gives arguments in the order of `plan.fields`; `__init__` takes them in `plan.init_args` order
+        self.converters = tuple(_converter(params[x].annotation, x in statement_class._quoted_fields)
+                                for x in plan.fields)
+        positions = {field: i for i, field in enumerate(plan.fields)}
+        self.order = None if plan.fields == plan.init_args else tuple(positions[x] for x in plan.init_args)
+
+    def convert(self, args: typing.Sequence[str]) -> tuple:
+        """Converts the raw TrigEdit arguments of a statement into its `__init__` arguments.
+
+        :param args: stripped arguments as parsed by `TrigEditParser.parse_statement`
+        :return:
+        """
+        if len(args) != len(self.converters):
+            raise TriggerLoadError('{} takes {} arguments, got {}: {}'.format(
+                self.statement_class._trigedit_name, len(self.converters), len(args), list(args)))
+        values = [convert(x) for convert, x in zip(self.converters, args)]
+        if self.order is not None:
+            values = [values[i] for i in self.order]
+        return tuple(values)
+
+
+class TriggerLoader:
+    def __init__(self, intern_statements: bool = False,
+                 cache_size: int = yatapi.trigger.DEFAULT_STATEMENT_CACHE_SIZE):
+        """Builds `Trigger` objects from TrigEdit text, the inverse of `Trigger.compile`.
+
+        Statement texts are parsed and converted once and then memoized, so the thousands of repeated
+        statements of a large map only cost a lookup and a constructor call.
+
+        :param intern_statements: whether every occurrence of the same statement text is loaded as one shared
+                                  immutable statement (see `trigger_statements.intern_statement`) instead of
+                                  a new mutable instance
+        :param cache_size: number of distinct statement texts whose conversion is memoized
+        """
+        self.intern_statements = intern_statements
+        self.parser = yatapi.trigger.TrigEditParser()
+        self.cache = yatapi.trigger.LRUCache(cache_size)
+        self._loaders = {}
+        self._players = {}
+
+    def _get_loader(self, name: str, registry: typing.Dict[str, type]) -> StatementLoader:
+        loader = self._loaders.get((name, id(registry)))
+        if loader is None:
+            statement_class = registry.get(name)
+            if statement_class is None:
+                kind = 'condition' if registry is CONDITIONS else 'action'
+                raise TriggerLoadError('Unknown TrigEdit {}: {}'.format(kind, name))
+            loader = StatementLoader(statement_class)
+            self._loaders[(name, id(registry))] = loader
+        return loader
+
+    def _load_statement(self, text: str, registry: typing.Dict[str, type]) -> yatapi.trigger_statements.Statement:
+        key = (text, registry is CONDITIONS)
+        cached = self.cache.get(key)
+        if cached is None:
+            parsed = self.parser.parse_statement(text)
+            loader = self._get_loader(parsed['name'], registry)
+            args = loader.convert(parsed['args'])
+            if self.intern_statements:
+                cached = yatapi.trigger_statements.intern_statement(loader.statement_class(*args))
+            else:
+                cached = (loader.statement_class, args)
+            self.cache.put(key, cached)
+        if self.intern_statements:
+            return cached
+        return cached[0](*cached[1])
+
+    def build_statement(self, name: str, args: typing.Sequence[str],
+                        condition: bool) -> yatapi.trigger_statements.Statement:
+        """Builds a statement from its TrigEdit name and raw arguments, e.g. as stored by `trigger_columns`.
+
+        :param name: e.g. "Deaths"
+        :param args: stripped arguments as parsed by `TrigEditParser.parse_statement`
+        :param condition: whether the statement is a condition rather than an action
+        :return:
+        """
+        loader = self._get_loader(name, CONDITIONS if condition else ACTIONS)
+        statement = loader.statement_class(*loader.convert(args))
+        if self.intern_statements:
+            return yatapi.trigger_statements.intern_statement(statement)
+        return statement
+
+    def load_condition(self, text: str) -> yatapi.trigger_statements.Condition:
+        """Loads a condition from its TrigEdit text, e.g. 'Deaths("Current Player", "Terran Marine", At least, 1)'.
+
+        :param text: text of the condition, with or without its trailing ";"
+        :return:
+        """
+        return self._load_statement(text.strip().rstrip(';'), CONDITIONS)
+
+    def load_action(self, text: str) -> yatapi.trigger_statements.Action:
+        """Loads an action from its TrigEdit text, e.g. 'Preserve Trigger()'.
+
+        :param text: text of the action, with or without its trailing ";"
+        :return:
+        """
+        return self._load_statement(text.strip().rstrip(';'), ACTIONS)
+
+    def load_players(self, raw_players: str) -> typing.List[yatapi.scplayer.SCPlayer]:
+        """Loads the players of a trigger header, e.g. '"Player 1","Player 2"'.
+
+        :param raw_players: the text between the parentheses of "Trigger(...)"
+        :return:
+        """
+        players = self._players.get(raw_players)
+        if players is None:
+            convert = _sc_value_converter(yatapi.scplayer.SCPlayer)
+            players = tuple(convert(x.strip()) for x in yatapi.trigger.parse_comma_separated_args(raw_players)
+                            if x.strip())
+            self._players[raw_players] = players
+        return list(players)
+
+    def load_trigger(self, parsed: typing.Dict) -> yatapi.trigger.Trigger:
+        """Builds a trigger from one parsed by `TrigEditParser` (without `parse_statements`).
+
+        :param parsed: a dictionary with players, conditions, and actions keys
+        :return:
+        """
+        return yatapi.trigger.Trigger(self.load_players(parsed['players']),
+                                      [self._load_statement(x, CONDITIONS) for x in parsed['conditions']],
+                                      [self._load_statement(x, ACTIONS) for x in parsed['actions']])
+
+    def load_triggers(self, text: str) -> typing.Iterator[yatapi.trigger.Trigger]:
+        """Lazily loads every trigger in TrigEdit text.
+
+        :param text: TrigEdit triggers separated by `TRIGGER_SEPARATOR`
+        :return:
+        """
+        for parsed in self.parser.extract_triggers(text):
+            yield self.load_trigger(parsed)
+
+    def load_triggers_from_file(self, infile: typing.Union[str, typing.BinaryIO],
+                                encoding: typing.Optional[str] = None) -> typing.Iterator[yatapi.trigger.Trigger]:
+        """Lazily loads every trigger in a TrigEdit file, reading it one trigger at a time.
+
+        :param infile: path to the file, or a file opened in binary mode
+        :param encoding: encoding of the file; defaults to the platform's preferred encoding, like `open`
+        :return:
+        """
+        for span in self.parser.iter_spans_from_file(infile, encoding=encoding):
+            yield self.load_trigger(span.trigger)
+
+
+def load_triggers(text: str, intern_statements: bool = False) -> typing.List[yatapi.trigger.Trigger]:
+    """Loads every trigger in TrigEdit text, e.g. as written by `trigger.compile_triggers`.
+
+    :param text:
+    :param intern_statements: whether repeated statements are loaded as one shared immutable instance
+    :return:
+    """
+    return list(TriggerLoader(intern_statements=intern_statements).load_triggers(text))
@@ -0,0 +1,375 @@
+"""Reads back the JSON metadata that `trigger.compile_triggers(jsondata=...)` stamps into each trigger, without
+parsing conditions or actions, to find and replace whole trigger systems inside large TrigEdit files.
+
+"""
+
+import collections
+import io
+import itertools
+import json
+import os
+import re
+import shutil
+import tempfile
+import typing
+
+import yatapi.trigger
+
+# metadata key naming the system a trigger belongs to, e.g. jsondata={'system': 'Hero Revival'}
+SYSTEM_KEY = 'system'
+# the JSON comment or marker of a trigger in raw bytes, e.g. Comment("JSON={'system': 'Hero Revival'}") or
+# Comment("JSON*120={'system': 'Hero Revival'}")
+JSON_COMMENT_BYTES_RE = re.compile(
+    rb'Comment\s*\(\s*"(?:' + re.escape(yatapi.trigger.JSON_COMMENT_PREFIX.encode('ascii')) + rb'|' +
+    re.escape(yatapi.trigger.JSON_MARKER_PREFIX.encode('ascii')) + rb'(?P<count>\d+)=)' +
+    rb'(?P<json>[^"\\]*(?:\\.[^"\\]*)*)"\s*\)')
+
+# a trigger block of a file: its position among the blocks, its byte range (excluding the separator after it),
+# its decoded metadata (None if it has no JSON comment), and how many triggers up to this one the metadata is of
+# (more than one for a marker written by `trigger.METADATA_MARKER`)
+TriggerMetadata = collections.namedtuple('TriggerMetadata', ['ordinal', 'start', 'end', 'metadata', 'count'])
+# consecutive triggers of one system: the ordinal of the first trigger and how many, the byte range from the start
+# of the first trigger to the end of the last one, and where the next trigger (or the end of the file) starts
+SystemRun = collections.namedtuple('SystemRun', ['first', 'count', 'start', 'end', 'until'])
+
+
+def parse_json_comment(raw: str) -> typing.Union[typing.Dict, str]:
+    """Decodes the JSON of a comment as written by `compile_triggers`, which swaps double quotes for single ones.
+
+    :param raw: the text after `JSON_COMMENT_PREFIX`, e.g. "{'system': 'Hero Revival'}"
+    :return: the decoded data, or the raw text if it is not valid JSON (e.g. a value contained a single quote)
+    """
+    try:
+        return json.loads(raw.replace('\'', '"'))
+    except ValueError:
+        return raw
+
+
+def scan_metadata(infile: typing.Union[str, typing.BinaryIO], encoding: str = 'utf-8',
+                  read_size: int = yatapi.trigger.DEFAULT_READ_SIZE) -> typing.Iterator[TriggerMetadata]:
+    """Lazily gets the byte range and metadata of each trigger in a TrigEdit file.
+
+    Only the JSON comment of each block is looked at, so this is much faster than parsing the triggers.
+
+    :param infile: path to the file, or a binary file object
+    :param encoding: encoding of the file
+    :param read_size: number of bytes read at a time
+    :return:
+    """
+    search = JSON_COMMENT_BYTES_RE.search
+    for ordinal, (start, end, block) in enumerate(yatapi.trigger.iter_trigger_blocks(infile, read_size=read_size)):
+        match = search(block)
+        if match is None:
+            yield TriggerMetadata(ordinal, start, end, None, 1)
+        else:
+            count = match.group('count')
+            yield TriggerMetadata(ordinal, start, end, parse_json_comment(match.group('json').decode(encoding)),
+                                  1 if count is None else int(count))
+
+
+def read_sidecar(sidecar: typing.Union[str, typing.TextIO]) -> typing.List:
+    """Reads the metadata of each trigger from a sidecar file written with `trigger.METADATA_SIDECAR`.
+
+    :param sidecar: path to the sidecar file, or the file opened in text mode
+    :return: the metadata of each trigger in order (None for triggers without any)
+    """
+    if not hasattr(sidecar, 'read'):
+        with open(sidecar, encoding='utf-8') as f:
+            return read_sidecar(f)
+    metadata = []
+    for line in sidecar:
+        if line.strip():
+            record = json.loads(line)
+            metadata.extend([record['metadata']] * record['count'])
+    return metadata
+
+
+def _resolve_metadata(triggers: typing.Sequence[TriggerMetadata]) -> typing.List:
+    """Gets the metadata of each trigger, spreading each marker back over the triggers it marks."""
+    metadata = [None] * len(triggers)
+    for trigger in triggers:
+        if trigger.metadata is not None:
+            for i in range(max(0, trigger.ordinal - trigger.count + 1), trigger.ordinal + 1):
+                metadata[i] = trigger.metadata
+    return metadata
+
+
+def _system_of(metadata, key: str):
+    if isinstance(metadata, dict):
+        system = metadata.get(key)
+        # only hashable values can name a system
+        return system if isinstance(system, (str, int, float, bool)) else None
+    return None
+
+
+class MetadataIndex:
+    def __init__(self, triggers: typing.Sequence[TriggerMetadata], size: int, key: str = SYSTEM_KEY,
+                 metadata: typing.Optional[typing.Sequence] = None):
+        """Index of where each trigger system lives in a TrigEdit file.
+
+        :param triggers: every trigger of the file in order, as given by `scan_metadata`
+        :param size: size of the file in bytes
+        :param key: metadata key naming the system of a trigger
+        :param metadata: metadata of each trigger, e.g. from `read_sidecar`; defaults to that of the JSON comments
+                         and markers of `triggers`
+        """
+        self.triggers = list(triggers)
+        self.size = size
+        self.key = key
+        self.metadata = _resolve_metadata(self.triggers) if metadata is None else list(metadata)
+        if len(self.metadata) != len(self.triggers):
+            raise ValueError('Metadata of {} triggers given for a file of {} triggers'.format(
+                len(self.metadata), len(self.triggers)))
+        # runs of consecutive triggers of each system, in file order
+        self.systems = collections.OrderedDict()
+        run_system = None
+        run_first = None
+        for i, trigger_metadata in enumerate(self.metadata):
+            system = _system_of(trigger_metadata, key)
+            if run_first is not None and system != run_system:
+                self._add_run(run_system, run_first, i)
+                run_first = None
+            if system is not None and run_first is None:
+                run_system, run_first = system, i
+        if run_first is not None:
+            self._add_run(run_system, run_first, len(self.triggers))
+
+    def _add_run(self, system, first: int, stop: int):
+        until = self.triggers[stop].start if stop < len(self.triggers) else self.size
+        run = SystemRun(first, stop - first, self.triggers[first].start, self.triggers[stop - 1].end, until)
+        self.systems.setdefault(system, []).append(run)
+
+    @classmethod
+    def from_file(cls, infile: str, key: str = SYSTEM_KEY, encoding: str = 'utf-8') -> 'MetadataIndex':
+        """Scans a TrigEdit file, e.g. one written by `trigger.write_triggers` with jsondata={'system': ...}.
+
+        :param infile: path to the file
+        :param key: metadata key naming the system of a trigger
+        :param encoding: encoding of the file
+        :return:
+        """
+        with open(infile, 'rb') as f:
+            triggers = list(scan_metadata(f, encoding=encoding))
+            size = f.seek(0, os.SEEK_END)
+        return cls(triggers, size, key=key)
+
+    @classmethod
+    def from_sidecar(cls, infile: str, sidecar: typing.Union[str, typing.TextIO],
+                     key: str = SYSTEM_KEY) -> 'MetadataIndex':
+        """Indexes a TrigEdit file written with `trigger.METADATA_SIDECAR`, taking the metadata from its sidecar.
+
+        :param infile: path to the TrigEdit file
+        :param sidecar: path to the sidecar file, or the file opened in text mode
+        :param key: metadata key naming the system of a trigger
+        :return:
+        """
+        with open(infile, 'rb') as f:
+            triggers = [TriggerMetadata(i, start, end, None, 1)
+                        for i, (start, end, _) in enumerate(yatapi.trigger.iter_trigger_blocks(f))]
+            size = f.seek(0, os.SEEK_END)
+        return cls(triggers, size, key=key, metadata=read_sidecar(sidecar))
+
+    def names(self) -> typing.List:
+        """Lists the systems of the file, in order of first appearance.
+
+        :return:
+        """
+        return list(self.systems)
+
+    def runs(self, system) -> typing.List[SystemRun]:
+        """Gets the runs of consecutive triggers of a system.
+
+        :param system: e.g. "Hero Revival"
+        :return:
+        """
+        try:
+            return self.systems[system]
+        except KeyError:
+            raise KeyError('No triggers of system {!r} in the file'.format(system)) from None
+
+    def triggers_of(self, system) -> typing.List[int]:
+        """Gets the ordinals of the triggers of a system.
+
+        :param system:
+        :return:
+        """
+        return [i for run in self.runs(system) for i in range(run.first, run.first + run.count)]
+
+    def read_system(self, infile: typing.Union[str, typing.BinaryIO], system) -> typing.List[bytes]:
+        """Reads the text of a system's triggers, one run at a time, without reading the rest of the file.
+
+        :param infile: path to the indexed file, or the file opened in binary mode
+        :param system:
+        :return: the bytes of each run of consecutive triggers
+        """
+        if not hasattr(infile, 'read'):
+            with open(infile, 'rb') as f:
+                return self.read_system(f, system)
+        texts = []
+        for run in self.runs(system):
+            infile.seek(run.start)
+            texts.append(infile.read(run.end - run.start))
+        return texts
+
+    def _edits(self, replacements: typing.Dict, encoding: str) -> typing.List[typing.Tuple[int, int, bytes]]:
+        """Gets the byte ranges to replace: a system's first run becomes its new text and any other runs are dropped."""
+        separator = yatapi.trigger.TRIGGER_SEPARATOR.encode('ascii')
+        edits = []
+        removed = []
+        for system, text in replacements.items():
+            if isinstance(text, str):
+                text = text.encode(encoding)
+            text = text.strip()
+            # the file keeps the separator after the run being replaced
+            if text.endswith(separator):
+                text = text[:-len(separator)].rstrip()
+            runs = self.runs(system)
+            if text:
+                edits.append((runs[0].start, runs[0].end, text))
+                runs = runs[1:]
+            removed.extend(runs)
+        for run in _join_runs(removed):
+            if run.first:
+                # from the end of the trigger before, so the separator after the run is kept in its place
+                edits.append((self.triggers[run.first - 1].end, run.end, b''))
+            else:
+                edits.append((run.start, run.until, b''))
+        edits.sort()
+        return edits
+
+    def splice(self, infile: typing.BinaryIO, outfile: typing.BinaryIO, replacements: typing.Dict,
+               encoding: str = 'utf-8') -> int:
+        """Copies the indexed file, replacing the triggers of systems with regenerated ones.
+
+        Each system's new triggers take the place of its first run of triggers; any later runs are removed.
+        Everything else is copied byte for byte.
+
+        :param infile: the indexed file, opened in binary mode
+        :param outfile: file to write to, opened in binary mode
+        :param replacements: new TrigEdit text (str or bytes, e.g. from `compile_triggers`) of each system;
+                             empty text removes the system
+        :param encoding: encoding of str replacements
+        :return: number of bytes written
+        """
+        written = 0
+        position = 0
+        for start, stop, text in self._edits(replacements, encoding):
+            infile.seek(position)
+            written += _copy(infile, outfile, start - position)
+            outfile.write(text)
+            written += len(text)
+            position = stop
+        infile.seek(position)
+        written += _copy(infile, outfile, None)
+        return written
+
+
+def _join_runs(runs: typing.Iterable[SystemRun]) -> typing.List[SystemRun]:
+    """Joins runs of consecutive triggers (e.g. of two systems removed one after the other) into single runs,
+    so the byte ranges removed never overlap."""
+    joined = []
+    for run in sorted(runs):
+        if joined and joined[-1].first + joined[-1].count == run.first:
+            last = joined[-1]
+            joined[-1] = SystemRun(last.first, last.count + run.count, last.start, run.end, run.until)
+        else:
+            joined.append(run)
+    return joined
+
+
+def _copy(infile: typing.BinaryIO, outfile: typing.BinaryIO, length: typing.Optional[int]) -> int:
+    if length is None:
+        start = infile.tell()
+        shutil.copyfileobj(infile, outfile)
+        return infile.tell() - start
+    remaining = length
+    while remaining:
+        chunk = infile.read(min(remaining, yatapi.trigger.DEFAULT_READ_SIZE))
+        if not chunk:
+            break
+        outfile.write(chunk)
+        remaining -= len(chunk)
+    return length - remaining
+
+
+def _count_triggers(text: typing.Union[str, bytes], encoding: str) -> int:
+    if isinstance(text, str):
+        text = text.encode(encoding)
+    return sum(1 for _ in yatapi.trigger.iter_trigger_blocks(io.BytesIO(text)))
+
+
+def _spliced_metadata(index: MetadataIndex, replacements: typing.Dict, encoding: str) -> typing.List:
+    """Gets the metadata of each trigger once the systems are replaced, as `MetadataIndex.splice` replaces them."""
+    changes = []
+    for system, text in replacements.items():
+        runs = index.runs(system)
+        changes.append((runs[0], [index.metadata[runs[0].first]] * _count_triggers(text, encoding)))
+        changes.extend((run, []) for run in runs[1:])
+    metadata = list(index.metadata)
+    # from the last run back, so the ordinals of the runs before stay valid
+    for run, new in sorted(changes, key=lambda x: x[0].first, reverse=True):
+        metadata[run.first:run.first + run.count] = new
+    return metadata
+
+
+def write_sidecar(sidecar: typing.TextIO, metadata: typing.Sequence):
+    """Writes the metadata of each trigger as a sidecar file, one line per run of triggers with the same metadata.
+
+    :param sidecar: file opened in text mode
+    :param metadata: metadata of each trigger in order, e.g. from `read_sidecar`
+    :return:
+    """
+    for trigger_metadata, run in itertools.groupby(metadata):
+        sidecar.write(yatapi.trigger.sidecar_record(sum(1 for _ in run), trigger_metadata))
+
+
+def _replace_file(path: str, write: typing.Callable[[typing.IO], typing.Any], mode: str = 'wb'):
+    """Writes a new version of a file next to it and then moves it over the old one, so the file is never left
+    half written."""
+    directory = os.path.dirname(os.path.abspath(path))
+    encoding = None if 'b' in mode else 'utf-8'
+    with tempfile.NamedTemporaryFile(mode, dir=directory, delete=False, encoding=encoding) as outfile:
+        try:
+            write(outfile)
+        except BaseException:
+            outfile.close()
+            os.remove(outfile.name)
+            raise
+    shutil.copymode(path, outfile.name)
+    os.replace(outfile.name, path)
+
+
+def splice_systems(path: str, replacements: typing.Dict, key: str = SYSTEM_KEY, encoding: str = 'utf-8',
+                   index: typing.Optional[MetadataIndex] = None,
+                   sidecar: typing.Optional[str] = None) -> MetadataIndex:
+    """Replaces the triggers of systems inside a TrigEdit file, e.g.
+    `splice_systems(path, {'Hero Revival': compile_triggers(triggers, jsondata={'system': 'Hero Revival'})})`.
+
+    The new file is written next to the old one and then moved over it, so the file is never left half written.
+    Systems are found by their JSON comments or markers, or with `trigger.METADATA_SIDECAR` by the sidecar file,
+    which is rewritten along with the file.
+
+    :param path: path to the TrigEdit file
+    :param replacements: new TrigEdit text of each system; see `MetadataIndex.splice`
+    :param key: metadata key naming the system of a trigger
+    :param encoding: encoding of the file
+    :param index: index of the file as it is now, to skip scanning it again
+    :param sidecar: path to the sidecar file of a file written with `trigger.METADATA_SIDECAR`; the new text of
+                    each system must then be written without metadata, e.g. with the sidecar mode too
+    :return: index of the new file
+    """
+    if index is None:
+        if sidecar is None:
+            index = MetadataIndex.from_file(path, key=key, encoding=encoding)
+        else:
+            index = MetadataIndex.from_sidecar(path, sidecar, key=key)
+    metadata = _spliced_metadata(index, replacements, encoding) if sidecar is not None else None
+
+    def write(outfile):
+        with open(path, 'rb') as infile:
+            index.splice(infile, outfile, replacements, encoding=encoding)
+    _replace_file(path, write)
+    if sidecar is None:
+        return MetadataIndex.from_file(path, key=key, encoding=encoding)
+    _replace_file(sidecar, lambda x: write_sidecar(x, metadata), mode='w')
+    return MetadataIndex.from_sidecar(path, sidecar, key=key)
@@ -0,0 +1,951 @@
+"""Optimization passes over `Trigger` objects, e.g. folding redundant actions before compiling a large map.
+
+Passes never change the triggers given: they return new triggers (sharing unchanged statements) along with
+a report of every change made.
+
+"""
+
+import collections
+import itertools
+import typing
+
+import yatapi.scaction
+import yatapi.scoperation
+import yatapi.scplayer
+import yatapi.scquantifier
+import yatapi.scresource
+import yatapi.scunit
+import yatapi.trigger
+import yatapi.trigger_statements
+
+ts = yatapi.trigger_statements
+
+# largest value of a death counter, resource, score or timer (unsigned 32 bit)
+MAX_COUNTER = (1 << 32) - 1
+
+# a change made by a pass: the index of the trigger in the list given, the rule applied, and the statements (or the
+# players, when merging triggers) before and after it was applied (`after` is empty when statements were removed)
+Change = collections.namedtuple('Change', ['trigger', 'rule', 'before', 'after'])
+# the triggers a pass produced and its `OptimizationReport`
+OptimizationResult = collections.namedtuple('OptimizationResult', ['triggers', 'report'])
+
+# actions changing a counter: the argument holding the amount, and the arguments picking the counter
+COUNTER_ACTIONS = {
+    ts.SetCountdownTimer: ('seconds', ()),
+    ts.SetDeaths: ('count', ('player', 'unit')),
+    ts.SetResources: ('amount', ('player', 'resource')),
+    ts.SetScore: ('count', ('player', 'score')),
+}
+
+
+class OptimizationReport:
+    def __init__(self, name: str, triggers_before: int = 0, triggers_after: int = 0):
+        """Record of what an optimization pass changed.
+
+        :param name: name of the pass, e.g. "peephole"
+        :param triggers_before: number of triggers given to the pass
+        :param triggers_after: number of triggers the pass gave back
+        """
+        self.name = name
+        self.triggers_before = triggers_before
+        self.triggers_after = triggers_after
+        self.changes = []
+        self.statements_before = 0
+        self.statements_after = 0
+
+    def add(self, trigger: int, rule: str, before: typing.Sequence, after: typing.Sequence = ()):
+        self.changes.append(Change(trigger, rule, tuple(before), tuple(after)))
+
+    def counts(self) -> typing.Dict[str, int]:
+        """Counts the changes made by each rule.
+
+        :return:
+        """
+        return dict(collections.Counter(x.rule for x in self.changes))
+
+    def changed_triggers(self) -> typing.List[int]:
+        """Gets the indexes (in the list given to the pass) of the triggers changed.
+
+        :return:
+        """
+        return sorted(set(x.trigger for x in self.changes))
+
+    def summary(self) -> str:
+        """Describes the changes in a few lines, e.g. to print after a build.
+
+        :return:
+        """
+        lines = ['{}: {} changes in {} of {} triggers'.format(
+            self.name, len(self.changes), len(self.changed_triggers()), self.triggers_before)]
+        if self.triggers_after != self.triggers_before:
+            lines.append('  triggers: {} -> {}'.format(self.triggers_before, self.triggers_after))
+        if self.statements_after != self.statements_before:
+            lines.append('  statements: {} -> {}'.format(self.statements_before, self.statements_after))
+        for rule, count in sorted(self.counts().items()):
+            lines.append('  {}: {}'.format(rule, count))
+        return '\n'.join(lines)
+
+    def __len__(self):
+        return len(self.changes)
+
+    def __repr__(self):
+        return 'OptimizationReport(name={!r}, changes={}, triggers={}->{}, statements={}->{})'.format(
+            self.name, len(self.changes), self.triggers_before, self.triggers_after,
+            self.statements_before, self.statements_after)
+
+
+def _replace(statement, **values):
+    """Copies a statement with some arguments changed, e.g. `_replace(set_deaths, count=5)`."""
+    statement_class = statement._statement_class
+    plan = statement_class._get_compile_plan()
+    return statement_class(*[values[x] if x in values else getattr(statement, x) for x in plan.init_args])
+
+
+def _counter_key(action) -> typing.Optional[tuple]:
+    """Identifies the counter an action changes, or None if it does not change one."""
+    layout = COUNTER_ACTIONS.get(action._statement_class)
+    if layout is None:
+        return None
+    return (action._statement_class,) + tuple(getattr(action, x) for x in layout[1])
+
+
+def _fold_counters(first, second, mixed_operations: bool):
+    """Folds two consecutive changes of the same counter into one, where that gives the same value.
+
+    Subtracting stops at 0, so a Subtract then an Add never folds; an Add then a Subtract only folds with
+    `mixed_operations`, since it differs if the Add overflowed.
+
+    :return: the rule and the single action replacing both, or None
+    """
+    amount_field = COUNTER_ACTIONS[first._statement_class][0]
+    a = getattr(first, amount_field)
+    b = getattr(second, amount_field)
+    first_operation = first.operation
+    second_operation = second.operation
+    if second_operation == yatapi.scoperation.SET_TO:
+        # the second overwrites whatever the first did
+        return 'overwritten', second
+    if first_operation == yatapi.scoperation.SET_TO:
+        if second_operation == yatapi.scoperation.ADD and a + b <= MAX_COUNTER:
+            return 'fold', _replace(first, **{amount_field: a + b})
+        if second_operation == yatapi.scoperation.SUBTRACT:
+            return 'fold', _replace(first, **{amount_field: max(0, a - b)})
+        return None
+    if first_operation == second_operation and a + b <= MAX_COUNTER:
+        return 'fold', _replace(first, **{amount_field: a + b})
+    if mixed_operations and first_operation == yatapi.scoperation.ADD and \
+            second_operation == yatapi.scoperation.SUBTRACT:
+        if a >= b:
+            return 'fold', _replace(first, **{amount_field: a - b})
+        return 'fold', _replace(second, **{amount_field: b - a})
+    return None
+
+
+# switch actions as functions of the switch's state: a constant, or None for toggling
+def _switch_name(statement) -> str:
+    """Gets the name of the switch a `Switch` or `SetSwitch` uses, without the quotes it may be written with;
+    'Switch 1' and '"Switch 1"' compile to the same switch."""
+    name = statement.switch
+    if len(name) >= 2 and name[0] == '"' and name[-1] == '"':
+        return name[1:-1]
+    return name
+
+
+_SWITCH_EFFECTS = {yatapi.scaction.SET: True, yatapi.scaction.CLEAR: False, yatapi.scaction.TOGGLE: None}
+
+
+def _fold_switches(first, second):
+    """Folds two consecutive changes of the same switch into one (or none); randomizing never folds.
+
+    :return: the rule and the action replacing both (None if they cancel out), or None
+    """
+    if first.action not in _SWITCH_EFFECTS or second.action not in _SWITCH_EFFECTS:
+        return None
+    if _SWITCH_EFFECTS[second.action] is not None:
+        return 'overwritten', second
+    if _SWITCH_EFFECTS[first.action] is None:
+        return 'cancelled', None
+    # setting then toggling is clearing, and clearing then toggling is setting
+    action = yatapi.scaction.CLEAR if _SWITCH_EFFECTS[first.action] else yatapi.scaction.SET
+    return 'fold', _replace(first, action=action)
+
+
+def _fold_pair(first, second, mixed_operations: bool):
+    """Folds two consecutive actions, if both change the same counter or switch."""
+    statement_class = first._statement_class
+    if statement_class is not second._statement_class:
+        return None
+    if statement_class is ts.SetSwitch:
+        return _fold_switches(first, second) if _switch_name(first) == _switch_name(second) else None
+    key = _counter_key(first)
+    if key is not None and key == _counter_key(second):
+        return _fold_counters(first, second, mixed_operations)
+    return None
+
+
+def _is_noop(action) -> bool:
+    if action._statement_class in COUNTER_ACTIONS:
+        return action.operation != yatapi.scoperation.SET_TO and \
+            getattr(action, COUNTER_ACTIONS[action._statement_class][0]) == 0
+    return False
+
+
+def fold_actions(actions: typing.Sequence[ts.Action], mixed_operations: bool = False) -> typing.Tuple[
+        typing.List[ts.Action], typing.List[typing.Tuple[str, tuple, tuple]]]:
+    """Peephole pass over the actions of one trigger.
+
+    Only actions right next to each other are folded, and actions are never moved, so nothing is reordered across
+    a `Wait` or any other action:
+
+    * consecutive changes of the same counter (`SetDeaths`, `SetResources`, `SetScore`, `SetCountdownTimer`)
+      fold into one, e.g. Add 5 then Add 3 into Add 8, or anything followed by Set To into the Set To
+    * Add 0 and Subtract 0 are removed
+    * consecutive `SetSwitch` of the same switch fold into one (toggling twice removes both)
+    * only the first `PreserveTrigger()` and the first of identical `Comment`s are kept
+
+    :param actions:
+    :param mixed_operations: also fold an Add followed by a Subtract; this differs from running both only when the
+                             Add overflows the counter
+    :return: the new actions, and the rule, actions before, and actions after of each change
+    """
+    changes = []
+    folded = []
+    for action in actions:
+        pending = action
+        while pending is not None:
+            if _is_noop(pending):
+                changes.append(('noop', (pending,), ()))
+                pending = None
+                break
+            result = _fold_pair(folded[-1], pending, mixed_operations) if folded else None
+            if result is None:
+                break
+            rule, replacement = result
+            previous = folded.pop()
+            changes.append((rule, (previous, pending), () if replacement is None else (replacement,)))
+            pending = replacement
+        if pending is not None:
+            folded.append(pending)
+    kept = []
+    preserved = False
+    comments = set()
+    for action in folded:
+        if action._statement_class is ts.PreserveTrigger:
+            if preserved:
+                changes.append(('duplicate preserve', (action,), ()))
+                continue
+            preserved = True
+        elif action._statement_class is ts.Comment:
+            if action.text in comments:
+                changes.append(('duplicate comment', (action,), ()))
+                continue
+            comments.add(action.text)
+        kept.append(action)
+    return kept, changes
+
+
+def peephole(triggers: typing.Iterable[yatapi.trigger.Trigger], mixed_operations: bool = False) -> OptimizationResult:
+    """Folds redundant actions of each trigger; see `fold_actions`.
+
+    :param triggers:
+    :param mixed_operations: also fold an Add followed by a Subtract of the same counter
+    :return: the triggers (the same objects when unchanged) and the report of the changes
+    """
+    report = OptimizationReport('peephole')
+    optimized = []
+    for i, trigger in enumerate(triggers):
+        actions, changes = fold_actions(trigger.actions, mixed_operations=mixed_operations)
+        report.statements_before += len(trigger.actions)
+        report.statements_after += len(actions)
+        for rule, before, after in changes:
+            report.add(i, rule, before, after)
+        if changes:
+            trigger = yatapi.trigger.Trigger(list(trigger.players), list(trigger.conditions), actions)
+        optimized.append(trigger)
+    report.triggers_before = report.triggers_after = len(optimized)
+    return OptimizationResult(optimized, report)
+
+
+# conditions comparing a counter: the argument holding the amount, and the arguments picking the counter
+COUNTER_CONDITIONS = {
+    ts.Accumulate: ('amount', ('player', 'resource')),
+    ts.Bring: ('count', ('player', 'unit', 'location')),
+    ts.Command: ('count', ('player', 'unit')),
+    ts.CountdownTimer: ('count', ()),
+    ts.Deaths: ('count', ('player', 'unit')),
+}
+# states a `Switch` condition can check; any two different ones contradict each other
+SWITCH_STATES = frozenset(['set', 'not set'])
+
+
+def _condition_interval(condition) -> typing.Tuple[int, int]:
+    """Gets the range of counter values a condition accepts, e.g. Deaths(..., At least, 3) gives (3, MAX_COUNTER)."""
+    amount = getattr(condition, COUNTER_CONDITIONS[condition._statement_class][0])
+    quantifier = condition.quantifier
+    if quantifier == yatapi.scquantifier.AT_LEAST:
+        return amount, MAX_COUNTER
+    if quantifier == yatapi.scquantifier.AT_MOST:
+        return 0, amount
+    return amount, amount
+
+
+def _interval_conditions(condition, low: int, high: int) -> typing.List[ts.Condition]:
+    """Builds the fewest conditions like `condition` accepting exactly the counter values from `low` to `high`."""
+    amount_field = COUNTER_CONDITIONS[condition._statement_class][0]
+    if low == high:
+        return [_replace(condition, quantifier=yatapi.scquantifier.EXACTLY, **{amount_field: low})]
+    conditions = []
+    if low > 0:
+        conditions.append(_replace(condition, quantifier=yatapi.scquantifier.AT_LEAST, **{amount_field: low}))
+    if high < MAX_COUNTER:
+        conditions.append(_replace(condition, quantifier=yatapi.scquantifier.AT_MOST, **{amount_field: high}))
+    return conditions
+
+
+def simplify_conditions(conditions: typing.Sequence[ts.Condition]) -> typing.Tuple[
+        typing.List[ts.Condition], typing.List[typing.Tuple[str, tuple, tuple]]]:
+    """Simplifies the conditions of one trigger, which all have to hold for it to fire.
+
+    Checks of the same counter (`Accumulate`, `Bring`, `Command`, `CountdownTimer`, `Deaths` with the same player,
+    unit, location or resource) are intersected as ranges of values:
+
+    * redundant checks are dropped, e.g. At least 3 alongside At least 5
+    * checks that always hold are dropped, e.g. At least 0
+    * contradicting checks, e.g. Exactly 0 alongside At least 1, make the conditions a single `Never()`
+
+    Identical conditions are kept once, `Always()` is dropped next to other conditions, and checking a switch for
+    two different states is a contradiction too.  The simplified checks of a counter take the place of its first.
+
+    :param conditions:
+    :return: the new conditions, and the rule, conditions before, and conditions after of each change
+    """
+    if any(x._statement_class is ts.Never for x in conditions):
+        if len(conditions) == 1:
+            return list(conditions), []
+        return [ts.Never()], [('never', tuple(conditions), (ts.Never(),))]
+    changes = []
+    # conditions kept as they are, and the key of each counter in place of its first check
+    kept = []
+    counters = collections.OrderedDict()
+    seen = set()
+    switches = {}
+    always = []
+    for condition in conditions:
+        statement_class = condition._statement_class
+        if statement_class is ts.Always:
+            always.append(condition)
+            continue
+        layout = COUNTER_CONDITIONS.get(statement_class)
+        if layout is not None:
+            key = (statement_class,) + tuple(getattr(condition, x) for x in layout[1])
+            if key not in counters:
+                counters[key] = []
+                kept.append(key)
+            counters[key].append(condition)
+            continue
+        structural_key = condition.structural_key()
+        if structural_key in seen:
+            changes.append(('duplicate', (condition,), ()))
+            continue
+        seen.add(structural_key)
+        if statement_class is ts.Switch and str(condition.state).lower() in SWITCH_STATES:
+            other = switches.setdefault(_switch_name(condition), condition)
+            if str(other.state).lower() != str(condition.state).lower():
+                return [ts.Never()], changes + [('contradiction', (other, condition), (ts.Never(),))]
+        kept.append(condition)
+    simplified = {}
+    for key, checks in counters.items():
+        low, high = 0, MAX_COUNTER
+        for check in checks:
+            check_low, check_high = _condition_interval(check)
+            low, high = max(low, check_low), min(high, check_high)
+        if low > high:
+            return [ts.Never()], changes + [('contradiction', tuple(checks), (ts.Never(),))]
+        new = _interval_conditions(checks[0], low, high)
+        if new != checks:
+            if not new:
+                rule = 'tautology'
+            elif len(checks) == 1:
+                rule = 'normalized'
+            else:
+                rule = 'redundant'
+            changes.append((rule, tuple(checks), tuple(new)))
+            simplified[key] = new
+        else:
+            simplified[key] = checks
+    result = []
+    for item in kept:
+        if type(item) is tuple:
+            result.extend(simplified[item])
+        else:
+            result.append(item)
+    if result:
+        if always:
+            changes.append(('always', tuple(always), ()))
+    else:
+        result = always[:1] if always else [ts.Always()]
+        if len(always) > 1:
+            changes.append(('duplicate', tuple(always[1:]), ()))
+        elif not always and conditions:
+            # every condition held anyway
+            changes.append(('tautology', (), tuple(result)))
+    return result, changes
+
+
+def simplify(triggers: typing.Iterable[yatapi.trigger.Trigger]) -> OptimizationResult:
+    """Simplifies the conditions of each trigger; see `simplify_conditions`.
+
+    Triggers whose conditions can never all hold are given a single `Never()` condition (see `eliminate_dead`
+    to remove them).
+
+    :param triggers:
+    :return: the triggers (the same objects when unchanged) and the report of the changes
+    """
+    report = OptimizationReport('simplify')
+    optimized = []
+    for i, trigger in enumerate(triggers):
+        conditions, changes = simplify_conditions(trigger.conditions)
+        report.statements_before += len(trigger.conditions)
+        report.statements_after += len(conditions)
+        for rule, before, after in changes:
+            report.add(i, rule, before, after)
+        if changes:
+            trigger = yatapi.trigger.Trigger(list(trigger.players), conditions, list(trigger.actions))
+        optimized.append(trigger)
+    report.triggers_before = report.triggers_after = len(optimized)
+    return OptimizationResult(optimized, report)
+
+
+# players a trigger can name directly; any other player (e.g. "All players" or "Foes") may be any of them
+CONCRETE_PLAYERS = frozenset(x for x in yatapi.scplayer.REGISTRY if yatapi.scplayer.REGISTRY.id_of(x) < 12)
+
+
+def _resolve_players(player, owners: typing.Sequence) -> typing.Optional[typing.FrozenSet]:
+    """Gets the players a player argument may stand for, or None if it may be any player."""
+    if player in CONCRETE_PLAYERS:
+        return frozenset([player])
+    if player == yatapi.scplayer.CURRENT_PLAYER and owners and all(x in CONCRETE_PLAYERS for x in owners):
+        return frozenset(owners)
+    return None
+
+
+class DependencyGraph:
+    def __init__(self, triggers: typing.Sequence[yatapi.trigger.Trigger],
+                 counter_units: typing.Optional[typing.AbstractSet] = None):
+        """Which triggers write and read each switch and death counter.
+
+        Keys are ('switch', name) and ('deaths', unit).  Only units in `counter_units` are tracked as death counters,
+        since the deaths of any other unit also go up when units die in game.
+
+        :param triggers:
+        :param counter_units: units the map only uses as death counters, whose deaths only change through
+                              `SetDeaths`; none by default
+        """
+        self.triggers = list(triggers)
+        self.counter_units = frozenset(counter_units or ())
+        self.writers = collections.defaultdict(list)
+        self.readers = collections.defaultdict(list)
+        for i, trigger in enumerate(self.triggers):
+            for key in dict.fromkeys(self._write_keys(trigger)):
+                self.writers[key].append(i)
+            for key in dict.fromkeys(self._read_keys(trigger)):
+                self.readers[key].append(i)
+
+    def _write_keys(self, trigger) -> typing.Iterator[tuple]:
+        for action in trigger.actions:
+            statement_class = action._statement_class
+            if statement_class is ts.SetSwitch:
+                yield 'switch', _switch_name(action)
+            elif statement_class is ts.SetDeaths and action.unit in self.counter_units:
+                yield 'deaths', action.unit
+
+    def _read_keys(self, trigger) -> typing.Iterator[tuple]:
+        for condition in trigger.conditions:
+            statement_class = condition._statement_class
+            if statement_class is ts.Switch:
+                yield 'switch', _switch_name(condition)
+            elif statement_class is ts.Deaths and condition.unit in self.counter_units:
+                yield 'deaths', condition.unit
+
+    def edges(self) -> typing.Iterator[typing.Tuple[int, int, tuple]]:
+        """Gets each (writer, reader, key): a trigger writing a switch or death counter another trigger reads.
+
+        :return:
+        """
+        for key, readers in self.readers.items():
+            for writer in self.writers.get(key, ()):
+                for reader in readers:
+                    yield writer, reader, key
+
+    def reachable(self) -> typing.Tuple[typing.Set[int], typing.Dict[int, typing.List[ts.Condition]]]:
+        """Finds the triggers that can fire, starting from every switch cleared and every death counter at 0.
+
+        A trigger can fire once each of its switch and death counter checks can hold given what the triggers
+        that can fire write; all other conditions are assumed to be able to hold.  Triggers waiting on a switch or
+        death counter are only checked again when a newly reachable trigger writes it.
+
+        :return: the indexes of the triggers that can fire, and the conditions that can never hold of each other one
+        """
+        switches = set()
+        # writes of each death counter unit: (players, operation, amount)
+        deaths = collections.defaultdict(list)
+        reachable = set()
+        blocked = {}
+        waiting = collections.defaultdict(list)
+        pending = collections.deque(range(len(self.triggers)))
+        while pending:
+            i = pending.popleft()
+            if i in reachable:
+                continue
+            trigger = self.triggers[i]
+            conditions = self._blocking_conditions(trigger, switches, deaths)
+            if conditions:
+                blocked[i] = conditions
+                for condition in conditions:
+                    if condition._statement_class is not ts.Never:
+                        key = ('switch', _switch_name(condition)) if condition._statement_class is ts.Switch else \
+                            ('deaths', condition.unit)
+                        waiting[key].append(i)
+                continue
+            reachable.add(i)
+            blocked.pop(i, None)
+            for action in trigger.actions:
+                statement_class = action._statement_class
+                if statement_class is ts.SetSwitch and action.action != yatapi.scaction.CLEAR:
+                    switch = _switch_name(action)
+                    if switch not in switches:
+                        switches.add(switch)
+                        pending.extend(waiting.pop(('switch', switch), ()))
+                elif statement_class is ts.SetDeaths and action.unit in self.counter_units:
+                    deaths[action.unit].append((_resolve_players(action.player, trigger.players),
+                                                action.operation, action.count))
+                    pending.extend(waiting.pop(('deaths', action.unit), ()))
+        return reachable, blocked
+
+    def _blocking_conditions(self, trigger, switches, deaths) -> typing.List[ts.Condition]:
+        """Gets the conditions of a trigger that cannot hold given the switches set and death counter writes so far."""
+        conditions = []
+        for condition in trigger.conditions:
+            statement_class = condition._statement_class
+            if statement_class is ts.Never:
+                return [condition]
+            if statement_class is ts.Switch:
+                # switches start cleared, so only checking one is set can be blocked
+                if str(condition.state).lower() == 'set' and _switch_name(condition) not in switches:
+                    conditions.append(condition)
+            elif statement_class is ts.Deaths and condition.unit in self.counter_units:
+                if not self._deaths_reachable(condition, trigger, deaths.get(condition.unit, ())):
+                    conditions.append(condition)
+        return conditions
+
+    @staticmethod
+    def _deaths_reachable(condition, trigger, writes) -> bool:
+        low, high = _condition_interval(condition)
+        if low == 0:
+            return True
+        players = _resolve_players(condition.player, trigger.players)
+        writes = [x for x in writes if players is None or x[0] is None or players & x[0]]
+        subtracted = any(x[1] == yatapi.scoperation.SUBTRACT for x in writes)
+        for _, operation, amount in writes:
+            if operation == yatapi.scoperation.ADD and amount:
+                # adding repeatedly (or along with other writes) may reach any value
+                return True
+            if operation == yatapi.scoperation.SET_TO and (low <= amount <= high or (subtracted and amount >= low)):
+                return True
+        return False
+
+
+def eliminate_dead(triggers: typing.Iterable[yatapi.trigger.Trigger], remove: bool = True,
+                   counter_units: typing.Optional[typing.AbstractSet] = None) -> OptimizationResult:
+    """Finds the triggers that can never fire: those with `Never()`, those checking a switch is set that no trigger
+    that can fire ever sets, and those checking a death counter for values no trigger that can fire ever gives it.
+
+    See `DependencyGraph.reachable`.  Triggers depending only on dead triggers are dead too.
+
+    :param triggers:
+    :param remove: whether to remove the dead triggers, rather than only report them
+    :param counter_units: units the map only uses as death counters; see `DependencyGraph`
+    :return: the triggers left and the report of the dead ones (with the conditions that can never hold)
+    """
+    triggers = list(triggers)
+    graph = DependencyGraph(triggers, counter_units=counter_units)
+    reachable, blocked = graph.reachable()
+    report = OptimizationReport('eliminate dead', triggers_before=len(triggers))
+    report.statements_before = sum(len(x.conditions) + len(x.actions) for x in triggers)
+    for i in sorted(blocked):
+        conditions = blocked[i]
+        statement_class = conditions[0]._statement_class
+        if statement_class is ts.Never:
+            rule = 'never'
+        elif statement_class is ts.Switch:
+            rule = 'unset switch'
+        else:
+            rule = 'unreached deaths'
+        report.add(i, rule, conditions)
+    if remove:
+        triggers = [x for i, x in enumerate(triggers) if i in reachable]
+    report.triggers_after = len(triggers)
+    report.statements_after = sum(len(x.conditions) + len(x.actions) for x in triggers)
+    return OptimizationResult(triggers, report)
+
+
+# most actions a trigger can hold
+MAX_ACTIONS = yatapi.trigger.MAX_ACTIONS
+
+# what conditions read and actions write, to tell whether running an action can change whether a condition holds
+_EVERYTHING = ('*',)
+_UNITS = ('units',)
+_ANY_DEATHS = ('deaths', None)
+_ANY_RESOURCES = ('resources', None)
+_SCORE = ('score',)
+_TIMER = ('timer',)
+# units standing for groups of units, whose deaths overlap those of every unit in the group
+GROUP_UNITS = frozenset([yatapi.scunit.ANY_UNIT, yatapi.scunit.BUILDINGS, yatapi.scunit.FACTORIES,
+                         yatapi.scunit.MEN])
+# actions that change units, and so deaths, scores, and what `Bring` and `Command` see
+_UNIT_ACTIONS = frozenset([
+    ts.CreateUnit, ts.CreateUnitWithProperties, ts.GiveUnitsToPlayer, ts.KillUnit, ts.KillUnitAtLocation,
+    ts.ModifyUnitEnergy, ts.ModifyUnitHangerCount, ts.ModifyUnitHitPoints, ts.ModifyUnitShieldPoints,
+    ts.MoveLocation, ts.MoveUnit, ts.Order, ts.RemoveUnit, ts.RemoveUnitAtLocation, ts.RunAiScript,
+    ts.RunAiScriptAtLocation,
+])
+# actions that change nothing any condition can see
+_SILENT_ACTIONS = frozenset([
+    ts.CenterView, ts.Comment, ts.DisplayTextMessage, ts.LeaderBoardControl, ts.LeaderBoardKills,
+    ts.LeaderBoardPoints, ts.LeaderboardComputerPlayers, ts.MinimapPing, ts.PlayWav, ts.PreserveTrigger,
+    ts.SetDoodadState, ts.SetInvincibility, ts.SetMissionObjectives,
+])
+# actions whose second run in a row changes nothing
+_IDEMPOTENT_ACTIONS = frozenset([
+    ts.CenterView, ts.Comment, ts.Defeat, ts.LeaderBoardControl, ts.LeaderBoardKills, ts.LeaderBoardPoints,
+    ts.LeaderboardComputerPlayers, ts.PreserveTrigger, ts.SetAllianceStatus, ts.SetDoodadState,
+    ts.SetInvincibility, ts.SetMissionObjectives, ts.Victory,
+])
+
+
+def _deaths_key(unit) -> tuple:
+    return _ANY_DEATHS if unit in GROUP_UNITS else ('deaths', unit)
+
+
+def _resources_key(resource) -> tuple:
+    # "ore and gas" (or any other value) overlaps both ore and gas
+    if resource in (yatapi.scresource.ORE, yatapi.scresource.GAS):
+        return 'resources', resource
+    return _ANY_RESOURCES
+
+
+def _condition_reads(condition) -> typing.Tuple[tuple, ...]:
+    statement_class = condition._statement_class
+    if statement_class in (ts.Always, ts.Never):
+        return ()
+    if statement_class is ts.Switch:
+        return ('switch', _switch_name(condition)),
+    if statement_class is ts.Deaths:
+        return _deaths_key(condition.unit),
+    if statement_class is ts.Accumulate:
+        return _resources_key(condition.resource),
+    if statement_class in (ts.Bring, ts.Command):
+        return _UNITS,
+    if statement_class is ts.CountdownTimer:
+        return _TIMER,
+    if statement_class is ts.HighestScore:
+        return _SCORE,
+    return _EVERYTHING,
+
+
+def _action_writes(action) -> typing.Tuple[tuple, ...]:
+    statement_class = action._statement_class
+    if statement_class in _SILENT_ACTIONS:
+        return ()
+    if statement_class is ts.SetSwitch:
+        return ('switch', _switch_name(action)),
+    if statement_class is ts.SetDeaths:
+        return _deaths_key(action.unit),
+    if statement_class is ts.SetResources:
+        return _resources_key(action.resource),
+    if statement_class is ts.SetCountdownTimer:
+        return _TIMER,
+    if statement_class is ts.SetScore:
+        return _SCORE,
+    if statement_class in _UNIT_ACTIONS:
+        return _UNITS, _ANY_DEATHS, _SCORE
+    return _EVERYTHING,
+
+
+def _affects(actions: typing.Iterable[ts.Action], conditions: typing.Iterable[ts.Condition]) -> bool:
+    """Checks whether running the actions may change whether any of the conditions holds."""
+    reads = set(itertools.chain.from_iterable(_condition_reads(x) for x in conditions))
+    if not reads:
+        return False
+    # kinds of counters read, e.g. 'deaths'; a key with None (e.g. `_ANY_DEATHS`) overlaps every key of its kind
+    kinds = set(x[0] for x in reads if len(x) == 2)
+    for write in itertools.chain.from_iterable(_action_writes(x) for x in actions):
+        if write == _EVERYTHING or _EVERYTHING in reads or write in reads:
+            return True
+        if len(write) == 2 and write[0] in kinds and (write[1] is None or (write[0], None) in reads):
+            return True
+    return False
+
+
+def _is_idempotent(action) -> bool:
+    statement_class = action._statement_class
+    if statement_class in _IDEMPOTENT_ACTIONS:
+        return True
+    if statement_class in COUNTER_ACTIONS:
+        return action.operation == yatapi.scoperation.SET_TO
+    if statement_class is ts.SetSwitch:
+        return action.action in (yatapi.scaction.SET, yatapi.scaction.CLEAR)
+    return False
+
+
+def _owners(players: typing.Iterable) -> typing.FrozenSet:
+    """Gets the players a trigger runs for; players other than "Player 1" to "Player 12" may stand for any of them."""
+    owners = set()
+    for player in players:
+        if player not in CONCRETE_PLAYERS:
+            return CONCRETE_PLAYERS
+        owners.add(player)
+    return frozenset(owners)
+
+
+class _MergedTrigger:
+    __slots__ = ('index', 'trigger', 'players', 'owners', 'actions', 'changed')
+
+    def __init__(self, index: int, trigger: yatapi.trigger.Trigger):
+        self.index = index
+        self.trigger = trigger
+        self.players = list(trigger.players)
+        self.owners = _owners(trigger.players)
+        self.actions = list(trigger.actions)
+        self.changed = False
+
+    def build(self) -> yatapi.trigger.Trigger:
+        if not self.changed:
+            return self.trigger
+        return yatapi.trigger.Trigger(self.players, list(self.trigger.conditions), self.actions)
+
+
+def _merge_players(triggers: typing.Sequence[yatapi.trigger.Trigger],
+                   report: OptimizationReport) -> typing.List[_MergedTrigger]:
+    merged = []
+    # position in `merged` of the last trigger run for each player, and of the last trigger with each content
+    last_position = {}
+    positions = {}
+    for i, trigger in enumerate(triggers):
+        key = trigger.structural_key()[1:]
+        owners = _owners(trigger.players)
+        position = positions.get(key)
+        if position is not None and all(last_position.get(x, -1) <= position for x in owners):
+            target = merged[position]
+            overlap = owners & target.owners
+            # moving the trigger up is safe: none of its players run a trigger in between;
+            # players running both copies would run the actions twice, which only changes nothing if idempotent,
+            # and a copy that is not preserved may fire later on its own unless the actions leave its conditions be
+            if not overlap or (all(_is_idempotent(x) for x in trigger.actions) and
+                               (_is_preserved(trigger.actions) or
+                                not _affects(trigger.actions, trigger.conditions))):
+                before = tuple(target.players)
+                target.players.extend(x for x in trigger.players if x not in target.players)
+                target.owners = target.owners | owners
+                target.changed = target.changed or tuple(target.players) != before
+                for player in owners:
+                    last_position[player] = position
+                report.add(i, 'duplicate folded' if overlap else 'players merged', before, target.players)
+                continue
+        positions[key] = len(merged)
+        for player in owners:
+            last_position[player] = len(merged)
+        merged.append(_MergedTrigger(i, trigger))
+    return merged
+
+
+def _is_preserved(actions: typing.Iterable[ts.Action]) -> bool:
+    return any(x._statement_class is ts.PreserveTrigger for x in actions)
+
+
+def _concatenate_actions(triggers: typing.List[_MergedTrigger],
+                         report: OptimizationReport) -> typing.List[_MergedTrigger]:
+    merged = []
+    last_position = {}
+    positions = {}
+    for item in triggers:
+        key = (tuple(item.players), item.trigger.structural_key()[1], _is_preserved(item.actions))
+        position = positions.get(key)
+        if position is not None and all(last_position.get(x, -1) <= position for x in item.owners):
+            target = merged[position]
+            # the target's actions must not change whether the trigger would have fired after them
+            if not any(x._statement_class is ts.Wait for x in itertools.chain(target.actions, item.actions)) and \
+                    not _affects(target.actions, item.trigger.conditions):
+                kept = set(x.structural_key() for x in target.actions
+                           if x._statement_class in (ts.PreserveTrigger, ts.Comment))
+                actions = [x for x in item.actions if x._statement_class not in (ts.PreserveTrigger, ts.Comment) or
+                           x.structural_key() not in kept]
+                if len(target.actions) + len(actions) <= MAX_ACTIONS:
+                    report.add(item.index, 'actions concatenated', item.actions, actions)
+                    target.actions.extend(actions)
+                    target.changed = True
+                    continue
+        positions[key] = len(merged)
+        for player in item.owners:
+            last_position[player] = len(merged)
+        merged.append(item)
+    return merged
+
+
+def merge_triggers(triggers: typing.Iterable[yatapi.trigger.Trigger], concatenate: bool = True) -> OptimizationResult:
+    """Merges triggers that can run as one, using their structural keys:
+
+    * triggers with the same conditions and actions run by different players become one trigger run by all of them
+      ('players merged'), and identical copies run by the same players are folded into one when running their
+      actions a second time changes nothing and the copies are preserved or their actions cannot change whether
+      their conditions hold ('duplicate folded')
+    * with `concatenate`, triggers run by the same players with the same conditions, both preserved or neither,
+      become one trigger with the actions of both ('actions concatenated'), as long as the first one's actions
+      cannot change whether the second one's conditions hold, neither waits, and the actions fit in a trigger
+
+    StarCraft runs each player's triggers in order, so a trigger is only merged into an earlier one when none of its
+    players run any trigger in between.
+
+    :param triggers:
+    :param concatenate: whether to also concatenate the actions of triggers with the same conditions
+    :return: the merged triggers (the same objects when unchanged) and the report of the merges
+    """
+    triggers = list(triggers)
+    report = OptimizationReport('merge', triggers_before=len(triggers))
+    report.statements_before = sum(len(x.conditions) + len(x.actions) for x in triggers)
+    merged = _merge_players(triggers, report)
+    if concatenate:
+        merged = _concatenate_actions(merged, report)
+    optimized = [x.build() for x in merged]
+    report.triggers_after = len(optimized)
+    report.statements_after = sum(len(x.conditions) + len(x.actions) for x in optimized)
+    return OptimizationResult(optimized, report)
+
+
+# estimated cost of checking a condition once, relative to comparing one counter; `Command` and `Bring` count units,
+# `Bring` within a location, and `HighestScore` compares every player's score
+CONDITION_COSTS = {
+    ts.Accumulate: 1.0,
+    ts.Always: 0.5,
+    ts.Bring: 40.0,
+    ts.Command: 20.0,
+    ts.CountdownTimer: 1.0,
+    ts.Deaths: 1.0,
+    ts.HighestScore: 8.0,
+    ts.Never: 0.5,
+    ts.Switch: 1.0,
+}
+# cost of conditions missing from the cost table
+DEFAULT_CONDITION_COST = 10.0
+# estimated chance a condition holds when no hint is given
+DEFAULT_SELECTIVITY = 0.5
+# chances of the conditions whose outcome is known
+_KNOWN_SELECTIVITY = {ts.Always: 1.0, ts.Never: 0.0}
+
+
+class OrderingReport(OptimizationReport):
+    def __init__(self, name: str, triggers_before: int = 0, triggers_after: int = 0):
+        """`OptimizationReport` with the estimated cost of checking the conditions of every trigger once,
+        before and after reordering them.
+        """
+        super().__init__(name, triggers_before, triggers_after)
+        self.cost_before = 0.0
+        self.cost_after = 0.0
+
+    def savings(self) -> float:
+        """Gets the estimated share of condition checking saved, e.g. 0.25 for a quarter less.
+
+        :return:
+        """
+        return 1 - self.cost_after / self.cost_before if self.cost_before else 0.0
+
+    def summary(self) -> str:
+        return '{}\n  estimated cost per trigger cycle: {:,.1f} -> {:,.1f} ({:.1%} less)'.format(
+            super().summary(), self.cost_before, self.cost_after, self.savings())
+
+
+def _selectivity(condition, hints: typing.Mapping) -> float:
+    selectivity = hints.get(condition)
+    if selectivity is None:
+        selectivity = hints.get(condition._statement_class)
+    if selectivity is None:
+        selectivity = _KNOWN_SELECTIVITY.get(condition._statement_class, DEFAULT_SELECTIVITY)
+    if not 0 <= selectivity <= 1:
+        raise ValueError('Selectivity of {} must be between 0 and 1, got {}'.format(condition, selectivity))
+    return selectivity
+
+
+def expected_cost(conditions: typing.Sequence[ts.Condition], hints: typing.Optional[typing.Mapping] = None,
+                  costs: typing.Optional[typing.Mapping] = None) -> float:
+    """Estimates the cost of checking conditions in order, stopping at the first one that does not hold.
+
+    :param conditions:
+    :param hints: see `order_conditions`
+    :param costs: see `order_conditions`
+    :return:
+    """
+    hints = hints or {}
+    costs = CONDITION_COSTS if costs is None else costs
+    total = 0.0
+    reached = 1.0
+    for condition in conditions:
+        total += reached * costs.get(condition._statement_class, DEFAULT_CONDITION_COST)
+        reached *= _selectivity(condition, hints)
+    return total
+
+
+def order_conditions(conditions: typing.Sequence[ts.Condition], hints: typing.Optional[typing.Mapping] = None,
+                     costs: typing.Optional[typing.Mapping] = None) -> typing.List[ts.Condition]:
+    """Orders conditions so that checking them is cheapest on average, since StarCraft stops checking a trigger's
+    conditions at the first one that does not hold. Conditions change nothing, so their order never changes whether
+    the trigger fires.
+
+    Conditions are sorted by cost divided by the chance of not holding, which minimizes the expected cost when
+    conditions are independent; ties keep their order.
+
+    :param conditions:
+    :param hints: chance (0 to 1) that a condition holds, keyed by the condition itself or by its class, e.g.
+                  {ts.Switch('Game started', scstate.SCState('set')): 0.99, ts.Deaths: 0.1}; the condition's own
+                  hint is used over its class's
+    :param costs: cost of checking a condition, keyed by its class; defaults to `CONDITION_COSTS`
+    :return:
+    """
+    hints = hints or {}
+    costs = CONDITION_COSTS if costs is None else costs
+
+    def rank(condition):
+        cost = costs.get(condition._statement_class, DEFAULT_CONDITION_COST)
+        fails = 1 - _selectivity(condition, hints)
+        return cost / fails if fails else float('inf')
+    return sorted(conditions, key=rank)
+
+
+def reorder_conditions(triggers: typing.Iterable[yatapi.trigger.Trigger], hints: typing.Optional[typing.Mapping] = None,
+                       costs: typing.Optional[typing.Mapping] = None) -> OptimizationResult:
+    """Reorders the conditions of each trigger to check cheap, often false ones first; see `order_conditions`.
+
+    Conditions are only reordered when that lowers the estimated cost. The report's `cost_before` and `cost_after`
+    sum the estimated cost of checking every trigger's conditions once.
+
+    :param triggers:
+    :param hints: see `order_conditions`
+    :param costs: see `order_conditions`
+    :return: the triggers (the same objects when unchanged) and an `OrderingReport` of the changes
+    """
+    report = OrderingReport('reorder')
+    optimized = []
+    for i, trigger in enumerate(triggers):
+        cost = expected_cost(trigger.conditions, hints, costs)
+        report.cost_before += cost
+        conditions = order_conditions(trigger.conditions, hints, costs)
+        ordered_cost = expected_cost(conditions, hints, costs)
+        if ordered_cost < cost:
+            report.add(i, 'reordered', trigger.conditions, conditions)
+            trigger = yatapi.trigger.Trigger(list(trigger.players), conditions, list(trigger.actions))
+            cost = ordered_cost
+        report.cost_after += cost
+        report.statements_before += len(trigger.conditions)
+        optimized.append(trigger)
+    report.statements_after = report.statements_before
+    report.triggers_before = report.triggers_after = len(optimized)
+    return OptimizationResult(optimized, report)
@@ -0,0 +1,180 @@
+"""Incremental re-parsing of a TrigEdit file that is edited and reloaded.
+
+"""
+
+import bisect
+import collections
+import itertools
+import locale
+import typing
+
+import yatapi.trigger
+
+# a trigger that was edited in place, with its parsed versions before and after
+TriggerChange = collections.namedtuple('TriggerChange', ['old_index', 'new_index', 'old', 'new'])
+# triggers added (new index, trigger), removed (old index, trigger), and changed (see `TriggerChange`) by a reload
+TriggerDelta = collections.namedtuple('TriggerDelta', ['added', 'removed', 'changed'])
+
+
+def _positions(keys: typing.List, start: int, end: int) -> typing.Dict:
+    """Indexes where each key occurs in `keys[start:end]`.
+
+    :return: the index of each key, or a list of its indexes if it occurs more than once
+    """
+    positions = {}
+    for i in range(start, end):
+        key = keys[i]
+        position = positions.get(key)
+        if position is None:
+            positions[key] = i
+        elif type(position) is int:
+            positions[key] = [position, i]
+        else:
+            position.append(i)
+    return positions
+
+
+def _next_position(position: typing.Union[None, int, typing.List[int]], start: int) -> typing.Optional[int]:
+    """Finds the first index at or after `start` among those given by `_positions` for a key."""
+    if position is None:
+        return None
+    if type(position) is int:
+        return position if position >= start else None
+    i = bisect.bisect_left(position, start)
+    return position[i] if i < len(position) else None
+
+
+class TrigEditSession:
+    def __init__(self, parse_statements: bool = False, encoding: typing.Optional[str] = None,
+                 parser: typing.Optional[yatapi.trigger.TrigEditParser] = None):
+        """Keeps the parsed triggers of a TrigEdit file so a reload only re-parses the triggers that changed.
+
+        Each block of text between trigger separators is hashed; blocks seen in the previous load reuse their
+        parsed triggers.  Parsed triggers are shared between loads, so treat them as read only.
+
+        :param parse_statements: whether to give each condition and action as a parsed statement
+                                 (see `TrigEditParser.parse_statement`) rather than its raw text
+        :param encoding: encoding of files and bytes given to the session; defaults to the platform's preferred
+                         encoding, like `open`
+        :param parser: parser to use, e.g. one with a statement cache
+        """
+        self.parser = parser or yatapi.trigger.TrigEditParser()
+        self.parse_statements = parse_statements
+        self.encoding = encoding or locale.getpreferredencoding(False)
+        # parsed triggers in file order
+        self.triggers = []
+        # identity of each trigger in `triggers`: the id of its block, paired with its position if not the first
+        self._keys = []
+        # trigger keys and parsed triggers of each block of the last load
+        self._blocks = {}
+        self._next_block_id = 0
+        self.parsed_blocks = 0
+        self.reused_blocks = 0
+
+    def _parse_block(self, block: typing.Union[str, bytes]) -> typing.Tuple[tuple, tuple]:
+        """Parses a block of text between separators, giving it a new id.
+
+        :return: the key identifying each trigger of the block (see `_keys`) and the parsed triggers
+        """
+        text = yatapi.trigger.decode_text(block, self.encoding) if isinstance(block, bytes) else block
+        parsed = tuple(self.parser._parse_tokens(yatapi.trigger.TOKEN_RE.finditer(text),
+                                                 parse_statements=self.parse_statements))
+        block_id = self._next_block_id
+        self._next_block_id += 1
+        return tuple((block_id, i) if i else block_id for i in range(len(parsed))), parsed
+
+    def update(self, text: typing.Union[str, bytes]) -> TriggerDelta:
+        """Loads the current text of the file, re-parsing only the trigger blocks that differ from the last load.
+
+        :param text: the whole TrigEdit text, as str or as undecoded bytes
+        :return: the triggers added, removed, and changed since the last load
+        """
+        separator = yatapi.trigger.TRIGGER_SEPARATOR
+        if isinstance(text, bytes):
+            separator = separator.encode('ascii')
+        old_blocks = self._blocks
+        parts = text.split(separator)
+        blocks = dict.fromkeys(parts)
+        for block in blocks:
+            entry = old_blocks.get(block)
+            if entry is None:
+                entry = self._parse_block(block)
+                self.parsed_blocks += 1
+            else:
+                self.reused_blocks += 1
+            blocks[block] = entry
+        entries = [blocks[x] for x in parts]
+        keys = list(itertools.chain.from_iterable([x[0] for x in entries]))
+        triggers = list(itertools.chain.from_iterable([x[1] for x in entries]))
+        delta = self._diff(keys, triggers)
+        self._blocks = blocks
+        self._keys = keys
+        self.triggers = triggers
+        return delta
+
+    def update_from_file(self, infile: str) -> TriggerDelta:
+        """Reloads the file, re-parsing only the trigger blocks that changed.
+
+        :param infile: path to the file
+        :return: the triggers added, removed, and changed since the last load
+        """
+        with open(infile, 'rb') as f:
+            return self.update(f.read())
+
+    def _diff(self, keys: typing.List, triggers: typing.List) -> TriggerDelta:
+        """Aligns the triggers of the new load with the last one in linear time.
+
+        Unchanged leading and trailing triggers are skipped; the edited region in between is walked in step.
+        Where both loads differ, a pair of triggers each missing from the other load is a trigger changed in place;
+        otherwise whichever side reaches a trigger of the other sooner is taken as added (or removed).
+        A trigger moved elsewhere in the file shows up as removed and added.
+
+        :return:
+        """
+        old_keys = self._keys
+        old_triggers = self.triggers
+        if old_keys == keys:
+            return TriggerDelta([], [], [])
+        prefix = 0
+        limit = min(len(old_keys), len(keys))
+        while prefix < limit and old_keys[prefix] == keys[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old_keys[-1 - suffix] == keys[-1 - suffix]:
+            suffix += 1
+        old_end = len(old_keys) - suffix
+        new_end = len(keys) - suffix
+        old_positions = _positions(old_keys, prefix, old_end)
+        new_positions = _positions(keys, prefix, new_end)
+        added, removed, changed = [], [], []
+        i = j = prefix
+        while i < old_end and j < new_end:
+            old_key = old_keys[i]
+            new_key = keys[j]
+            if old_key == new_key:
+                i += 1
+                j += 1
+                continue
+            # how far ahead each trigger appears in the other load, if at all
+            old_ahead = _next_position(new_positions.get(old_key), j)
+            new_ahead = _next_position(old_positions.get(new_key), i)
+            if old_ahead is None and new_ahead is None:
+                changed.append(TriggerChange(i, j, old_triggers[i], triggers[j]))
+                i += 1
+                j += 1
+            elif new_ahead is None or (old_ahead is not None and old_ahead - j <= new_ahead - i):
+                added.append((j, triggers[j]))
+                j += 1
+            else:
+                removed.append((i, old_triggers[i]))
+                i += 1
+        removed.extend((x, old_triggers[x]) for x in range(i, old_end))
+        added.extend((x, triggers[x]) for x in range(j, new_end))
+        return TriggerDelta(added, removed, changed)
+
+    def __len__(self):
+        return len(self.triggers)
+
+    def __repr__(self):
+        return 'TrigEditSession(triggers={}, parsed_blocks={}, reused_blocks={})'.format(
+            len(self), self.parsed_blocks, self.reused_blocks)
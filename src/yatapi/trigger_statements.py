@@ -3,9 +3,12 @@
 """
 
 import abc
+import copy
 import inspect
+import operator
 import re
 import typing
+import weakref
 
 from yatapi.scaction import SCAction
 from yatapi.scalliance import SCAlliance
@@ -20,15 +23,172 @@ from yatapi.scunit import SCUnit
 from yatapi.scvisibility import SCVisibility, ALWAYS_DISPLAY
 
 
+# matches a value that is already wrapped in double quotes
+QUOTED_RE = re.compile(r'^".+?"$')
+
+
+class CompilePlan:
+    def __init__(self, name: str, fields: typing.Sequence[str], quoted_fields: typing.AbstractSet[str],
+                 init_args: typing.Optional[typing.Sequence[str]] = None):
+        """Precomputed layout used to compile every instance of a single statement class.
+
+        Built once per class so compiling a statement only needs attribute lookups and a single format call.
+
+        :param name: TrigEdit name of the statement, e.g. "Set Deaths"
+        :param fields: attribute names in the order they appear in TrigEdit
+        :param quoted_fields: attribute names whose string values must be wrapped in double quotes
+        :param init_args: arguments of the statement's `__init__`, used to rebuild it (e.g. when unpickling);
+                          defaults to `fields`
+        """
+        self.name = name
+        self.fields = tuple(fields)
+        self.quoted = tuple(i for i, field in enumerate(self.fields) if field in quoted_fields)
+        escaped_name = name.replace('{', '{{').replace('}', '}}')
+        self.template = '{}({});'.format(escaped_name, ', '.join(['{}'] * len(self.fields)))
+        self.constant = None if self.fields else '{}();'.format(name)
+        self.init_args = self.fields if init_args is None else tuple(init_args)
+        self._getter = operator.attrgetter(*self.fields) if self.fields else None
+
+    @classmethod
+    def from_statement_class(cls, statement_class) -> 'CompilePlan':
+        init_args = [x for x in inspect.getfullargspec(statement_class.__init__).args if x != 'self']
+        fields = statement_class._field_order
+        if fields is None:
+            fields = init_args
+        return cls(statement_class._trigedit_name, fields, statement_class._quoted_fields, init_args=init_args)
+
+    def raw_values(self, statement) -> tuple:
+        """Gets the attribute values of the statement in TrigEdit order, as is.
+
+        :param statement:
+        :return:
+        """
+        if not self.fields:
+            return ()
+        values = self._getter(statement)
+        return values if len(self.fields) > 1 else (values,)
+
+    def values(self, statement) -> list:
+        """Gets the attribute values of the statement in TrigEdit order, quoting where needed.
+
+        :param statement:
+        :return:
+        """
+        values = list(self.raw_values(statement))
+        for i in self.quoted:
+            value = values[i]
+            if type(value) == str and QUOTED_RE.match(value) is None:
+                values[i] = statement._quote_value(value)
+        return values
+
+    def render(self, statement) -> str:
+        if self.constant is not None:
+            return self.constant
+        return self.template.format(*self.values(statement))
+
+
+class FrozenStatementError(AttributeError):
+    pass
+
+
+def _frozen_setattr(self, name, value):
+    raise FrozenStatementError('Cannot set {!r} of frozen statement {}'.format(name, self))
+
+
+def _frozen_delattr(self, name):
+    raise FrozenStatementError('Cannot delete {!r} of frozen statement {}'.format(name, self))
+
+
+def _frozen_compile(self, pretty=False):
+    if pretty:
+        return self._statement_class.compile(self, pretty=True)
+    return self._compiled
+
+
 class Statement(abc.ABC):
     _trigedit_name = 'statement'
     _quoted_fields = frozenset()
+    # explicit TrigEdit argument order; defaults to the order of the `__init__` arguments
+    _field_order = None
+    _compile_plan = None
+    # the class a statement was defined as, even after it is frozen
+    _statement_class = None
+    _frozen_class = None
+    is_frozen = False
+
+    # name of the statement's class, e.g. "SetDeaths"
+    type = 'Statement'
+    # TrigEdit text rendered once when the statement is frozen
+    __slots__ = ('_compiled', '__weakref__')
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._statement_class = cls
+        cls.type = cls.__name__
 
     def __init__(self):
         pass
 
+    @classmethod
+    def _get_frozen_class(cls):
+        """Gets the immutable twin of this class, creating it on first use.
+
+        The twin adds no storage, so a statement is frozen in place by switching its `__class__`.
+        Ordinary statements never pay for the immutability check.
+
+        :return:
+        """
+        if cls.is_frozen:
+            return cls
+        frozen = cls.__dict__.get('_frozen_class')
+        if frozen is None:
+            frozen = type(cls.__name__, (cls,), {'__slots__': (), '__module__': cls.__module__,
+                                                 '__qualname__': cls.__qualname__, '__doc__': cls.__doc__,
+                                                 '__setattr__': _frozen_setattr, '__delattr__': _frozen_delattr,
+                                                 'compile': _frozen_compile, 'is_frozen': True})
+            type.__setattr__(frozen, '_statement_class', cls)
+            type.__setattr__(frozen, '_compile_plan', cls._get_compile_plan())
+            cls._frozen_class = frozen
+        return frozen
+
+    def freeze(self) -> 'Statement':
+        """Makes the statement immutable, rendering its TrigEdit text once for every later `compile`.
+
+        Use for statements that never vary and are reused across many triggers, e.g. `Always()` or a `Comment`.
+        Setting or deleting any argument afterwards raises `FrozenStatementError`;
+        `copy.copy` gives a mutable copy.
+
+        :return: the statement itself, now frozen
+        """
+        if not self.is_frozen:
+            self._compiled = self.compile()
+            self.__class__ = self._get_frozen_class()
+        return self
+
+    @classmethod
+    def interned(cls, *args, **kwargs) -> 'Statement':
+        """Creates the statement, returning the single shared immutable instance for its arguments.
+
+        E.g. every `PreserveTrigger.interned()` is the same object.
+
+        :return:
+        """
+        return intern_statement(cls(*args, **kwargs))
+
+    @classmethod
+    def _get_compile_plan(cls) -> CompilePlan:
+        """Gets the cached compile plan of this class, building it on first use.
+
+        :return:
+        """
+        plan = cls.__dict__.get('_compile_plan')
+        if plan is None:
+            plan = CompilePlan.from_statement_class(cls)
+            cls._compile_plan = plan
+        return plan
+
     def _is_quoted(self, value):
-        return True if re.search(r'^".+?"$', value) is not None else False
+        return QUOTED_RE.match(value) is not None
 
     def _quote_value(self, value):
         return '"{}"'.format(value)
@@ -39,17 +199,10 @@ class Statement(abc.ABC):
         :return: a list of values associated with the syntax of the corresponding TrigEdit statement
         :rtype: list
         """
-        values = []
-        for arg in inspect.getfullargspec(self.__init__).args:
-            if arg != 'self':
-                value = getattr(self, arg)
-                if arg in self.__class__._quoted_fields and type(value) == str:
-                    if not self._is_quoted(value):
-                        value = self._quote_value(value)
-                if pretty:
-                    values.append('{}={}'.format(arg, value if type(value) == str else str(value)))
-                else:
-                    values.append(value if type(value) == str else str(value))
+        plan = self._get_compile_plan()
+        values = [x if type(x) == str else str(x) for x in plan.values(self)]
+        if pretty:
+            values = ['{}={}'.format(arg, value) for arg, value in zip(plan.fields, values)]
         return values
 
     def compile(self, pretty=False) -> str:
@@ -60,33 +213,77 @@ class Statement(abc.ABC):
         :return: a string representing the TrigEdit format for the trigger action or condition
         :rtype: str
         """
-        values = self._get_values(pretty=pretty)
-        return '{}({});'.format(self.__class__._trigedit_name, ', '.join(values))
+        if pretty:
+            return '{}({});'.format(self.__class__._trigedit_name, ', '.join(self._get_values(pretty=True)))
+        return self._get_compile_plan().render(self)
+
+    def structural_key(self) -> tuple:
+        """Gets a hashable key identifying the statement by its class and argument values.
+
+        Two statements with the same key compile to the same text.
+
+        :return:
+        """
+        return (self._statement_class,) + self._get_compile_plan().raw_values(self)
+
+    def __eq__(self, other):
+        if not isinstance(other, Statement):
+            return NotImplemented
+        return self.structural_key() == other.structural_key()
+
+    def __hash__(self):
+        return hash(self.structural_key())
+
+    def __reduce__(self):
+        # pickle as just the class and its arguments, e.g. when sending triggers to worker processes
+        plan = self._get_compile_plan()
+        return self._statement_class, tuple(getattr(self, x) for x in plan.init_args)
 
     def __repr__(self):
         return self.compile()
 
 
+# interned statements, kept only while something still references them
+_INTERNED = weakref.WeakValueDictionary()
+
+
+def intern_statement(statement: Statement) -> Statement:
+    """Gets the single shared, immutable instance structurally equal to the statement.
+
+    The first time a statement is seen an immutable copy of it is kept; the given statement is never modified.
+
+    :param statement:
+    :return:
+    """
+    key = statement.structural_key()
+    interned = _INTERNED.get(key)
+    if interned is None:
+        interned = statement if statement.is_frozen else copy.copy(statement).freeze()
+        _INTERNED[key] = interned
+    return interned
+
+
 class Condition(Statement):
     _trigedit_name = 'condition'
+    __slots__ = ()
 
     def __init__(self):
         super().__init__()
-        self.type = self.__class__.__name__
 
 
 class Action(Statement):
     _trigedit_name = 'action'
+    __slots__ = ()
 
     def __init__(self):
         super().__init__()
-        self.type = self.__class__.__name__
 
 
 # actions and conditions go here
 class Accumulate(Condition):
     _trigedit_name = "Accumulate"
     _quoted_fields = frozenset(["player"])
+    __slots__ = ("player", "quantifier", "amount", "resource")
 
     def __init__(self, player: SCPlayer, quantifier: SCQuantifier, amount: int, resource: SCResource):
         super().__init__()
@@ -99,6 +296,7 @@ class Accumulate(Condition):
 class Always(Condition):
     _trigedit_name = "Always"
     _quoted_fields = frozenset()
+    __slots__ = ()
 
     def __init__(self):
         super().__init__()
@@ -107,6 +305,7 @@ class Always(Condition):
 class Bring(Condition):
     _trigedit_name = "Bring"
     _quoted_fields = frozenset(["player", "unit", "location"])
+    __slots__ = ("player", "unit", "location", "quantifier", "count")
 
     def __init__(self, player: SCPlayer, unit: SCUnit, location: str, quantifier: SCQuantifier, count: int):
         super().__init__()
@@ -120,6 +319,7 @@ class Bring(Condition):
 class Command(Condition):
     _trigedit_name = "Command"
     _quoted_fields = frozenset(["player", "unit"])
+    __slots__ = ("player", "unit", "quantifier", "count")
 
     def __init__(self, player: SCPlayer, unit: SCUnit, quantifier: SCQuantifier, count: int):
         super().__init__()
@@ -132,6 +332,7 @@ class Command(Condition):
 class CountdownTimer(Condition):
     _trigedit_name = "Countdown Timer"
     _quoted_fields = frozenset()
+    __slots__ = ("quantifier", "count")
 
     def __init__(self, quantifier: SCQuantifier, count: int):
         super().__init__()
@@ -142,6 +343,7 @@ class CountdownTimer(Condition):
 class Deaths(Condition):
     _trigedit_name = "Deaths"
     _quoted_fields = frozenset(["player", "unit"])
+    __slots__ = ("player", "unit", "quantifier", "count")
 
     def __init__(self, player: SCPlayer, unit: SCUnit, quantifier: SCQuantifier, count: int):
         super().__init__()
@@ -154,6 +356,7 @@ class Deaths(Condition):
 class HighestScore(Condition):
     _trigedit_name = "Highest Score"
     _quoted_fields = frozenset()
+    __slots__ = ("score",)
 
     def __init__(self, score: str):
         super().__init__()
@@ -163,6 +366,7 @@ class HighestScore(Condition):
 class Never(Condition):
     _trigedit_name = "Never"
     _quoted_fields = frozenset()
+    __slots__ = ()
 
     def __init__(self):
         super().__init__()
@@ -171,6 +375,7 @@ class Never(Condition):
 class Switch(Condition):
     _trigedit_name = "Switch"
     _quoted_fields = frozenset(["switch"])
+    __slots__ = ("switch", "state")
 
     def __init__(self, switch: str, state: SCState):
         super().__init__()
@@ -181,6 +386,7 @@ class Switch(Condition):
 class CenterView(Action):
     _trigedit_name = "Center View"
     _quoted_fields = frozenset(["location"])
+    __slots__ = ("location",)
 
     def __init__(self, location: str):
         super().__init__()
@@ -190,6 +396,7 @@ class CenterView(Action):
 class Comment(Action):
     _trigedit_name = "Comment"
     _quoted_fields = frozenset(["text"])
+    __slots__ = ("text",)
 
     def __init__(self, text: str):
         super().__init__()
@@ -199,6 +406,7 @@ class Comment(Action):
 class CreateUnit(Action):
     _trigedit_name = "Create Unit"
     _quoted_fields = frozenset(["player", "unit", "location"])
+    __slots__ = ("player", "unit", "count", "location")
 
     def __init__(self, player: SCPlayer, unit: SCUnit, count: int, location: str):
         super().__init__()
@@ -211,6 +419,7 @@ class CreateUnit(Action):
 class CreateUnitWithProperties(Action):
     _trigedit_name = "Create Unit with Properties"
     _quoted_fields = frozenset(["player", "unit", "location"])
+    __slots__ = ("player", "unit", "count", "location", "properties")
 
     def __init__(self, player: SCPlayer, unit: SCUnit, count: int, location: str, properties: int):
         super().__init__()
@@ -224,6 +433,7 @@ class CreateUnitWithProperties(Action):
 class Defeat(Action):
     _trigedit_name = "Defeat"
     _quoted_fields = frozenset()
+    __slots__ = ()
 
     def __init__(self):
         super().__init__()
@@ -231,27 +441,23 @@ class Defeat(Action):
 
 class DisplayTextMessage(Action):
     _trigedit_name = "Display Text Message"
-    _quoted_fields = frozenset(["text"])
+    # text is written as given, without adding quotes
+    _quoted_fields = frozenset()
+    # TrigEdit order of (visibility, text) unintuitive, since the visibility parameter is unused.
+    # The __init__ reverse the TrigEdit order.  This corrects the order.
+    _field_order = ("visibility", "text")
+    __slots__ = ("text", "visibility")
 
     def __init__(self, text: str, visibility: SCVisibility=ALWAYS_DISPLAY):
         super().__init__()
         self.text = text
         self.visibility = visibility
 
-    def _get_values(self, pretty=False):
-        """Override due to TrigEdit order of (visibility, text) unintuitive, since the visibility parameter is unused.
-
-        The __init__ reverse the TrigEdit order.  This corrects the order.
-
-        :param pretty:
-        :return:
-        """
-        return [str(self.visibility), self.text]
-
 
 class GiveUnitsToPlayer(Action):
     _trigedit_name = "Give Units to Player"
     _quoted_fields = frozenset(["from_player", "to_player", "unit", "location"])
+    __slots__ = ("from_player", "to_player", "unit", "count", "location")
 
     def __init__(self, from_player: SCPlayer, to_player: SCPlayer, unit: SCUnit, count: str, location: str):
         super().__init__()
@@ -265,6 +471,7 @@ class GiveUnitsToPlayer(Action):
 class KillUnit(Action):
     _trigedit_name = "Kill Unit"
     _quoted_fields = frozenset(["player", "unit"])
+    __slots__ = ("player", "unit")
 
     def __init__(self, player: SCPlayer, unit: SCUnit):
         super().__init__()
@@ -275,6 +482,7 @@ class KillUnit(Action):
 class KillUnitAtLocation(Action):
     _trigedit_name = "Kill Unit At Location"
     _quoted_fields = frozenset(["player", "unit", "location"])
+    __slots__ = ("player", "unit", "count", "location")
 
     def __init__(self, player: SCPlayer, unit: SCUnit, count: str, location: str):
         super().__init__()
@@ -287,6 +495,7 @@ class KillUnitAtLocation(Action):
 class LeaderBoardControl(Action):
     _trigedit_name = "Leader Board Control"
     _quoted_fields = frozenset(["title", "unit"])
+    __slots__ = ("title", "unit")
 
     def __init__(self, title: str, unit: SCUnit):
         super().__init__()
@@ -297,6 +506,7 @@ class LeaderBoardControl(Action):
 class LeaderBoardKills(Action):
     _trigedit_name = "Leader Board Kills"
     _quoted_fields = frozenset(["title", "unit"])
+    __slots__ = ("title", "unit")
 
     def __init__(self, title: str, unit: SCUnit):
         super().__init__()
@@ -307,6 +517,7 @@ class LeaderBoardKills(Action):
 class LeaderBoardPoints(Action):
     _trigedit_name = "Leader Board Points"
     _quoted_fields = frozenset(["title"])
+    __slots__ = ("title", "score")
 
     def __init__(self, title: str, score: str):
         super().__init__()
@@ -317,6 +528,7 @@ class LeaderBoardPoints(Action):
 class LeaderboardComputerPlayers(Action):
     _trigedit_name = "Leaderboard Computer Players"
     _quoted_fields = frozenset()
+    __slots__ = ("state",)
 
     def __init__(self, state: SCState):
         super().__init__()
@@ -326,6 +538,7 @@ class LeaderboardComputerPlayers(Action):
 class MinimapPing(Action):
     _trigedit_name = "Minimap Ping"
     _quoted_fields = frozenset(["location"])
+    __slots__ = ("location",)
 
     def __init__(self, location: str):
         super().__init__()
@@ -335,6 +548,7 @@ class MinimapPing(Action):
 class ModifyUnitEnergy(Action):
     _trigedit_name = "Modify Unit Energy"
     _quoted_fields = frozenset(["player", "unit", "location"])
+    __slots__ = ("player", "unit", "resource", "count", "location")
 
     def __init__(self, player: SCPlayer, unit: SCUnit, resource: SCResource, count: int, location: str):
         super().__init__()
@@ -348,6 +562,7 @@ class ModifyUnitEnergy(Action):
 class ModifyUnitHangerCount(Action):
     _trigedit_name = "Modify Unit Hanger Count"
     _quoted_fields = frozenset(["player", "unit", "location"])
+    __slots__ = ("player", "unit", "percent", "count", "location")
 
     def __init__(self, player: SCPlayer, unit: SCUnit, percent: int, count: int, location: str):
         super().__init__()
@@ -361,6 +576,7 @@ class ModifyUnitHangerCount(Action):
 class ModifyUnitHitPoints(Action):
     _trigedit_name = "Modify Unit Hit Points"
     _quoted_fields = frozenset(["player", "unit", "location"])
+    __slots__ = ("player", "unit", "percent", "count", "location")
 
     def __init__(self, player: SCPlayer, unit: SCUnit, percent: int, count: int, location: str):
         super().__init__()
@@ -374,6 +590,7 @@ class ModifyUnitHitPoints(Action):
 class ModifyUnitShieldPoints(Action):
     _trigedit_name = "Modify Unit Shield Points"
     _quoted_fields = frozenset(["player", "unit", "location"])
+    __slots__ = ("player", "unit", "percent", "count", "location")
 
     def __init__(self, player: SCPlayer, unit: SCUnit, percent: int, count: int, location: str):
         super().__init__()
@@ -387,6 +604,7 @@ class ModifyUnitShieldPoints(Action):
 class MoveLocation(Action):
     _trigedit_name = "Move Location"
     _quoted_fields = frozenset(["player", "unit", "unit_location", "location"])
+    __slots__ = ("player", "unit", "unit_location", "location")
 
     def __init__(self, player: SCPlayer, unit: SCUnit, unit_location: str, location: str):
         super().__init__()
@@ -399,6 +617,7 @@ class MoveLocation(Action):
 class MoveUnit(Action):
     _trigedit_name = "Move Unit"
     _quoted_fields = frozenset(["player", "unit", "from_location", "to_location"])
+    __slots__ = ("player", "unit", "count", "from_location", "to_location")
 
     def __init__(self, player: SCPlayer, unit: SCUnit, count: str, from_location: str, to_location: str):
         super().__init__()
@@ -412,6 +631,7 @@ class MoveUnit(Action):
 class Order(Action):
     _trigedit_name = "Order"
     _quoted_fields = frozenset(["player", "unit", "location1", "location"])
+    __slots__ = ("player", "unit", "location1", "location", "order")
 
     def __init__(self, player: SCPlayer, unit: SCUnit, location1: str, location: str, order: SCOrder):
         super().__init__()
@@ -425,6 +645,7 @@ class Order(Action):
 class PlayWav(Action):
     _trigedit_name = "Play WAV"
     _quoted_fields = frozenset(["wav"])
+    __slots__ = ("wav", "unknown_wav_arg")
 
     def __init__(self, wav: str, unknown_wav_arg: int):
         super().__init__()
@@ -435,6 +656,7 @@ class PlayWav(Action):
 class PreserveTrigger(Action):
     _trigedit_name = "Preserve Trigger"
     _quoted_fields = frozenset()
+    __slots__ = ()
 
     def __init__(self):
         super().__init__()
@@ -443,6 +665,7 @@ class PreserveTrigger(Action):
 class RemoveUnit(Action):
     _trigedit_name = "Remove Unit"
     _quoted_fields = frozenset(["player", "unit"])
+    __slots__ = ("player", "unit")
 
     def __init__(self, player: SCPlayer, unit: SCUnit):
         super().__init__()
@@ -453,6 +676,7 @@ class RemoveUnit(Action):
 class RemoveUnitAtLocation(Action):
     _trigedit_name = "Remove Unit At Location"
     _quoted_fields = frozenset(["player", "unit", "location"])
+    __slots__ = ("player", "unit", "count", "location")
 
     def __init__(self, player: SCPlayer, unit: SCUnit, count: int, location: str):
         super().__init__()
@@ -465,6 +689,7 @@ class RemoveUnitAtLocation(Action):
 class RunAiScript(Action):
     _trigedit_name = "Run AI Script"
     _quoted_fields = frozenset(["script"])
+    __slots__ = ("script",)
 
     def __init__(self, script: SCScript):
         super().__init__()
@@ -474,6 +699,7 @@ class RunAiScript(Action):
 class RunAiScriptAtLocation(Action):
     _trigedit_name = "Run AI Script At Location"
     _quoted_fields = frozenset(["script", "location"])
+    __slots__ = ("script", "location")
 
     def __init__(self, script: SCScript, location: str):
         super().__init__()
@@ -484,6 +710,7 @@ class RunAiScriptAtLocation(Action):
 class SetAllianceStatus(Action):
     _trigedit_name = "Set Alliance Status"
     _quoted_fields = frozenset(["player"])
+    __slots__ = ("player", "alliance")
 
     def __init__(self, player: SCPlayer, alliance: SCAlliance):
         super().__init__()
@@ -494,6 +721,7 @@ class SetAllianceStatus(Action):
 class SetCountdownTimer(Action):
     _trigedit_name = "Set Countdown Timer"
     _quoted_fields = frozenset()
+    __slots__ = ("operation", "seconds")
 
     def __init__(self, operation: SCOperation, seconds: int):
         super().__init__()
@@ -504,6 +732,7 @@ class SetCountdownTimer(Action):
 class SetDeaths(Action):
     _trigedit_name = "Set Deaths"
     _quoted_fields = frozenset(["player", "unit"])
+    __slots__ = ("player", "unit", "operation", "count")
 
     def __init__(self, player: SCPlayer, unit: SCUnit, operation: SCOperation, count: int):
         super().__init__()
@@ -516,6 +745,7 @@ class SetDeaths(Action):
 class SetDoodadState(Action):
     _trigedit_name = "Set Doodad State"
     _quoted_fields = frozenset(["player", "unit", "location"])
+    __slots__ = ("player", "unit", "location", "state")
 
     def __init__(self, player: SCPlayer, unit: SCUnit, location: str, state: SCState):
         super().__init__()
@@ -528,6 +758,7 @@ class SetDoodadState(Action):
 class SetInvincibility(Action):
     _trigedit_name = "Set Invincibility"
     _quoted_fields = frozenset(["player", "unit", "location"])
+    __slots__ = ("player", "unit", "location", "state")
 
     def __init__(self, player: SCPlayer, unit: SCUnit, location: str, state: SCState):
         super().__init__()
@@ -540,6 +771,7 @@ class SetInvincibility(Action):
 class SetMissionObjectives(Action):
     _trigedit_name = "Set Mission Objectives"
     _quoted_fields = frozenset(["text"])
+    __slots__ = ("text",)
 
     def __init__(self, text: str):
         super().__init__()
@@ -549,6 +781,7 @@ class SetMissionObjectives(Action):
 class SetResources(Action):
     _trigedit_name = "Set Resources"
     _quoted_fields = frozenset(["player"])
+    __slots__ = ("player", "operation", "amount", "resource")
 
     def __init__(self, player: SCPlayer, operation: SCOperation, amount: int, resource: SCResource):
         super().__init__()
@@ -561,6 +794,7 @@ class SetResources(Action):
 class SetScore(Action):
     _trigedit_name = "Set Score"
     _quoted_fields = frozenset(["player"])
+    __slots__ = ("player", "operation", "count", "score")
 
     def __init__(self, player: SCPlayer, operation: SCOperation, count: int, score: str):
         super().__init__()
@@ -573,6 +807,7 @@ class SetScore(Action):
 class SetSwitch(Action):
     _trigedit_name = "Set Switch"
     _quoted_fields = frozenset(["switch"])
+    __slots__ = ("switch", "action")
 
     def __init__(self, switch: str, action: SCAction):
         super().__init__()
@@ -583,6 +818,7 @@ class SetSwitch(Action):
 class Victory(Action):
     _trigedit_name = "Victory"
     _quoted_fields = frozenset()
+    __slots__ = ()
 
     def __init__(self):
         super().__init__()
@@ -591,6 +827,7 @@ class Victory(Action):
 class Wait(Action):
     _trigedit_name = "Wait"
     _quoted_fields = frozenset()
+    __slots__ = ("milliseconds",)
 
     def __init__(self, milliseconds: int):
         super().__init__()